@@ -1,5 +1,13 @@
+import os
+import sys
+
 import streamlit as st
 
+# Add the lib directory to the path so we can read the shared compute cache
+sys.path.append(os.path.join(os.path.dirname(__file__), 'lib'))
+
+from compute_cache import compute_cache
+
 st.set_page_config(
     page_title="PHYS Lab Tutorial",
     page_icon="🔬",
@@ -46,3 +54,12 @@ st.markdown(
 If you are an instructor, you can duplicate and customize modules by editing files in the `pages` directory.
     """
 )
+
+with st.expander("Compute cache statistics (instructors)"):
+    stats = compute_cache.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Hit rate", f"{stats['hit_rate'] * 100:.1f}%")
+    col2.metric("Entries", f"{stats['entries']}/{stats['max_entries']}")
+    col3.metric("Evictions", f"{stats['evictions']}")
+    col4.metric("Memory held", f"{stats['bytes_held'] / 1e6:.2f} MB")
+    st.caption(f"Hits: {stats['hits']}, misses: {stats['misses']}. The cache is shared by all sessions in this server process.")
@@ -0,0 +1,181 @@
+import math
+from typing import Callable, Sequence, Tuple
+
+import numpy as np
+
+# d/dx of each supported one-argument ufunc, as a function of x
+_UNARY_DERIVATIVES = {
+    np.negative: lambda x: -np.ones_like(x),
+    np.positive: lambda x: np.ones_like(x),
+    np.absolute: np.sign,
+    np.square: lambda x: 2.0 * x,
+    np.sqrt: lambda x: 0.5 / np.sqrt(x),
+    np.exp: np.exp,
+    np.log: lambda x: 1.0 / x,
+    np.log10: lambda x: 1.0 / (x * math.log(10.0)),
+    np.sin: np.cos,
+    np.cos: lambda x: -np.sin(x),
+    np.tan: lambda x: 1.0 / np.cos(x) ** 2,
+    np.arcsin: lambda x: 1.0 / np.sqrt(1.0 - x ** 2),
+    np.arccos: lambda x: -1.0 / np.sqrt(1.0 - x ** 2),
+    np.arctan: lambda x: 1.0 / (1.0 + x ** 2),
+    np.sinh: np.cosh,
+    np.cosh: np.sinh,
+    np.tanh: lambda x: 1.0 / np.cosh(x) ** 2,
+    np.radians: lambda x: np.full_like(x, math.pi / 180.0),
+    np.deg2rad: lambda x: np.full_like(x, math.pi / 180.0),
+    np.degrees: lambda x: np.full_like(x, 180.0 / math.pi),
+    np.rad2deg: lambda x: np.full_like(x, 180.0 / math.pi),
+}
+
+
+class Dual:
+    """Forward-mode dual number: a value plus its gradient with respect to k seeded inputs.
+
+    `value` has any shape S (one entry per row being graded) and `grad` has
+    shape S + (k,). NumPy ufuncs are intercepted through __array_ufunc__, so the
+    plain NumPy formulas in lab_formulas differentiate exactly without changes.
+    """
+
+    __array_priority__ = 1000
+
+    def __init__(self, value, grad) -> None:
+        self.value = np.asarray(value, dtype=float)
+        self.grad = np.asarray(grad, dtype=float)
+
+    def __repr__(self) -> str:
+        return f"Dual(value={self.value!r}, grad={self.grad!r})"
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs.get("out") is not None:
+            return NotImplemented
+        if len(inputs) == 1:
+            derivative = _UNARY_DERIVATIVES.get(ufunc)
+            if derivative is None:
+                return NotImplemented
+            x = inputs[0]
+            return Dual(ufunc(x.value), derivative(x.value)[..., np.newaxis] * x.grad)
+        if len(inputs) == 2:
+            return _binary(ufunc, *inputs)
+        return NotImplemented
+
+    def __neg__(self):
+        return np.negative(self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return np.absolute(self)
+
+    def __add__(self, other):
+        return np.add(self, other)
+
+    def __radd__(self, other):
+        return np.add(other, self)
+
+    def __sub__(self, other):
+        return np.subtract(self, other)
+
+    def __rsub__(self, other):
+        return np.subtract(other, self)
+
+    def __mul__(self, other):
+        return np.multiply(self, other)
+
+    def __rmul__(self, other):
+        return np.multiply(other, self)
+
+    def __truediv__(self, other):
+        return np.divide(self, other)
+
+    def __rtruediv__(self, other):
+        return np.divide(other, self)
+
+    def __pow__(self, other):
+        return np.power(self, other)
+
+    def __rpow__(self, other):
+        return np.power(other, self)
+
+
+def _parts(x):
+    """(value, gradient or None) of a Dual or a plain number/array."""
+    if isinstance(x, Dual):
+        return x.value, x.grad
+    return np.asarray(x, dtype=float), None
+
+
+def _combine(*terms):
+    """Sum of derivative[..., None] * grad over the terms whose operand carries a gradient."""
+    total = None
+    for derivative, grad in terms:
+        if grad is None:
+            continue
+        term = np.asarray(derivative)[..., np.newaxis] * grad
+        total = term if total is None else total + term
+    return total
+
+
+def _binary(ufunc, a, b):
+    a_val, a_grad = _parts(a)
+    b_val, b_grad = _parts(b)
+    if ufunc is np.add:
+        value = a_val + b_val
+        grad = _combine((np.ones_like(value), a_grad), (np.ones_like(value), b_grad))
+    elif ufunc is np.subtract:
+        value = a_val - b_val
+        grad = _combine((np.ones_like(value), a_grad), (-np.ones_like(value), b_grad))
+    elif ufunc is np.multiply:
+        value = a_val * b_val
+        grad = _combine((b_val, a_grad), (a_val, b_grad))
+    elif ufunc is np.divide:
+        value = a_val / b_val
+        grad = _combine((1.0 / b_val, a_grad), (-value / b_val, b_grad))
+    elif ufunc is np.power:
+        value = a_val ** b_val
+        # d(a^b) = b a^(b−1) da + a^b ln(a) db; the log term only matters when b varies
+        log_a = np.log(np.where(a_val > 0, a_val, 1.0)) if b_grad is not None else 0.0
+        grad = _combine((b_val * a_val ** (b_val - 1.0), a_grad), (value * log_a, b_grad))
+    else:
+        return NotImplemented
+    return Dual(value, grad)
+
+
+def seed(*values) -> Tuple[Dual, ...]:
+    """Turn k inputs (scalars or equal-length arrays of rows) into Duals with unit gradients."""
+    arrays = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in values))
+    k = len(arrays)
+    identity = np.eye(k)
+    return tuple(Dual(a, np.broadcast_to(identity[i], a.shape + (k,))) for i, a in enumerate(arrays))
+
+
+def partial_derivatives(func: Callable, *values) -> Tuple[np.ndarray, np.ndarray]:
+    """Evaluate func at `values` and return (f, ∂f/∂x) with the partials stacked along axis 0.
+
+    For k inputs of row shape S the partials have shape (k,) + S.
+    """
+    inputs = seed(*values)
+    result = func(*inputs)
+    if not isinstance(result, Dual):
+        value = np.broadcast_to(np.asarray(result, dtype=float), inputs[0].shape)
+        return value, np.zeros((len(inputs),) + value.shape)
+    grad = np.broadcast_to(result.grad, result.value.shape + (len(inputs),))
+    return result.value, np.moveaxis(grad, -1, 0)
+
+
+def quadrature(func: Callable, values: Sequence, sigmas: Sequence) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Linearized uncertainty σ_f = sqrt( Σ (∂f/∂x_i · σ_i)² ) with exact partials.
+
+    `values` and `sigmas` hold one entry per argument of func; each entry may be
+    a scalar or an array of rows, so a whole class can be graded in one call.
+    Returns (f, σ_f, contributions) where contributions[i] = ∂f/∂x_i · σ_i.
+    """
+    value, partials = partial_derivatives(func, *values)
+    sig = np.stack(np.broadcast_arrays(*(np.asarray(s, dtype=float) for s in sigmas), value))[:-1]
+    contributions = partials * sig
+    return value, np.sqrt(np.sum(contributions ** 2, axis=0)), contributions
@@ -0,0 +1,233 @@
+import functools
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _round_value(value, digits):
+    """Round floats (and containers of floats) to `digits` significant figures for use in a key."""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        if value != value or value in (float("inf"), float("-inf")):
+            return value
+        return float(f"{value:.{digits}g}")
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, np.ndarray):
+        # Arrays are keyed on their exact contents (hashed to keep keys small)
+        digest = hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16).hexdigest()
+        return (value.shape, str(value.dtype), digest)
+    if isinstance(value, (tuple, list)):
+        return tuple(_round_value(v, digits) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _round_value(v, digits)) for k, v in value.items()))
+    return value
+
+
+def _estimate_bytes(value, _seen=None):
+    """Rough size of a cached result: exact for NumPy arrays, sys.getsizeof otherwise."""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _estimate_bytes(k, _seen) + _estimate_bytes(v, _seen) for k, v in value.items()
+        )
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return sys.getsizeof(value) + sum(_estimate_bytes(v, _seen) for v in value)
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    """Mark NumPy arrays inside a result read-only so callers cannot corrupt the shared copy."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for v in value.values():
+            _freeze(v)
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            _freeze(v)
+    return value
+
+
+class ComputeCache:
+    """Process-wide LRU cache for calculator results, shared by every session.
+
+    Entries are evicted least-recently-used first once either `max_entries` or
+    `max_bytes` is exceeded. Counters are kept so the cache can be sized for a
+    full lab section moving sliders at the same time.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_held = 0
+
+    def make_key(self, namespace: str, args: tuple, kwargs: dict, digits: int = 10):
+        """Build a hashable key from a namespace and rounded call arguments."""
+        return (namespace, _round_value(args, digits), _round_value(kwargs, digits))
+
+    def get(self, key, default=None):
+        """Return the cached value for `key` (counting a hit or miss)."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def set(self, key, value):
+        """Store `value` under `key` and evict old entries past the configured bounds."""
+        size = _estimate_bytes(value)
+        _freeze(value)
+        with self._lock:
+            if key in self._entries:
+                self.bytes_held -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.bytes_held += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self.bytes_held > self.max_bytes
+            ):
+                if len(self._entries) == 1:
+                    # Always keep the newest entry, even when it alone exceeds max_bytes
+                    break
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self.bytes_held -= old_size
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.bytes_held = 0
+
+    def stats(self):
+        """Return hit/miss/eviction counters, hit rate and memory held."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "bytes_held": self.bytes_held,
+                "max_bytes": self.max_bytes,
+            }
+
+    def memoize(self, func=None, *, name: str | None = None, digits: int = 10):
+        """Decorator caching `func` on its rounded arguments.
+
+        Float arguments are rounded to `digits` significant figures, so slider
+        values that differ only by floating-point noise share an entry. Cached
+        NumPy arrays are returned read-only and must not be modified in place.
+        """
+        if func is None:
+            return functools.partial(self.memoize, name=name, digits=digits)
+
+        namespace = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = self.make_key(namespace, args, kwargs, digits)
+            missing = object()
+            value = self.get(key, missing)
+            if value is missing:
+                value = self.set(key, func(*args, **kwargs))
+            return value
+
+        wrapper.cache = self
+        return wrapper
+
+
+class RowCache:
+    """Per-row result cache for table inputs, so editing one row recomputes only that row.
+
+    Each row of a 2-D float input is keyed on its exact bytes within a
+    namespace. `compute` looks every row up, evaluates only the missing rows in
+    one vectorized call and stores them. Rows are evicted least-recently-used
+    first once more than `max_rows` are held across all namespaces.
+    """
+
+    def __init__(self, max_rows: int = 200_000):
+        self.max_rows = max_rows
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compute(self, namespace: str, inputs: np.ndarray, func) -> np.ndarray:
+        """Return func(inputs) row by row, reusing cached rows.
+
+        `inputs` has shape (rows, k); `func` maps an (m, k) array to an (m, j)
+        array and is called once with the rows not seen before.
+        """
+        inputs = np.ascontiguousarray(inputs, dtype=float)
+        keys = [(namespace, row.tobytes()) for row in inputs]
+        results = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._rows:
+                    self._rows.move_to_end(key)
+                    results[i] = self._rows[key]
+                else:
+                    missing.append(i)
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            computed = np.asarray(func(inputs[missing]), dtype=float)
+            with self._lock:
+                for i, row in zip(missing, computed):
+                    row.flags.writeable = False
+                    results[i] = row
+                    self._rows[keys[i]] = row
+                while len(self._rows) > self.max_rows:
+                    self._rows.popitem(last=False)
+        if not results:
+            return np.empty((0, 0))
+        return np.stack(results)
+
+    def stats(self):
+        """Return row hit/miss counters and the number of rows held."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "rows": len(self._rows),
+                "max_rows": self.max_rows,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+# Global instance shared by all pages (module import is cached by Python, so it
+# survives Streamlit reruns and is shared across sessions in the same process)
+compute_cache = ComputeCache()
+memoize = compute_cache.memoize
+row_cache = RowCache()
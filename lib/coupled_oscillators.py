@@ -0,0 +1,122 @@
+import math
+from typing import Tuple
+
+import numpy as np
+from scipy.linalg import eigh_tridiagonal
+
+from compute_cache import memoize
+
+# Wall conditions at the two ends of the chain
+BOUNDARIES = ("fixed-fixed", "fixed-free", "free-free")
+
+
+def chain_stiffness_bands(num_masses: int, spring_constant_n_per_m: float, boundary: str = "fixed-fixed"):
+    """Diagonal and off-diagonal of the stiffness matrix K for a chain of identical springs.
+
+    Mass i is joined to its neighbours by springs k; with a fixed end the outer
+    mass is also tied to a wall by a spring k, with a free end it is not.
+    K is tridiagonal, so only its two bands are ever built.
+    """
+    if boundary not in BOUNDARIES:
+        raise ValueError(f"unknown boundary: {boundary!r}")
+    k = spring_constant_n_per_m
+    diag = np.full(num_masses, 2.0 * k)
+    off = np.full(max(num_masses - 1, 0), -k)
+    left_fixed = boundary in ("fixed-fixed", "fixed-free")
+    right_fixed = boundary == "fixed-fixed"
+    if not left_fixed:
+        diag[0] -= k
+    if not right_fixed:
+        diag[-1] -= k
+    return diag, off
+
+
+@memoize(name="coupled.normal_modes")
+def compute_normal_modes(
+    num_masses: int,
+    mass_kg: float,
+    spring_constant_n_per_m: float,
+    boundary: str = "fixed-fixed",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Normal-mode angular frequencies and mode shapes of a uniform chain.
+
+    Solves K v = ω² m v with the symmetric tridiagonal eigensolver
+    (scipy.linalg.eigh_tridiagonal), which is O(N²) instead of the O(N³) dense
+    path. Returns (ω of shape (N,), modes of shape (N, N)) with mode j in
+    column j, ordered from lowest to highest frequency and orthonormal.
+    Results are cached per (N, m, k, boundary).
+    """
+    diag, off = chain_stiffness_bands(num_masses, spring_constant_n_per_m, boundary)
+    if num_masses == 1:
+        eigenvalues, modes = diag / mass_kg, np.ones((1, 1))
+    else:
+        eigenvalues, modes = eigh_tridiagonal(diag / mass_kg, off / mass_kg)
+    # Free-free chains have a zero (rigid translation) mode; clear its round-off
+    eigenvalues = np.where(np.abs(eigenvalues) < 1e-12 * np.max(np.abs(eigenvalues)), 0.0, eigenvalues)
+    omegas = np.sqrt(np.clip(eigenvalues, 0.0, None))
+    return omegas, modes
+
+
+def superpose_modes(omegas: np.ndarray, modes: np.ndarray, x0: np.ndarray, v0: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """Displacements of every mass at every time from initial displacements and velocities.
+
+    The initial state is projected onto the modes (q = Vᵀ x0, q̇ = Vᵀ v0) and each
+    mode evolves as q cos ωt + q̇ sin(ωt)/ω (q + q̇ t for a zero-frequency mode).
+    Returns an array of shape (len(times), N) built with two matrix products.
+    """
+    q0 = modes.T @ np.asarray(x0, dtype=float)
+    qdot0 = modes.T @ np.asarray(v0, dtype=float)
+    t = np.asarray(times, dtype=float)[:, np.newaxis]
+    omega = omegas[np.newaxis, :]
+    moving = omega > 1e-12
+    safe_omega = np.where(moving, omega, 1.0)
+    sin_term = np.where(moving, np.sin(safe_omega * t) / safe_omega, t)
+    modal = np.cos(omega * t) * q0 + sin_term * qdot0
+    return modal @ modes.T
+
+
+def initial_displacement(kind: str, num_masses: int, amplitude_m: float, modes: np.ndarray | None = None, mode_number: int = 1):
+    """Initial displacement patterns offered on the page.
+
+    kind: "pluck" (first mass displaced), "pulse" (Gaussian bump a quarter of the
+    way along the chain) or "mode" (a pure normal mode, scaled so its largest
+    displacement equals the amplitude).
+    """
+    x0 = np.zeros(num_masses)
+    if kind == "pluck":
+        x0[0] = amplitude_m
+    elif kind == "pulse":
+        index = np.arange(num_masses)
+        width = max(num_masses / 40.0, 1.0)
+        x0 = amplitude_m * np.exp(-0.5 * ((index - num_masses / 4.0) / width) ** 2)
+    elif kind == "mode":
+        shape = modes[:, mode_number - 1]
+        x0 = amplitude_m * shape / np.max(np.abs(shape))
+    else:
+        raise ValueError(f"unknown initial displacement: {kind!r}")
+    return x0
+
+
+@memoize(name="coupled.animation")
+def compute_chain_animation(
+    num_masses: int,
+    mass_kg: float,
+    spring_constant_n_per_m: float,
+    boundary: str,
+    start: str,
+    amplitude_m: float,
+    mode_number: int,
+    duration_s: float,
+    num_frames: int = 60,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Frame times and displacements (num_frames × N) for the chain animation, starting from rest."""
+    omegas, modes = compute_normal_modes(num_masses, mass_kg, spring_constant_n_per_m, boundary)
+    x0 = initial_displacement(start, num_masses, amplitude_m, modes, mode_number)
+    times = np.linspace(0.0, max(duration_s, 1e-3), num=max(num_frames, 2))
+    return times, superpose_modes(omegas, modes, x0, np.zeros(num_masses), times)
+
+
+def uniform_chain_frequencies(num_masses: int, mass_kg: float, spring_constant_n_per_m: float) -> np.ndarray:
+    """Closed-form ω_j = 2 sqrt(k/m) sin( jπ / (2(N+1)) ) for a fixed-fixed chain, the page's check on the eigensolver."""
+    j = np.arange(1, num_masses + 1)
+    return 2.0 * math.sqrt(spring_constant_n_per_m / mass_kg) * np.sin(j * math.pi / (2.0 * (num_masses + 1)))
@@ -0,0 +1,83 @@
+import functools
+
+import numpy as np
+from scipy.interpolate import PchipInterpolator
+
+from lab_formulas import cunningham_correction
+
+# Knudsen numbers covered by the table; values outside fall back to the exact formula
+TABLE_KN_MIN = 1e-4
+TABLE_KN_MAX = 1e3
+# Default bound on the relative error of A (and therefore of C) inside the table range
+DEFAULT_REL_TOL = 1e-9
+# The error is checked at this many evenly spaced points inside every table interval
+CHECK_POINTS_PER_INTERVAL = 16
+MAX_TABLE_POINTS = 1 << 20
+
+
+class CunninghamTable:
+    """Precomputed Kn → (A, C) for one set of Cunningham coefficients.
+
+    A(Kn) = a0 + a1 exp(−a2/Kn) is tabulated on a grid that is uniform in
+    ln Kn and interpolated with a monotone (PCHIP) cubic, so evaluating it is an
+    index computation and a Horner step instead of an exp. Because
+    C − 1 = A Kn and A Kn / C < 1, the relative error of C never exceeds the
+    relative error of A, which is measured on a check grid when the table is
+    built and stored as `max_error`.
+    """
+
+    def __init__(self, a0: float, a1: float, a2: float, num_points: int, kn_min: float = TABLE_KN_MIN, kn_max: float = TABLE_KN_MAX):
+        self.a0, self.a1, self.a2 = float(a0), float(a1), float(a2)
+        self.kn_min, self.kn_max = float(kn_min), float(kn_max)
+        self.u0 = float(np.log(kn_min))
+        nodes = np.linspace(self.u0, float(np.log(kn_max)), int(num_points))
+        self.step = float(nodes[1] - nodes[0])
+        self.num_points = int(num_points)
+        exact_A, _ = cunningham_correction(np.exp(nodes), self.a0, self.a1, self.a2)
+        # Local cubic coefficients per interval, highest power first, in s = ln Kn − node
+        coefficients = PchipInterpolator(nodes, exact_A).c
+        self._c3, self._c2, self._c1, self._c0 = (np.ascontiguousarray(row) for row in coefficients)
+        self.max_error = self._measure_error()
+
+    def _interpolate_A(self, kn: np.ndarray) -> np.ndarray:
+        x = (np.log(kn) - self.u0) * (1.0 / self.step)
+        index = x.astype(np.intp)
+        np.clip(index, 0, self.num_points - 2, out=index)
+        s = (x - index) * self.step
+        return ((self._c3[index] * s + self._c2[index]) * s + self._c1[index]) * s + self._c0[index]
+
+    def _measure_error(self) -> float:
+        u = np.linspace(self.u0, self.u0 + self.step * (self.num_points - 1), (self.num_points - 1) * CHECK_POINTS_PER_INTERVAL + 1)
+        kn = np.exp(u)
+        exact_A, _ = cunningham_correction(kn, self.a0, self.a1, self.a2)
+        return float(np.max(np.abs(self._interpolate_A(kn) / exact_A - 1.0)))
+
+    def correction(self, knudsen_number):
+        """(A, C) like lab_formulas.cunningham_correction, from the table where Kn is in range."""
+        kn = np.asarray(knudsen_number, dtype=float)
+        inside = (kn >= self.kn_min) & (kn <= self.kn_max)
+        if np.all(inside):
+            A = self._interpolate_A(kn)
+        else:
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                A, _ = cunningham_correction(kn, self.a0, self.a1, self.a2)
+            A = np.array(A, dtype=float)
+            A[inside] = self._interpolate_A(kn[inside])
+        return A, 1.0 + A * kn
+
+
+@functools.lru_cache(maxsize=16)
+def cunningham_table(a0: float, a1: float, a2: float, rel_tol: float = DEFAULT_REL_TOL) -> CunninghamTable:
+    """Smallest power-of-two table for (a0, a1, a2) whose measured error is within rel_tol.
+
+    The grid is doubled until the check passes; tables are built once per
+    coefficient set and shared.
+    """
+    num_points = 257
+    while True:
+        table = CunninghamTable(a0, a1, a2, num_points)
+        if table.max_error <= rel_tol:
+            return table
+        if num_points >= MAX_TABLE_POINTS:
+            raise ValueError(f"no table up to {MAX_TABLE_POINTS} points reaches a relative error of {rel_tol:g}")
+        num_points = 2 * (num_points - 1) + 1
@@ -0,0 +1,257 @@
+import ast
+import functools
+from typing import Dict, Tuple
+
+import numpy as np
+
+from compute_cache import memoize
+
+# Functions a formula may call, mapped to their NumPy ufuncs (trig works in radians)
+FUNCTIONS = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "abs": np.abs,
+    "radians": np.radians,
+    "degrees": np.degrees,
+}
+CONSTANTS = {"pi": np.pi, "e": np.e}
+
+_ALLOWED_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+_ALLOWED_UNARYOPS = (ast.UAdd, ast.USub)
+
+# Longest formula text and deepest nesting of operations accepted; both keep
+# parsing, validation and compilation well inside Python's recursion limit
+MAX_FORMULA_LENGTH = 1000
+MAX_FORMULA_DEPTH = 100
+
+# 2^20 corners (about a million formula evaluations) is the most one call will evaluate
+MAX_UNCERTAIN_VARIABLES = 20
+# Corners evaluated per batch; memory use is set by this, not by the number of corners
+CORNER_CHUNK_SIZE = 1 << 14
+
+
+class FormulaError(ValueError):
+    """Raised when a formula cannot be parsed or uses something outside the whitelist."""
+
+
+class CompiledFormula:
+    """A validated formula compiled to a NumPy function of its variables.
+
+    Calling it with keyword arrays (one per name in `variables`) evaluates the
+    whole batch in one pass.
+    """
+
+    def __init__(self, expression: str, variables: Tuple[str, ...], func) -> None:
+        self.expression = expression
+        self.variables = variables
+        self.func = func
+
+    def __call__(self, **values):
+        missing = [name for name in self.variables if name not in values]
+        if missing:
+            raise FormulaError(f"missing values for: {', '.join(missing)}")
+        try:
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore", under="ignore"):
+                return self.func(*(np.asarray(values[name], dtype=float) for name in self.variables))
+        except ArithmeticError as exc:
+            raise FormulaError(f"the formula could not be evaluated: {exc}") from None
+
+
+class _FloatConstants(ast.NodeTransformer):
+    """Wrap every number in _number(...) so constant subexpressions use float64 arithmetic.
+
+    Plain Python ints would make 9**9**9 an arbitrarily large integer that never
+    finishes computing, and Python floats raise on 1/0 or 2.0**10000; float64
+    gives inf or nan instead, which range_method reports as undefined.
+    """
+
+    def visit_Constant(self, node):
+        return ast.copy_location(
+            ast.Call(func=ast.Name(id="_number", ctx=ast.Load()), args=[ast.Constant(value=float(node.value))], keywords=[]),
+            node,
+        )
+
+
+def _depth(tree: ast.AST) -> int:
+    """Nesting depth of a parsed tree, found without recursion."""
+    deepest = 0
+    stack = [(tree, 1)]
+    while stack:
+        node, depth = stack.pop()
+        deepest = max(deepest, depth)
+        stack.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
+    return deepest
+
+
+def _validate(node: ast.AST, variables: list) -> None:
+    """Walk the parsed tree, rejecting anything that is not arithmetic, a whitelisted call, a number or a name."""
+    if isinstance(node, ast.Expression):
+        _validate(node.body, variables)
+    elif isinstance(node, ast.BinOp):
+        if not isinstance(node.op, _ALLOWED_BINOPS):
+            raise FormulaError(f"operator {type(node.op).__name__} is not allowed")
+        _validate(node.left, variables)
+        _validate(node.right, variables)
+    elif isinstance(node, ast.UnaryOp):
+        if not isinstance(node.op, _ALLOWED_UNARYOPS):
+            raise FormulaError(f"operator {type(node.op).__name__} is not allowed")
+        _validate(node.operand, variables)
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise FormulaError(f"unknown function: {ast.unparse(node.func)}")
+        if node.keywords or len(node.args) != 1:
+            raise FormulaError(f"{node.func.id}() takes exactly one argument")
+        _validate(node.args[0], variables)
+    elif isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise FormulaError(f"only numbers are allowed as constants, not {node.value!r}")
+        try:
+            float(node.value)
+        except OverflowError:
+            raise FormulaError("a number in the formula is too large") from None
+    elif isinstance(node, ast.Name):
+        if node.id in FUNCTIONS:
+            raise FormulaError(f"{node.id} is a function; call it as {node.id}(...)")
+        if node.id.startswith("_"):
+            raise FormulaError(f"variable names cannot start with an underscore: {node.id}")
+        if node.id not in CONSTANTS and node.id not in variables:
+            variables.append(node.id)
+    else:
+        raise FormulaError(f"{type(node).__name__} is not allowed in a formula")
+
+
+@functools.lru_cache(maxsize=256)
+def compile_formula(expression: str) -> CompiledFormula:
+    """Parse `expression` with ast, check it against the whitelist and compile it.
+
+    Variables are every name that is not a function or a constant (pi, e), in
+    order of first appearance. Compiled formulas are cached by expression text,
+    so re-running a page does not re-parse an unchanged formula. Formulas longer
+    than MAX_FORMULA_LENGTH or nested deeper than MAX_FORMULA_DEPTH are
+    rejected with a FormulaError.
+    """
+    text = expression.strip().replace("^", "**")
+    if not text:
+        raise FormulaError("the formula is empty")
+    if len(text) > MAX_FORMULA_LENGTH:
+        raise FormulaError(f"the formula is longer than {MAX_FORMULA_LENGTH} characters")
+    try:
+        tree = ast.parse(text, mode="eval")
+    except (SyntaxError, ValueError) as exc:
+        raise FormulaError(f"could not parse the formula: {getattr(exc, 'msg', exc)}") from None
+    except (RecursionError, MemoryError):
+        raise FormulaError("the formula is nested too deeply to parse") from None
+    if _depth(tree) > MAX_FORMULA_DEPTH:
+        raise FormulaError(f"the formula nests more than {MAX_FORMULA_DEPTH} operations deep; split it into smaller steps")
+    variables = []
+    try:
+        _validate(tree, variables)
+        tree = _FloatConstants().visit(tree)
+    except (RecursionError, MemoryError):
+        raise FormulaError("the formula is nested too deeply to check") from None
+
+    # Wrap the checked expression in a lambda of its variables and compile that
+    lam = ast.Expression(body=ast.Lambda(
+        args=ast.arguments(
+            posonlyargs=[], args=[ast.arg(arg=name) for name in variables],
+            kwonlyargs=[], kw_defaults=[], defaults=[],
+        ),
+        body=tree.body,
+    ))
+    namespace = {"__builtins__": {}, "_number": np.float64, **FUNCTIONS, **CONSTANTS}
+    try:
+        ast.fix_missing_locations(lam)
+        func = eval(compile(lam, "<formula>", "eval"), namespace)
+    except (RecursionError, MemoryError):
+        raise FormulaError("the formula is nested too deeply to compile") from None
+    return CompiledFormula(text, tuple(variables), func)
+
+
+def corner_signs(num_variables: int, start: int = 0, stop: int | None = None) -> np.ndarray:
+    """Sign patterns (−1/+1) start … stop − 1 of all 2^n, shape (stop − start, n), read off the bits of the row numbers.
+
+    Rows come in the same order as itertools.product((−1, +1), repeat=n);
+    by default all 2^n are returned.
+    """
+    stop = 2 ** num_variables if stop is None else stop
+    shifts = np.arange(num_variables - 1, -1, -1)
+    bits = (np.arange(start, stop)[:, np.newaxis] >> shifts) & 1
+    return 2.0 * bits - 1.0
+
+
+@memoize(name="formula.range_method")
+def range_method(expression: str, values: Dict[str, float], uncertainties: Dict[str, float]) -> dict:
+    """Range-method result for any formula: evaluate every corner of the uncertainty box.
+
+    Each variable with a non-zero uncertainty is set to value ± uncertainty in
+    every combination (2^n corners), and the formula is evaluated on them in
+    vectorized batches of CORNER_CHUNK_SIZE. High and low are the largest and
+    smallest corner values, which are the true extremes whenever the formula is
+    monotonic in each variable over the box (as the hand-coded page formulas
+    assume).
+
+    Returns a dict with nominal, low, high, half_range, the sign pattern of the
+    high and low corners and the number of corners evaluated. "nominal_in_range"
+    is False when the nominal value falls outside [low, high], a sign that the
+    formula turns around (or crosses a singularity) inside the box.
+    """
+    formula = compile_formula(expression)
+    nominal = float(formula(**values))
+
+    uncertain = [name for name in formula.variables if abs(uncertainties.get(name, 0.0)) > 0.0]
+    if len(uncertain) > MAX_UNCERTAIN_VARIABLES:
+        raise FormulaError(f"at most {MAX_UNCERTAIN_VARIABLES} variables can have an uncertainty")
+
+    # Corners are evaluated CORNER_CHUNK_SIZE at a time, keeping only the running extremes
+    num_corners = 2 ** len(uncertain)
+    finite = bool(np.isfinite(nominal))
+    high, low, i_high, i_low = -np.inf, np.inf, 0, 0
+    for start in range(0, num_corners if finite else 0, CORNER_CHUNK_SIZE):
+        signs = corner_signs(len(uncertain), start, min(start + CORNER_CHUNK_SIZE, num_corners))
+        inputs = {name: np.full(signs.shape[0], float(values[name])) for name in formula.variables}
+        for column, name in enumerate(uncertain):
+            inputs[name] = values[name] + signs[:, column] * abs(uncertainties[name])
+        corners = np.broadcast_to(formula(**inputs), (signs.shape[0],))
+        if not np.all(np.isfinite(corners)):
+            finite = False
+            break
+        j_high, j_low = int(np.argmax(corners)), int(np.argmin(corners))
+        if corners[j_high] > high:
+            high, i_high = float(corners[j_high]), start + j_high
+        if corners[j_low] < low:
+            low, i_low = float(corners[j_low]), start + j_low
+
+    if not finite:
+        return {
+            "ok": False,
+            "error": "The formula is undefined (division by zero or outside its domain) somewhere in the uncertainty box.",
+            "nominal": nominal, "low": None, "high": None, "half_range": None,
+            "high_corner": None, "low_corner": None, "num_corners": int(num_corners),
+            "nominal_in_range": False,
+        }
+
+    high_signs = corner_signs(len(uncertain), i_high, i_high + 1)[0]
+    low_signs = corner_signs(len(uncertain), i_low, i_low + 1)[0]
+    return {
+        "ok": True,
+        "error": None,
+        "nominal": nominal,
+        "low": low,
+        "high": high,
+        "half_range": (high - low) / 2.0,
+        "high_corner": {name: int(high_signs[column]) for column, name in enumerate(uncertain)},
+        "low_corner": {name: int(low_signs[column]) for column, name in enumerate(uncertain)},
+        "num_corners": int(num_corners),
+        "nominal_in_range": bool(low - 1e-12 * abs(low) <= nominal <= high + 1e-12 * abs(high)),
+    }
@@ -0,0 +1,174 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+from cunningham_table import cunningham_table
+from lab_formulas import cunningham_correction
+from measurement import Measurement
+
+# Guard used by the calculators before dividing by a sine or a distance
+SMALL = 1e-12
+
+SNELL_ERRORS = {
+    1: "sin(θ1) is zero or too small; θ1 must not be 0°, 180°, etc.",
+    2: "sin(θ1 − Δθ1) is zero or too small; adjust uncertainties.",
+    3: "sin(θ1 + Δθ1) is zero or too small; adjust uncertainties.",
+}
+
+SLIP_ERRORS = {
+    1: "density difference (oil − air) must be positive.",
+    2: "invalid radius computed (check inputs).",
+    3: "invalid Cunningham factor C (≤0).",
+}
+
+# One record per iteration stage of the slip correction
+SLIP_STAGE_DTYPE = np.dtype([
+    ("eta_in", "f8"), ("radius", "f8"), ("kn", "f8"), ("A", "f8"), ("C", "f8"), ("eta_out", "f8"),
+])
+
+
+def _to_radians(angle: Measurement) -> Measurement:
+    return np.radians(angle) if angle.unit == "deg" else angle
+
+
+def snell_range(theta1: Measurement, theta2: Measurement) -> Tuple[Measurement, np.ndarray]:
+    """Refractive index n2 = sin θ2 / sin θ1 (n1 = 1) with the lab's range-method corners, for any number of rows.
+
+    The angles are range-rule Measurements in "deg" or "rad". High and low are
+    the lab's corner pairs, sin(θ2 + Δθ2)/sin(θ1 − Δθ1) and
+    sin(θ2 − Δθ2)/sin(θ1 + Δθ1), exactly as students are asked to compute them.
+    Returns (n, error_code) where error_code is 0 for valid rows and a key of
+    SNELL_ERRORS otherwise (n is NaN there).
+    """
+    t1 = _to_radians(theta1)
+    t2 = _to_radians(theta2)
+    sin_t1 = np.sin(t1.value)
+    sin_t1_low = np.sin(t1.low)
+    sin_t1_high = np.sin(t1.high)
+    error = np.select(
+        [np.abs(sin_t1) < SMALL, np.abs(sin_t1_low) < SMALL, np.abs(sin_t1_high) < SMALL],
+        [1, 2, 3],
+        default=0,
+    )
+    bad = error > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        nominal = np.where(bad, np.nan, np.sin(t2.value) / sin_t1)
+        high = np.where(bad, np.nan, np.sin(t2.high) / sin_t1_low)
+        low = np.where(bad, np.nan, np.sin(t2.low) / sin_t1_high)
+    return Measurement.from_bounds(nominal, low, high), error
+
+
+def _safe_inv(x):
+    """1/x with NaN where |x| < SMALL (the workbook's blank cells)."""
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide="ignore"):
+        return np.where(np.abs(x) < SMALL, np.nan, 1.0 / x)
+
+
+def thin_lens_range(
+    object_pos_cm,
+    lens_pos_cm,
+    unc_lens_pos_cm,
+    smallest_focal_pos_cm,
+    largest_focal_pos_cm,
+    assumed_do_abs_unc_cm=0.2,
+) -> Dict[str, object]:
+    """The optics workbook row calculation for any number of rows at once.
+
+    Inputs are plain floats or arrays of rows (column letters as in the sheet).
+    The image position is E = (D + F)/2 ± J with J = (F − D)/2, the image
+    distance di = E − B carries K = J + C, and the object distance do = B − A
+    carries the assumed |Δdo|. The reciprocal columns are the workbook's
+    1/(di ∓ K) and 1/(do ∓ |Δdo|), written as in the sheet (NaN where a
+    distance is zero). Returns Measurements plus the intermediate columns as
+    arrays and an "ok" mask, with no per-row objects.
+    """
+    lens_pos = np.asarray(lens_pos_cm, dtype=float)
+    smallest = np.asarray(smallest_focal_pos_cm, dtype=float)
+    largest = np.asarray(largest_focal_pos_cm, dtype=float)
+    E_best = (smallest + largest) / 2.0
+    J_unc_image_pos = (largest - smallest) / 2.0
+    K_unc_image_dist = J_unc_image_pos + np.asarray(unc_lens_pos_cm, dtype=float)
+    H_di = E_best - lens_pos
+    G_do = lens_pos - np.asarray(object_pos_cm, dtype=float)
+
+    object_distance = Measurement(G_do, assumed_do_abs_unc_cm, "cm")
+    image_distance = Measurement.from_bounds(H_di, H_di - K_unc_image_dist, H_di + K_unc_image_dist, "cm")
+
+    inv_di = Measurement.from_bounds(_safe_inv(H_di), _safe_inv(image_distance.high), _safe_inv(image_distance.low), "1/cm")
+    inv_do = Measurement.from_bounds(_safe_inv(G_do), _safe_inv(object_distance.high), _safe_inv(object_distance.low), "1/cm")
+    return {
+        "ok": np.isfinite(inv_di.value) & np.isfinite(inv_do.value),
+        "E_best_focal_pos": E_best,
+        "J_unc_image_pos": J_unc_image_pos,
+        "K_unc_image_distance": K_unc_image_dist,
+        "object_distance": object_distance,
+        "image_distance": image_distance,
+        "inv_di": inv_di,
+        "inv_do": inv_do,
+    }
+
+
+def slip_iteration(
+    rho_oil,
+    rho_air,
+    gravity,
+    velocity,
+    eta_base,
+    mean_free_path_m,
+    a0,
+    a1,
+    a2,
+    iterations: int = 5,
+    use_table: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """The slip-correction workbook iteration for many drops at once.
+
+    Each stage i computes r_i from η_i, Kn_i = λ / r_i, (A_i, C_i) and
+    η_{i+1} = η_base / C_i. Returns (stages, num_valid, error_code) where
+    stages is a SLIP_STAGE_DTYPE array of shape (iterations,) + row shape,
+    num_valid counts the stages completed before the first failure and
+    error_code is 0 or a key of SLIP_ERRORS. Stages after a failure are NaN.
+
+    With use_table=True and one set of (a0, a1, a2) for every row, C comes from
+    the precomputed lookup table in cunningham_table (relative error ≤ 1e-9)
+    instead of the exact exponential.
+
+    Unlike snell_range and thin_lens_range this takes plain values, not
+    Measurements: the uncertainty of r_N and η_N is propagated by the Slip
+    Correction page, by quadrature through lab_formulas.slip_correction and by
+    Monte Carlo through this function.
+    """
+    args = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (rho_oil, rho_air, gravity, velocity, eta_base, mean_free_path_m, a0, a1, a2)))
+    rho_oil, rho_air, gravity, velocity, eta_base, mean_free_path_m, a0, a1, a2 = args
+    shape = rho_oil.shape
+    table = None
+    if use_table and rho_oil.size and all(np.all(c == c.flat[0]) for c in (a0, a1, a2)):
+        table = cunningham_table(float(a0.flat[0]), float(a1.flat[0]), float(a2.flat[0]))
+    stages = np.full((iterations,) + shape, np.nan, dtype=SLIP_STAGE_DTYPE)
+
+    density_difference = rho_oil - rho_air
+    error = np.where(density_difference <= 0, 1, 0)
+    num_valid = np.zeros(shape, dtype=int)
+    denom = density_difference * (4.0 * gravity / 3.0)
+    eta = eta_base.copy()
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for i in range(iterations):
+            alive = error == 0
+            arg = 6.0 * eta * velocity / denom
+            radius_ok = (denom > 0) & (eta > 0) & (velocity > 0) & (arg > 0)
+            radius = np.sqrt(np.where(radius_ok, arg, np.nan))
+            error = np.where(alive & ~radius_ok, 2, error)
+
+            kn = mean_free_path_m / radius
+            positive_kn = np.where(kn > 0, kn, np.nan)
+            A, C = table.correction(positive_kn) if table is not None else cunningham_correction(positive_kn, a0, a1, a2)
+            error = np.where((error == 0) & ~(C > 0), 3, error)
+
+            done = alive & (error == 0)
+            eta_out = eta_base / C
+            for name, values in (("eta_in", eta), ("radius", radius), ("kn", kn), ("A", A), ("C", C), ("eta_out", eta_out)):
+                stages[name][i] = np.where(done, values, np.nan)
+            num_valid = num_valid + done
+            eta = np.where(done, eta_out, eta)
+    return stages, num_valid, error
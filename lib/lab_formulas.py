@@ -0,0 +1,61 @@
+import numpy as np
+
+
+def snell_index(theta1_deg, theta2_deg):
+    """n2 = sin θ2 / sin θ1 (taking n1 = 1) for scalars or arrays of angles in degrees."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.sin(np.radians(theta2_deg)) / np.sin(np.radians(theta1_deg))
+
+
+def reciprocal(x):
+    """1/x elementwise; zero distances give ±inf rather than raising."""
+    with np.errstate(divide="ignore"):
+        return np.divide(1.0, x)
+
+
+def image_distance(lens_pos_cm, image_pos_cm):
+    """di = E − B, the image position measured from the lens."""
+    return np.subtract(image_pos_cm, lens_pos_cm)
+
+
+def thin_lens_focal_length(object_distance_cm, image_distance_cm):
+    """f from the thin-lens equation 1/f = 1/do + 1/di."""
+    return reciprocal(reciprocal(object_distance_cm) + reciprocal(image_distance_cm))
+
+
+def stokes_radius(eta, velocity, density_difference, gravity):
+    """r = sqrt( 6 η v / (Δρ · 4g/3) ), the workbook arrangement of Stokes' law."""
+    return np.sqrt(6.0 * eta * velocity / (density_difference * (4.0 * gravity / 3.0)))
+
+
+def cunningham_correction(knudsen_number, a0, a1, a2):
+    """(A, C) with A = a0 + a1 exp(−a2/Kn) and C = 1 + A Kn."""
+    A = a0 + a1 * np.exp(-a2 / knudsen_number)
+    return A, 1.0 + A * knudsen_number
+
+
+def slip_correction(rho_oil, rho_air, gravity, velocity, eta_base, mean_free_path_m, a0, a1, a2, iterations: int = 5):
+    """(r_N, η_N) after the workbook iteration (η_{i+1} = η_base / C_i), for arrays of drops at once.
+
+    r_N matches the last stage's radius from the Slip Correction page's
+    iteration and η_N = η_base / C_{N−1} is the viscosity it leaves.
+    """
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1")
+    density_difference = rho_oil - rho_air
+    eta = eta_base
+    for _ in range(iterations):
+        radius = stokes_radius(eta, velocity, density_difference, gravity)
+        _, C = cunningham_correction(mean_free_path_m / radius, a0, a1, a2)
+        eta = eta_base / C
+    return radius, eta
+
+
+def slip_corrected_radius(rho_oil, rho_air, gravity, velocity, eta_base, mean_free_path_m, a0, a1, a2, iterations: int = 5):
+    """Radius r_N from slip_correction."""
+    return slip_correction(rho_oil, rho_air, gravity, velocity, eta_base, mean_free_path_m, a0, a1, a2, iterations)[0]
+
+
+def slip_corrected_viscosity(rho_oil, rho_air, gravity, velocity, eta_base, mean_free_path_m, a0, a1, a2, iterations: int = 5):
+    """Viscosity η_N from slip_correction, the companion of slip_corrected_radius."""
+    return slip_correction(rho_oil, rho_air, gravity, velocity, eta_base, mean_free_path_m, a0, a1, a2, iterations)[1]
@@ -0,0 +1,116 @@
+import numpy as np
+
+from compute_cache import memoize
+
+# Bootstrap chunks are sized so one (resamples × rows) index matrix stays near this many entries
+BOOTSTRAP_CHUNK_ELEMENTS = 4_000_000
+
+
+def weighted_intercept(inv_do, sigma_inv_do, inv_di, sigma_inv_di):
+    """Weighted least-squares fit of 1/di = 1/f − 1/do with the slope fixed at −1.
+
+    With z = 1/di + 1/do every row estimates 1/f directly. Both coordinates are
+    uncertain, so each row is weighted by its effective variance
+    σ_z² = σ(1/di)² + σ(1/do)² (exact for a slope of magnitude 1).
+    Returns (1/f, σ(1/f), χ², weights).
+    """
+    z = np.asarray(inv_di, dtype=float) + np.asarray(inv_do, dtype=float)
+    variance = np.asarray(sigma_inv_di, dtype=float) ** 2 + np.asarray(sigma_inv_do, dtype=float) ** 2
+    weights = 1.0 / variance
+    total = np.sum(weights)
+    c = float(np.sum(weights * z) / total)
+    chi2 = float(np.sum(weights * (z - c) ** 2))
+    return c, float(1.0 / np.sqrt(total)), chi2, weights
+
+
+def free_slope_fit(inv_do, inv_di, weights):
+    """Weighted straight line 1/di = a + b (1/do); a slope near −1 confirms the thin-lens model."""
+    x = np.asarray(inv_do, dtype=float)
+    y = np.asarray(inv_di, dtype=float)
+    W = np.sum(weights)
+    x_bar = np.sum(weights * x) / W
+    y_bar = np.sum(weights * y) / W
+    sxx = np.sum(weights * (x - x_bar) ** 2)
+    if sxx <= 0:
+        return float("nan"), float("nan"), float("nan")
+    slope = np.sum(weights * (x - x_bar) * (y - y_bar)) / sxx
+    return float(y_bar - slope * x_bar), float(slope), float(1.0 / np.sqrt(sxx))
+
+
+def bootstrap_intercepts(z, weights, n_resamples: int, seed: int) -> np.ndarray:
+    """Refit 1/f on `n_resamples` row resamples drawn with replacement.
+
+    Each chunk draws a (resamples × rows) matrix of row indices in one call and
+    evaluates every resampled weighted mean Σ w z / Σ w with two gathers and
+    row sums; chunking keeps that matrix small enough for class-sized data sets.
+    """
+    z = np.asarray(z, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    n = z.size
+    rng = np.random.default_rng(seed)
+    chunk = max(1, BOOTSTRAP_CHUNK_ELEMENTS // max(n, 1))
+    wz = weights * z
+    out = np.empty(n_resamples)
+    for start in range(0, n_resamples, chunk):
+        stop = min(start + chunk, n_resamples)
+        rows = rng.integers(0, n, size=(stop - start, n))
+        out[start:stop] = wz[rows].sum(axis=1) / weights[rows].sum(axis=1)
+    return out
+
+
+@memoize(name="optics.focal_fit")
+def fit_focal_length(
+    inv_do: np.ndarray,
+    sigma_inv_do: np.ndarray,
+    inv_di: np.ndarray,
+    sigma_inv_di: np.ndarray,
+    n_resamples: int = 10_000,
+    seed: int = 0,
+    confidence: float = 0.95,
+) -> dict:
+    """Focal length from many (1/do, 1/di) rows: weighted fit, σ_f and a bootstrap interval.
+
+    σ_f = σ(1/f) / (1/f)² from the weighted fit; the bootstrap interval is the
+    central `confidence` range of f over the resampled fits. Rows with a
+    non-finite value or a zero uncertainty are dropped and counted.
+    """
+    inv_do = np.asarray(inv_do, dtype=float)
+    inv_di = np.asarray(inv_di, dtype=float)
+    sigma_inv_do = np.broadcast_to(np.asarray(sigma_inv_do, dtype=float), inv_do.shape)
+    sigma_inv_di = np.broadcast_to(np.asarray(sigma_inv_di, dtype=float), inv_di.shape)
+    usable = (
+        np.isfinite(inv_do) & np.isfinite(inv_di) & np.isfinite(sigma_inv_do) & np.isfinite(sigma_inv_di)
+        & (sigma_inv_do ** 2 + sigma_inv_di ** 2 > 0)
+    )
+    n = int(np.count_nonzero(usable))
+    if n < 2:
+        return {"ok": False, "error": "At least two rows with finite values and non-zero uncertainties are needed.", "n_rows": n, "n_dropped": int(usable.size - n)}
+
+    x, sx, y, sy = inv_do[usable], sigma_inv_do[usable], inv_di[usable], sigma_inv_di[usable]
+    c, sigma_c, chi2, weights = weighted_intercept(x, sx, y, sy)
+    intercept, slope, sigma_slope = free_slope_fit(x, y, weights)
+
+    boot_c = bootstrap_intercepts(x + y, weights, int(n_resamples), int(seed))
+    with np.errstate(divide="ignore"):
+        boot_f = 1.0 / boot_c
+    tail = 50.0 * (1.0 - confidence)
+    f_low, f_high = np.percentile(boot_f, [tail, 100.0 - tail])
+
+    return {
+        "ok": True,
+        "error": None,
+        "n_rows": n,
+        "n_dropped": int(usable.size - n),
+        "inv_f": c,
+        "sigma_inv_f": sigma_c,
+        "f": 1.0 / c,
+        "sigma_f": sigma_c / c ** 2,
+        "chi2": chi2,
+        "reduced_chi2": chi2 / (n - 1),
+        "free_intercept": intercept,
+        "free_slope": slope,
+        "sigma_free_slope": sigma_slope,
+        "bootstrap_f_std": float(np.std(boot_f, ddof=1)),
+        "bootstrap_ci": (float(f_low), float(f_high)),
+        "confidence": confidence,
+    }
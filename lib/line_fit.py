@@ -0,0 +1,52 @@
+import numpy as np
+
+from compute_cache import memoize
+
+
+@memoize(name="fit.through_origin")
+def fit_through_origin(x: np.ndarray, y: np.ndarray, sigma_x: np.ndarray, sigma_y: np.ndarray, passes: int = 3) -> dict:
+    """Fit y = m x by weighted least squares, with uncertainty in both coordinates.
+
+    Each point is weighted by its effective variance σ_y² + m² σ_x², refined
+    over a few passes starting from the unweighted slope. When every point has
+    zero uncertainty the fit is unweighted and σ_m comes from the scatter of
+    the residuals instead. Returns slope, σ_slope, residuals, the per-point σ
+    used for them, and χ²/dof.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    sigma_x = np.broadcast_to(np.asarray(sigma_x, dtype=float), x.shape)
+    sigma_y = np.broadcast_to(np.asarray(sigma_y, dtype=float), y.shape)
+    n = x.size
+    sxx = float(np.sum(x * x))
+    if n < 1 or sxx <= 0:
+        return {"ok": False, "error": "At least one point away from x = 0 is needed for the fit."}
+
+    slope = float(np.sum(x * y) / sxx)
+    weighted = bool(np.all(sigma_x ** 2 + sigma_y ** 2 > 0))
+    if weighted:
+        for _ in range(max(passes, 1)):
+            sigma_eff = np.sqrt(sigma_y ** 2 + slope ** 2 * sigma_x ** 2)
+            w = 1.0 / sigma_eff ** 2
+            swxx = float(np.sum(w * x * x))
+            slope = float(np.sum(w * x * y) / swxx)
+        sigma_slope = float(1.0 / np.sqrt(swxx))
+        residuals = y - slope * x
+        chi2 = float(np.sum(residuals ** 2 * w))
+    else:
+        residuals = y - slope * x
+        scatter = float(np.sum(residuals ** 2) / (n - 1)) if n > 1 else float("nan")
+        sigma_eff = np.full(n, np.sqrt(scatter))
+        sigma_slope = float(np.sqrt(scatter / sxx))
+        chi2 = float("nan")
+    return {
+        "ok": True,
+        "error": None,
+        "slope": slope,
+        "sigma_slope": sigma_slope,
+        "residuals": residuals,
+        "sigma_residuals": sigma_eff,
+        "weighted": weighted,
+        "reduced_chi2": chi2 / (n - 1) if weighted and n > 1 else float("nan"),
+        "n_points": n,
+    }
@@ -0,0 +1,251 @@
+import math
+
+import numpy as np
+
+# One record per measurement: nominal value and the low/high ends of its uncertainty interval
+MEASUREMENT_DTYPE = np.dtype([("value", "f8"), ("low", "f8"), ("high", "f8")])
+
+# "range": interval arithmetic on (low, high), the worst-case range method
+# "quadrature": linearized σ = sqrt(Σ (∂f/∂x σ_x)²) for independent inputs
+RULES = ("range", "quadrature")
+
+# Unit conversions applied by np.radians / np.degrees
+_ANGLE_UNITS = {np.radians: ("deg", "rad"), np.deg2rad: ("deg", "rad"), np.degrees: ("rad", "deg"), np.rad2deg: ("rad", "deg")}
+
+# d/dx of the one-argument ufuncs a Measurement supports
+_DERIVATIVES = {
+    np.negative: lambda x: -np.ones_like(x),
+    np.sqrt: lambda x: 0.5 / np.sqrt(x),
+    np.exp: np.exp,
+    np.log: lambda x: 1.0 / x,
+    np.log10: lambda x: 1.0 / (x * math.log(10.0)),
+    np.sin: np.cos,
+    np.cos: lambda x: -np.sin(x),
+    np.tan: lambda x: 1.0 / np.cos(x) ** 2,
+    np.arcsin: lambda x: 1.0 / np.sqrt(1.0 - x ** 2),
+    np.arctan: lambda x: 1.0 / (1.0 + x ** 2),
+    np.radians: lambda x: np.full_like(x, math.pi / 180.0),
+    np.deg2rad: lambda x: np.full_like(x, math.pi / 180.0),
+    np.degrees: lambda x: np.full_like(x, 180.0 / math.pi),
+    np.rad2deg: lambda x: np.full_like(x, 180.0 / math.pi),
+}
+
+
+class Measurement:
+    """Values with uncertainties and a unit, stored as one structured NumPy array.
+
+    A Measurement may hold a single reading or a million rows; arithmetic and
+    the supported NumPy functions act on every row at once. The propagation
+    rule is fixed per Measurement:
+
+    - "range": low/high are the ends of an interval and results use interval
+      arithmetic (true extremes for +, −, ×, ÷; monotonic functions such as
+      sin on [−90°, 90°] map their end points).
+    - "quadrature": low/high sit at value ∓ σ and results combine the input σ
+      linearly in quadrature, assuming the operands are independent.
+
+    Units are plain tags: + and − require matching units, × and ÷ compose them,
+    and np.radians/np.degrees convert "deg" ↔ "rad".
+    """
+
+    __slots__ = ("data", "unit", "rule")
+    __array_priority__ = 1000
+
+    def __init__(self, value, uncertainty=0.0, unit: str = "", rule: str = "range") -> None:
+        if rule not in RULES:
+            raise ValueError(f"unknown propagation rule: {rule!r}")
+        value, uncertainty = np.broadcast_arrays(np.asarray(value, dtype=float), np.abs(np.asarray(uncertainty, dtype=float)))
+        self.data = np.empty(value.shape, dtype=MEASUREMENT_DTYPE)
+        self.data["value"] = value
+        self.data["low"] = value - uncertainty
+        self.data["high"] = value + uncertainty
+        self.unit = unit
+        self.rule = rule
+
+    @classmethod
+    def from_bounds(cls, value, low, high, unit: str = "", rule: str = "range") -> "Measurement":
+        """Build from explicit (possibly asymmetric) low/high ends without recomputing them."""
+        out = cls.__new__(cls)
+        value, low, high = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (value, low, high)))
+        out.data = np.empty(value.shape, dtype=MEASUREMENT_DTYPE)
+        out.data["value"] = value
+        out.data["low"] = low
+        out.data["high"] = high
+        out.unit = unit
+        out.rule = rule
+        return out
+
+    @property
+    def value(self) -> np.ndarray:
+        return self.data["value"]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.data["low"]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.data["high"]
+
+    @property
+    def uncertainty(self) -> np.ndarray:
+        """Half-range (high − low)/2 under the range rule, σ under quadrature."""
+        return (self.data["high"] - self.data["low"]) / 2.0
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index) -> "Measurement":
+        row = self.data[index]
+        return Measurement.from_bounds(row["value"], row["low"], row["high"], self.unit, self.rule)
+
+    def __repr__(self) -> str:
+        if self.data.ndim == 0:
+            return f"Measurement({float(self.value):.6g} [{float(self.low):.6g}, {float(self.high):.6g}] {self.unit}, rule={self.rule!r})"
+        return f"Measurement(shape={self.shape}, unit={self.unit!r}, rule={self.rule!r})"
+
+    def to(self, factor: float, unit: str) -> "Measurement":
+        """Rescale to another unit by a positive factor (e.g. nm → m with 1e-9)."""
+        return Measurement.from_bounds(self.value * factor, self.low * factor, self.high * factor, unit, self.rule)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs.get("out") is not None:
+            return NotImplemented
+        if len(inputs) == 1 and ufunc in _DERIVATIVES:
+            return _unary(ufunc, inputs[0])
+        if len(inputs) == 2 and ufunc in (np.add, np.subtract, np.multiply, np.divide):
+            return _binary(ufunc, *inputs)
+        if len(inputs) == 2 and ufunc is np.power and not isinstance(inputs[1], Measurement):
+            return _power(inputs[0], float(inputs[1]))
+        return NotImplemented
+
+    def __neg__(self):
+        return np.negative(self)
+
+    def __add__(self, other):
+        return np.add(self, other)
+
+    def __radd__(self, other):
+        return np.add(other, self)
+
+    def __sub__(self, other):
+        return np.subtract(self, other)
+
+    def __rsub__(self, other):
+        return np.subtract(other, self)
+
+    def __mul__(self, other):
+        return np.multiply(self, other)
+
+    def __rmul__(self, other):
+        return np.multiply(other, self)
+
+    def __truediv__(self, other):
+        return np.divide(self, other)
+
+    def __rtruediv__(self, other):
+        return np.divide(other, self)
+
+    def __pow__(self, exponent):
+        return np.power(self, exponent)
+
+
+def _as_measurement(x, like: Measurement) -> Measurement:
+    """Exact constants become zero-width Measurements with the other operand's rule."""
+    if isinstance(x, Measurement):
+        return x
+    return Measurement(x, 0.0, "", like.rule)
+
+
+def _binary_unit(ufunc, a: str, b: str) -> str:
+    if ufunc in (np.add, np.subtract):
+        if a and b and a != b:
+            raise ValueError(f"cannot combine units {a!r} and {b!r}")
+        return a or b
+    if not a and not b:
+        return ""
+    if ufunc is np.multiply:
+        return "·".join(u for u in (a, b) if u)
+    if not b:
+        return a
+    return f"{a or '1'}/({b})" if any(c in b for c in "·/") else f"{a or '1'}/{b}"
+
+
+def _binary(ufunc, a, b) -> Measurement:
+    like = a if isinstance(a, Measurement) else b
+    a = _as_measurement(a, like)
+    b = _as_measurement(b, like)
+    if a.rule != b.rule:
+        raise ValueError(f"cannot mix propagation rules {a.rule!r} and {b.rule!r}")
+    unit = _binary_unit(ufunc, a.unit, b.unit)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = ufunc(a.value, b.value)
+        if a.rule == "range":
+            if ufunc is np.add:
+                low, high = a.low + b.low, a.high + b.high
+            elif ufunc is np.subtract:
+                low, high = a.low - b.high, a.high - b.low
+            else:
+                corners = np.stack([ufunc(x, y) for x in (a.low, a.high) for y in (b.low, b.high)])
+                low, high = corners.min(axis=0), corners.max(axis=0)
+                if ufunc is np.divide:
+                    # A divisor interval that touches zero has no finite bounds
+                    spans_zero = (b.low <= 0.0) & (b.high >= 0.0)
+                    low = np.where(spans_zero, -np.inf, low)
+                    high = np.where(spans_zero, np.inf, high)
+        else:
+            sa, sb = a.uncertainty, b.uncertainty
+            if ufunc in (np.add, np.subtract):
+                sigma = np.hypot(sa, sb)
+            elif ufunc is np.multiply:
+                sigma = np.hypot(b.value * sa, a.value * sb)
+            else:
+                sigma = np.hypot(sa / b.value, a.value * sb / b.value ** 2)
+            low, high = value - sigma, value + sigma
+    return Measurement.from_bounds(value, low, high, unit, a.rule)
+
+
+def _unary(ufunc, x: Measurement) -> Measurement:
+    unit = x.unit
+    if ufunc in _ANGLE_UNITS:
+        source, target = _ANGLE_UNITS[ufunc]
+        if unit and unit != source:
+            raise ValueError(f"{ufunc.__name__} expects {source!r}, got {unit!r}")
+        unit = target
+    elif ufunc in (np.sin, np.cos, np.tan):
+        if unit not in ("", "rad"):
+            raise ValueError(f"{ufunc.__name__} needs radians; convert {unit!r} with np.radians first")
+        unit = ""
+    elif ufunc is np.sqrt:
+        unit = f"({unit})^0.5" if unit else ""
+    elif ufunc is not np.negative:
+        unit = ""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = ufunc(x.value)
+        if x.rule == "range":
+            ends = np.stack([ufunc(x.low), ufunc(x.high)])
+            low, high = ends.min(axis=0), ends.max(axis=0)
+        else:
+            sigma = np.abs(_DERIVATIVES[ufunc](x.value)) * x.uncertainty
+            low, high = value - sigma, value + sigma
+    return Measurement.from_bounds(value, low, high, unit, x.rule)
+
+
+def _power(x: Measurement, exponent: float) -> Measurement:
+    unit = f"({x.unit})^{exponent:g}" if x.unit else ""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = x.value ** exponent
+        if x.rule == "range":
+            ends = np.stack([x.low ** exponent, x.high ** exponent])
+            low, high = ends.min(axis=0), ends.max(axis=0)
+            # Even powers of an interval that straddles zero bottom out at zero
+            if exponent > 0 and float(exponent).is_integer() and int(exponent) % 2 == 0:
+                low = np.where((x.low < 0.0) & (x.high > 0.0), 0.0, low)
+        else:
+            sigma = np.abs(exponent * x.value ** (exponent - 1.0)) * x.uncertainty
+            low, high = value - sigma, value + sigma
+    return Measurement.from_bounds(value, low, high, unit, x.rule)
@@ -0,0 +1,193 @@
+import math
+
+import numpy as np
+
+from compute_cache import memoize
+from lab_calculations import SLIP_ERRORS, slip_iteration
+from lab_formulas import cunningham_correction
+
+# Candidate elementary charges scanned by the quantization fit [C]; the window
+# excludes e/2 and 2e, which would otherwise fit the same data as well or better
+E_SCAN_MIN = 1.2e-19
+E_SCAN_MAX = 2.2e-19
+E_SCAN_POINTS = 4000
+
+# The (droplets × candidates) residual matrix is built in chunks of about this many entries
+SCAN_CHUNK_ELEMENTS = 4_000_000
+
+MILLIKAN_ERRORS = dict(SLIP_ERRORS)
+MILLIKAN_ERRORS.update({
+    4: "fall speed, voltage and plate separation must be positive.",
+    5: "computed charge is not positive (check the rise speed sign).",
+})
+
+
+def droplet_charges(
+    v_fall,
+    v_rise,
+    voltage,
+    plate_separation_m,
+    rho_oil,
+    rho_air,
+    gravity,
+    eta_base,
+    mean_free_path_m,
+    a0,
+    a1,
+    a2,
+    iterations: int = 5,
+    use_table: bool = False,
+):
+    """Slip-corrected radius and charge of every droplet in one vectorized pass.
+
+    The radius is the last stage of the slip-correction iteration run on the
+    fall speed (the same solver as the step-by-step section). With the
+    buoyancy-corrected weight m g = (4/3)π r³ (ρ_oil − ρ_air) g and E = V / d,
+    the force balances while falling and rising give
+    q = m g (v_fall + v_rise) / (E v_fall), with v_rise > 0 meaning upward.
+    Returns (radius, charge, error_code); error_code is 0 or a key of
+    MILLIKAN_ERRORS, and radius/charge are NaN where it is not 0.
+    use_table is passed on to slip_iteration.
+    """
+    v_fall, v_rise, voltage, plate_separation_m = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (v_fall, v_rise, voltage, plate_separation_m))
+    )
+    stages, _, error = slip_iteration(rho_oil, rho_air, gravity, v_fall, eta_base, mean_free_path_m, a0, a1, a2, iterations, use_table)
+    inputs_ok = (v_fall > 0) & (voltage > 0) & (plate_separation_m > 0)
+    error = np.where(inputs_ok, error, 4)
+    radius = np.where(error == 0, stages["radius"][-1], np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = (4.0 / 3.0) * math.pi * radius ** 3 * (np.asarray(rho_oil, dtype=float) - rho_air) * gravity
+        field = voltage / plate_separation_m
+        charge = weight * (v_fall + v_rise) / (field * v_fall)
+    error = np.where((error == 0) & ~(charge > 0), 5, error)
+    return np.where(error == 0, radius, np.nan), np.where(error == 0, charge, np.nan), error
+
+
+def quantization_residuals(charges, candidates) -> np.ndarray:
+    """Mean squared distance of q/e from the nearest whole number, for each candidate e.
+
+    Scored in units of the candidate charge, so every candidate is judged on
+    the same 0 … 0.25 scale. The (droplets × candidates) matrix is evaluated
+    in chunks of candidates.
+    """
+    q = np.asarray(charges, dtype=float)
+    candidates = np.asarray(candidates, dtype=float)
+    out = np.empty(candidates.size)
+    chunk = max(1, SCAN_CHUNK_ELEMENTS // max(q.size, 1))
+    for start in range(0, candidates.size, chunk):
+        ratio = q[:, np.newaxis] / candidates[np.newaxis, start:start + chunk]
+        out[start:start + chunk] = np.mean((ratio - np.rint(ratio)) ** 2, axis=0)
+    return out
+
+
+@memoize(name="millikan.elementary_charge")
+def fit_elementary_charge(
+    charges: np.ndarray,
+    e_min: float = E_SCAN_MIN,
+    e_max: float = E_SCAN_MAX,
+    num_candidates: int = E_SCAN_POINTS,
+) -> dict:
+    """Estimate e from droplet charges by a residual scan followed by a least-squares refinement.
+
+    The scan picks the candidate whose multiples best explain every charge;
+    each droplet is then assigned n_i = round(q_i / e) and e is refined to
+    Σ n_i q_i / Σ n_i², with σ_e from the scatter of q_i − n_i e.
+    Non-finite charges are dropped.
+    """
+    q = np.asarray(charges, dtype=float)
+    q = q[np.isfinite(q) & (q > 0)]
+    if q.size < 2:
+        return {"ok": False, "error": "At least two droplets with a valid charge are needed."}
+
+    candidates = np.linspace(e_min, e_max, int(num_candidates))
+    residuals = quantization_residuals(q, candidates)
+    e_scan = float(candidates[np.argmin(residuals)])
+
+    n = np.maximum(np.rint(q / e_scan), 1.0)
+    e_fit = float(np.sum(n * q) / np.sum(n * n))
+    # One more assignment with the refined value settles droplets that sat near a half-integer
+    n = np.maximum(np.rint(q / e_fit), 1.0)
+    e_fit = float(np.sum(n * q) / np.sum(n * n))
+    scatter = q - n * e_fit
+    sigma_q = float(np.sqrt(np.sum(scatter ** 2) / (q.size - 1)))
+    return {
+        "ok": True,
+        "error": None,
+        "e": e_fit,
+        "sigma_e": sigma_q / float(np.sqrt(np.sum(n * n))),
+        "e_scan": e_scan,
+        "candidates": candidates,
+        "residuals": residuals,
+        "multiples": n.astype(int),
+        "charges": q,
+        "n_droplets": int(q.size),
+    }
+
+
+def simulate_droplets(
+    num_droplets: int,
+    seed: int,
+    voltage: float,
+    plate_separation_m: float,
+    rho_oil: float,
+    rho_air: float,
+    gravity: float,
+    eta_base: float,
+    mean_free_path_m: float,
+    a0: float,
+    a1: float,
+    a2: float,
+    noise_fraction: float = 0.01,
+    elementary_charge: float = 1.602176634e-19,
+    max_multiple: int = 6,
+):
+    """Synthetic class data: fall and rise speeds for random droplets carrying 1 … max_multiple charges.
+
+    Radii are drawn between 0.3 and 0.8 µm and the fall speed is the fixed
+    point of the slip-corrected Stokes law, v = 2 r² Δρ g C(λ/r) / (9 η_base).
+    Both speeds get independent Gaussian noise of `noise_fraction` of their value.
+    Returns (v_fall, v_rise, voltage) arrays.
+    """
+    rng = np.random.default_rng(seed)
+    radius = rng.uniform(0.3e-6, 0.8e-6, num_droplets)
+    multiples = rng.integers(1, max_multiple + 1, num_droplets)
+    density_difference = rho_oil - rho_air
+    _, C = cunningham_correction(mean_free_path_m / radius, a0, a1, a2)
+    v_fall = 2.0 * radius ** 2 * density_difference * gravity * C / (9.0 * eta_base)
+    weight = (4.0 / 3.0) * math.pi * radius ** 3 * density_difference * gravity
+    field = voltage / plate_separation_m
+    v_rise = multiples * elementary_charge * field * v_fall / weight - v_fall
+    v_fall = v_fall * (1.0 + noise_fraction * rng.standard_normal(num_droplets))
+    v_rise = v_rise + noise_fraction * np.abs(v_rise) * rng.standard_normal(num_droplets)
+    return v_fall, v_rise, np.full(num_droplets, float(voltage))
+
+
+@memoize(name="millikan.analyze")
+def analyze_droplets(
+    v_fall: np.ndarray,
+    v_rise: np.ndarray,
+    voltage: np.ndarray,
+    plate_separation_m: float,
+    rho_oil: float,
+    rho_air: float,
+    gravity: float,
+    eta_base: float,
+    mean_free_path_m: float,
+    a0: float,
+    a1: float,
+    a2: float,
+    iterations: int = 5,
+    use_table: bool = False,
+) -> dict:
+    """Charges for a table of droplets and the elementary charge fitted to them."""
+    radius, charge, error = droplet_charges(
+        v_fall, v_rise, voltage, plate_separation_m, rho_oil, rho_air, gravity, eta_base, mean_free_path_m, a0, a1, a2, iterations, use_table
+    )
+    return {
+        "radius": radius,
+        "charge": charge,
+        "error_code": error,
+        "fit": fit_elementary_charge(charge),
+    }
@@ -0,0 +1,283 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Tuple
+
+import numpy as np
+
+from compute_cache import memoize
+from lab_calculations import slip_iteration
+from lab_formulas import image_distance, reciprocal, snell_index, thin_lens_focal_length
+
+# Samples drawn per chunk; each chunk has its own child seed, so results do not
+# depend on how chunks are spread over processes
+DEFAULT_CHUNK_SIZE = 250_000
+# Below this many samples the process-pool start-up costs more than it saves
+PARALLEL_THRESHOLD = 2_000_000
+# Worker processes in the shared pool, whatever the CPU count
+MAX_POOL_WORKERS = 4
+# Quantiles each chunk keeps per output (evenly spaced levels from 0 to 1);
+# percentiles are read from these instead of from the raw samples
+CHUNK_QUANTILE_LEVELS = 1025
+DISTRIBUTIONS = ("uniform", "normal")
+DEFAULT_PERCENTILES = (2.5, 16.0, 50.0, 84.0, 97.5)
+# Chunk size and sample cap for propagate_until_stable
+STABLE_CHUNK_SIZE = 5_000
+STABLE_MAX_SAMPLES = 2_000_000
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _snell_outputs(theta1_deg, theta2_deg):
+    return {"n": snell_index(theta1_deg, theta2_deg)}
+
+
+def _thin_lens_outputs(object_distance_cm, lens_pos_cm, image_pos_cm):
+    di = image_distance(lens_pos_cm, image_pos_cm)
+    return {
+        "inv_di": reciprocal(di),
+        "inv_do": reciprocal(object_distance_cm),
+        "f": thin_lens_focal_length(object_distance_cm, di),
+    }
+
+
+def _slip_outputs(velocity, rho_oil, eta_base, mean_free_path_m, rho_air, gravity, a0, a1, a2, iterations):
+    stages, _, _ = slip_iteration(rho_oil, rho_air, gravity, velocity, eta_base, mean_free_path_m, a0, a1, a2, int(iterations))
+    return {"r": stages["radius"][-1], "eta": stages["eta_out"][-1]}
+
+
+# Model name → (input names in order, function of the input arrays returning named outputs).
+# Fixed parameters passed as `params` follow the sampled inputs.
+MODELS = {
+    "snell": (("theta1_deg", "theta2_deg"), _snell_outputs),
+    "thin_lens": (("object_distance_cm", "lens_pos_cm", "image_pos_cm"), _thin_lens_outputs),
+    "slip": (("velocity", "rho_oil", "eta_base", "mean_free_path_m"), _slip_outputs),
+}
+
+
+def _sample_chunk(model: str, nominal, half_widths, distribution: str, size: int, seed_seq, params=()):
+    """Draw one chunk of inputs, evaluate the model and return per-output moments and quantiles."""
+    rng = np.random.default_rng(seed_seq)
+    nominal = np.asarray(nominal, dtype=float)[:, np.newaxis]
+    half_widths = np.asarray(half_widths, dtype=float)[:, np.newaxis]
+    if distribution == "uniform":
+        draws = rng.uniform(-1.0, 1.0, size=(nominal.shape[0], size))
+    else:
+        draws = rng.standard_normal(size=(nominal.shape[0], size))
+    inputs = nominal + half_widths * draws
+
+    _, func = MODELS[model]
+    results = {}
+    for name, values in func(*inputs, *params).items():
+        finite = values[np.isfinite(values)]
+        count = finite.size
+        mean = float(finite.mean()) if count else 0.0
+        m2 = float(np.sum((finite - mean) ** 2)) if count else 0.0
+        quantiles = np.quantile(finite, np.linspace(0.0, 1.0, CHUNK_QUANTILE_LEVELS)) if count else np.empty(0)
+        results[name] = (count, mean, m2, size - count, quantiles)
+    return results
+
+
+def _merge_moments(a, b):
+    """Combine (count, mean, M2) of two chunks (Chan et al. pairwise update)."""
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    if n == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, m2_a + m2_b + delta ** 2 * n_a * n_b / n
+
+
+def _merged_percentiles(chunks, name: str, percentiles) -> np.ndarray:
+    """Percentiles of all chunks together, from each chunk's quantiles.
+
+    Each chunk's CDF is taken as linear between its stored quantiles; the
+    pooled CDF is their count-weighted sum, evaluated at every stored quantile
+    and inverted by interpolation.
+    """
+    levels = np.linspace(0.0, 1.0, CHUNK_QUANTILE_LEVELS)
+    parts = [(chunk[name][0], chunk[name][4]) for chunk in chunks if chunk[name][0]]
+    points = np.unique(np.concatenate([q for _, q in parts]))
+    cdf = sum(count * np.interp(points, q, levels) for count, q in parts) / sum(count for count, _ in parts)
+    return np.interp(np.asarray(percentiles, dtype=float) / 100.0, cdf, points)
+
+
+def _summarize(chunks, percentiles) -> Dict[str, dict]:
+    """Merge per-chunk moments and quantiles into the per-output summary returned by propagate."""
+    summary = {}
+    for name in chunks[0]:
+        moments = (0, 0.0, 0.0)
+        invalid = 0
+        for chunk in chunks:
+            count, mean, m2, bad, _ = chunk[name]
+            moments = _merge_moments(moments, (count, mean, m2))
+            invalid += bad
+        count, mean, m2 = moments
+        pct = _merged_percentiles(chunks, name, percentiles) if count else np.full(len(percentiles), np.nan)
+        summary[name] = {
+            "mean": mean if count else float("nan"),
+            "std": float(np.sqrt(m2 / (count - 1))) if count > 1 else float("nan"),
+            "percentiles": {float(p): float(v) for p, v in zip(percentiles, pct)},
+            "n_valid": int(count),
+            "n_invalid": int(invalid),
+        }
+    return summary
+
+
+def _check_model(model: str, distribution: str, nominal, half_widths) -> None:
+    if model not in MODELS:
+        raise ValueError(f"unknown model: {model!r}")
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"unknown distribution: {distribution!r}")
+    input_names, _ = MODELS[model]
+    if len(nominal) != len(input_names) or len(half_widths) != len(input_names):
+        raise ValueError(f"model {model!r} takes inputs {input_names}")
+
+
+def _shared_pool() -> ProcessPoolExecutor:
+    """The module's process pool, started on first use with at most MAX_POOL_WORKERS workers."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # "spawn" keeps worker processes independent of the server's threads and locks
+            _pool = ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, MAX_POOL_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _discard_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _chunk_sizes(n_samples: int, chunk_size: int):
+    full, rest = divmod(n_samples, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+@memoize(name="monte_carlo.propagate")
+def propagate(
+    model: str,
+    nominal: Tuple[float, ...],
+    half_widths: Tuple[float, ...],
+    distribution: str = "uniform",
+    n_samples: int = 100_000,
+    seed: int = 0,
+    percentiles: Tuple[float, ...] = DEFAULT_PERCENTILES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: int | None = None,
+    params: Tuple = (),
+) -> Dict[str, dict]:
+    """Monte Carlo propagation of input uncertainties through one of the lab formulas.
+
+    Each input is drawn around its nominal value either uniformly within
+    ± half-width (the range-method reading of an uncertainty) or from a normal
+    distribution with σ = half-width. Sampling is split into fixed-size chunks
+    seeded from SeedSequence(seed).spawn(...), so the same seed always gives the
+    same answer whether the chunks run in this process or in the module's
+    shared pool of up to MAX_POOL_WORKERS processes (used above
+    PARALLEL_THRESHOLD samples when more than one CPU is available and
+    max_workers is not 1). Chunks send back moments and CHUNK_QUANTILE_LEVELS
+    quantiles rather than their samples, so memory does not grow with n_samples.
+
+    Returns {output name: {"mean", "std", "percentiles", "n_valid", "n_invalid"}};
+    samples that hit a singularity (non-finite output) are counted, not averaged.
+    `params` are fixed (not sampled) arguments passed to the model after the inputs.
+    """
+    _check_model(model, distribution, nominal, half_widths)
+    sizes = _chunk_sizes(int(n_samples), max(int(chunk_size), 1))
+    seeds = np.random.SeedSequence(int(seed)).spawn(len(sizes))
+    args = [(model, tuple(nominal), tuple(half_widths), distribution, size, s, tuple(params)) for size, s in zip(sizes, seeds)]
+
+    workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    if n_samples >= PARALLEL_THRESHOLD and workers > 1 and len(args) > 1:
+        try:
+            chunks = list(_shared_pool().map(_sample_chunk, *zip(*args)))
+        except BrokenProcessPool:
+            # A worker died; drop the pool so the next call starts a fresh one, and finish here
+            _discard_pool()
+            chunks = [_sample_chunk(*a) for a in args]
+    else:
+        chunks = [_sample_chunk(*a) for a in args]
+
+    return _summarize(chunks, percentiles)
+
+
+@memoize(name="monte_carlo.until_stable")
+def propagate_until_stable(
+    model: str,
+    nominal: Tuple[float, ...],
+    half_widths: Tuple[float, ...],
+    distribution: str = "normal",
+    seed: int = 0,
+    params: Tuple = (),
+    watch: str | None = None,
+    rel_tol: float = 0.01,
+    chunk_size: int = STABLE_CHUNK_SIZE,
+    max_samples: int = STABLE_MAX_SAMPLES,
+    min_chunks: int = 4,
+    percentiles: Tuple[float, ...] = DEFAULT_PERCENTILES,
+) -> Dict[str, object]:
+    """Monte Carlo propagation that draws chunks only until σ of one output has settled.
+
+    Chunks are evaluated one after another with the same spawned seeds as
+    propagate. After each chunk the standard error of σ for `watch` (the
+    model's first output by default) is estimated by batch means, the spread
+    of the per-chunk σ values divided by √chunks, and sampling stops once that
+    is below `rel_tol` of the pooled σ, or at `max_samples`. With every
+    half-width zero the outputs cannot vary, so one chunk is drawn and the
+    result counts as converged; a watched σ of exactly zero also counts.
+
+    Returns {"outputs": the propagate summary, "converged", "n_samples",
+    "sigma_history": [(samples so far, pooled σ of `watch`), ...]}.
+    """
+    _check_model(model, distribution, nominal, half_widths)
+    sizes = _chunk_sizes(int(max_samples), max(int(chunk_size), 1))
+    seeds = np.random.SeedSequence(int(seed)).spawn(len(sizes))
+
+    chunks = []
+    chunk_sigmas = []
+    history = []
+    moments = (0, 0.0, 0.0)
+    drawn = 0
+    converged = False
+    fixed_inputs = not np.any(np.asarray(half_widths, dtype=float))
+    for size, seed_seq in zip(sizes, seeds):
+        chunk = _sample_chunk(model, tuple(nominal), tuple(half_widths), distribution, size, seed_seq, tuple(params))
+        chunks.append(chunk)
+        drawn += size
+        if watch is None:
+            watch = next(iter(chunk))
+        if fixed_inputs:
+            converged = True
+            break
+        count, mean, m2, _, _ = chunk[watch]
+        if count > 1:
+            chunk_sigmas.append(np.sqrt(m2 / (count - 1)))
+        moments = _merge_moments(moments, (count, mean, m2))
+        if moments[0] < 2:
+            continue
+        sigma = float(np.sqrt(moments[2] / (moments[0] - 1)))
+        history.append((drawn, sigma))
+        if len(chunk_sigmas) >= max(min_chunks, 2):
+            standard_error = float(np.std(chunk_sigmas, ddof=1)) / np.sqrt(len(chunk_sigmas))
+            if sigma == 0 or standard_error <= rel_tol * sigma:
+                converged = True
+                break
+
+    return {
+        "outputs": _summarize(chunks, percentiles),
+        "converged": converged,
+        "n_samples": drawn,
+        "watch": watch,
+        "sigma_history": history,
+    }
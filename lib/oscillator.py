@@ -0,0 +1,213 @@
+import math
+from typing import Tuple
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from compute_cache import memoize
+
+# |ω0² − γ²| below this fraction of ω0² is treated as critical damping
+CRITICAL_TOLERANCE = 1e-10
+
+
+def damping_regime(mass_kg: float, spring_constant_n_per_m: float, damping_coefficient_kg_per_s: float) -> str:
+    """Return "underdamped", "critically damped" or "overdamped"."""
+    gamma = damping_coefficient_kg_per_s / (2.0 * mass_kg)
+    omega0_sq = spring_constant_n_per_m / mass_kg
+    disc = omega0_sq - gamma ** 2
+    if abs(disc) <= CRITICAL_TOLERANCE * max(omega0_sq, gamma ** 2):
+        return "critically damped"
+    return "underdamped" if disc > 0 else "overdamped"
+
+
+def oscillator_response(mass_kg, spring_constant_n_per_m, damping_coefficient_kg_per_s, x0_m, v0_m_per_s, t_s):
+    """Exact x(t) of a free mass–spring–damper from initial conditions, for many parameter sets.
+
+    All three regimes share one form, with γ = c/(2m) and ω0² = k/m:
+        x(t) = e^{−γt} [ x0·C(t) + (v0 + γ x0)·S(t) ]
+    underdamped (ω_d = sqrt(ω0² − γ²)):  C = cos ω_d t,   S = sin(ω_d t)/ω_d
+    critical:                            C = 1,           S = t
+    overdamped  (μ = sqrt(γ² − ω0²)):    C = cosh μt,     S = sinh(μt)/μ
+
+    The parameter arguments broadcast against each other (shape P) and t is a
+    shared 1-D time grid (shape T); the result has shape P + (T,). Overdamped
+    terms are evaluated as sums of decaying exponentials so long durations with
+    heavy damping cannot overflow.
+    """
+    m = np.asarray(mass_kg, dtype=float)[..., np.newaxis]
+    k = np.asarray(spring_constant_n_per_m, dtype=float)[..., np.newaxis]
+    c = np.asarray(damping_coefficient_kg_per_s, dtype=float)[..., np.newaxis]
+    x0 = np.asarray(x0_m, dtype=float)[..., np.newaxis]
+    v0 = np.asarray(v0_m_per_s, dtype=float)[..., np.newaxis]
+    t = np.asarray(t_s, dtype=float)
+
+    gamma = c / (2.0 * m)
+    omega0_sq = k / m
+    disc = omega0_sq - gamma ** 2
+    critical = np.abs(disc) <= CRITICAL_TOLERANCE * np.maximum(omega0_sq, gamma ** 2)
+    under = (disc > 0) & ~critical
+    over = (disc < 0) & ~critical
+
+    # Substitute harmless values outside each branch so no branch produces NaN
+    omega_d = np.sqrt(np.where(under, disc, 1.0))
+    mu = np.sqrt(np.where(over, -disc, 1.0))
+
+    envelope = np.exp(-gamma * t)
+    c_under = envelope * np.cos(omega_d * t)
+    s_under = envelope * np.sin(omega_d * t) / omega_d
+
+    slow = np.exp((mu - gamma) * t)
+    fast = np.exp(-(mu + gamma) * t)
+    c_over = 0.5 * (slow + fast)
+    s_over = (slow - fast) / (2.0 * mu)
+
+    c_term = np.where(under, c_under, np.where(over, c_over, envelope))
+    s_term = np.where(under, s_under, np.where(over, s_over, envelope * t))
+    return x0 * c_term + (v0 + gamma * x0) * s_term
+
+
+def initial_conditions_from_phase(mass_kg, spring_constant_n_per_m, damping_coefficient_kg_per_s, amplitude_m, phase_rad):
+    """Map the page's (A, φ) inputs to (x0, v0).
+
+    These are the initial conditions of x(t) = A e^{−γt} cos(ω_d t + φ), so the
+    underdamped curve is unchanged; for critical and overdamped systems (ω_d = 0)
+    the same x0, v0 = −γ A cos φ start the exact non-oscillatory solution.
+    """
+    m = np.asarray(mass_kg, dtype=float)
+    gamma = np.asarray(damping_coefficient_kg_per_s, dtype=float) / (2.0 * m)
+    under = np.asarray(spring_constant_n_per_m, dtype=float) / m - gamma ** 2
+    omega_d = np.sqrt(np.maximum(under, 0.0))
+    x0 = amplitude_m * np.cos(phase_rad)
+    v0 = -amplitude_m * (gamma * np.cos(phase_rad) + omega_d * np.sin(phase_rad))
+    return x0, v0
+
+
+@memoize(name="oscillations.damped")
+def compute_damped_oscillation(
+    mass_kg: float,
+    spring_constant_n_per_m: float,
+    damping_coefficient_kg_per_s: float,
+    amplitude_m: float,
+    phase_rad: float,
+    duration_s: float,
+    num_points: int = 1200,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute x(t) for a damped mass–spring system with analytic solution.
+
+    x(t) = A e^{-γ t} cos(ω_d t + φ),
+      γ = c / (2m),  ω_0 = sqrt(k/m),  ω_d = sqrt(ω_0^2 - γ^2) for underdamped.
+
+    Critically damped and overdamped systems use the exact solution for the same
+    initial conditions (see oscillator_response).
+    """
+    mass_kg = max(mass_kg, 1e-9)
+    spring_constant_n_per_m = max(spring_constant_n_per_m, 0.0)
+    t = np.linspace(0.0, max(duration_s, 0.01), num=max(num_points, 2))
+    x0, v0 = initial_conditions_from_phase(
+        mass_kg, spring_constant_n_per_m, damping_coefficient_kg_per_s, amplitude_m, phase_rad
+    )
+    x = oscillator_response(mass_kg, spring_constant_n_per_m, damping_coefficient_kg_per_s, x0, v0, t)
+    return t, x
+
+
+@memoize(name="oscillations.damping_family")
+def compute_damping_family(
+    mass_kg: float,
+    spring_constant_n_per_m: float,
+    damping_ratios: Tuple[float, ...],
+    amplitude_m: float,
+    phase_rad: float,
+    duration_s: float,
+    num_points: int = 1200,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate a family of damping ratios ζ = c / (2 sqrt(k m)) on one shared time grid.
+
+    Returns (t, c_values, x) with x of shape (len(damping_ratios), num_points).
+    """
+    zeta = np.asarray(damping_ratios, dtype=float)
+    c_values = 2.0 * zeta * math.sqrt(spring_constant_n_per_m * mass_kg)
+    t = np.linspace(0.0, max(duration_s, 0.01), num=max(num_points, 2))
+    x0, v0 = initial_conditions_from_phase(mass_kg, spring_constant_n_per_m, c_values, amplitude_m, phase_rad)
+    x = oscillator_response(mass_kg, spring_constant_n_per_m, c_values, x0, v0, t)
+    return t, c_values, x
+
+
+def steady_state_response(mass_kg, spring_constant_n_per_m, damping_coefficient_kg_per_s, force_amplitude_n, drive_omega):
+    """Steady-state amplitude and phase lag of x'' + 2γx' + ω0²x = (F0/m) cos ωt.
+
+    A(ω) = (F0/m) / sqrt( (ω0² − ω²)² + (2γω)² ),  δ(ω) = atan2(2γω, ω0² − ω²) ∈ [0, π].
+    All arguments broadcast, so a (damping × frequency) grid is one call.
+    """
+    m = np.asarray(mass_kg, dtype=float)
+    omega = np.asarray(drive_omega, dtype=float)
+    gamma = np.asarray(damping_coefficient_kg_per_s, dtype=float) / (2.0 * m)
+    detune = np.asarray(spring_constant_n_per_m, dtype=float) / m - omega ** 2
+    with np.errstate(divide="ignore"):
+        amplitude = (np.asarray(force_amplitude_n, dtype=float) / m) / np.hypot(detune, 2.0 * gamma * omega)
+    phase = np.arctan2(2.0 * gamma * omega, detune)
+    return amplitude, phase
+
+
+def quality_factor(mass_kg: float, spring_constant_n_per_m: float, damping_coefficient_kg_per_s: float) -> float:
+    """Q = ω0 / (2γ) = sqrt(k m) / c (infinite without damping)."""
+    if damping_coefficient_kg_per_s <= 0:
+        return float("inf")
+    return math.sqrt(spring_constant_n_per_m * mass_kg) / damping_coefficient_kg_per_s
+
+
+@memoize(name="oscillations.resonance_curves")
+def compute_resonance_curves(
+    mass_kg: float,
+    spring_constant_n_per_m: float,
+    damping_values: Tuple[float, ...],
+    force_amplitude_n: float,
+    omega_max: float,
+    num_points: int = 2000,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Steady-state amplitude and phase for several damping values on a dense frequency grid.
+
+    Returns (ω, amplitude, phase) with amplitude and phase of shape
+    (len(damping_values), num_points), computed in one broadcast pass.
+    """
+    omega = np.linspace(0.0, omega_max, num=max(num_points, 2))
+    c_values = np.asarray(damping_values, dtype=float)[:, np.newaxis]
+    amplitude, phase = steady_state_response(mass_kg, spring_constant_n_per_m, c_values, force_amplitude_n, omega)
+    return omega, amplitude, phase
+
+
+@memoize(name="oscillations.driven_response")
+def compute_driven_response(
+    mass_kg: float,
+    spring_constant_n_per_m: float,
+    damping_coefficient_kg_per_s: float,
+    force_amplitude_n: float,
+    drive_omega: float,
+    x0_m: float,
+    v0_m_per_s: float,
+    duration_s: float,
+    num_points: int = 2000,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Transient-plus-steady response of the driven oscillator, integrated with solve_ivp.
+
+    Returns (t, x, x_steady) where x_steady is the steady-state part
+    A cos(ωt − δ), so the decaying transient is x − x_steady.
+    """
+    m = mass_kg
+    k = spring_constant_n_per_m
+    c = damping_coefficient_kg_per_s
+    t = np.linspace(0.0, max(duration_s, 0.01), num=max(num_points, 2))
+
+    def rhs(time, state):
+        pos, vel = state
+        return [vel, (force_amplitude_n * math.cos(drive_omega * time) - c * vel - k * pos) / m]
+
+    # Keep several steps per drive and natural period so the forcing is resolved
+    fastest = max(drive_omega, math.sqrt(k / m), 1e-9)
+    sol = solve_ivp(
+        rhs, (0.0, t[-1]), [x0_m, v0_m_per_s], t_eval=t, method="DOP853",
+        rtol=1e-9, atol=1e-12, max_step=2.0 * math.pi / fastest / 8.0,
+    )
+    amplitude, phase = steady_state_response(m, k, c, force_amplitude_n, drive_omega)
+    x_steady = float(amplitude) * np.cos(drive_omega * t - float(phase))
+    return t, sol.y[0], x_steady
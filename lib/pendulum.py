@@ -0,0 +1,72 @@
+import math
+from typing import Tuple
+
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.special import ellipk
+
+from compute_cache import memoize
+
+
+def small_angle_period(length_m: float, gravity_m_per_s2: float) -> float:
+    """T0 = 2π sqrt(L/g), the period of the linearized (small-angle) pendulum."""
+    return 2.0 * math.pi * math.sqrt(length_m / gravity_m_per_s2)
+
+
+def period_ratio(amplitude_deg):
+    """Exact T/T0 = (2/π) K(m), m = sin²(θ0/2), for any array of release angles below 180°."""
+    half_angle = np.radians(np.asarray(amplitude_deg, dtype=float)) / 2.0
+    return 2.0 / math.pi * ellipk(np.sin(half_angle) ** 2)
+
+
+@memoize(name="pendulum.period_table")
+def compute_period_table(max_amplitude_deg: float = 179.0, num_points: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """Precomputed (amplitude in degrees, T/T0) table evaluated in one vectorized ellipk call.
+
+    Computed once per process and shared by every session for the period-
+    versus-amplitude curve; single readouts call period_ratio directly.
+    """
+    amplitude = np.linspace(0.0, max_amplitude_deg, num=max(num_points, 2))
+    return amplitude, period_ratio(amplitude)
+
+
+@memoize(name="pendulum.motion")
+def compute_pendulum_motion(
+    length_m: float,
+    gravity_m_per_s2: float,
+    amplitude_deg: float,
+    duration_s: float,
+    num_points: int = 1200,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Release from rest at θ0 and integrate θ'' = −(g/L) sin θ with DOP853.
+
+    Returns (t, θ_nonlinear, θ_small_angle) in degrees, where the small-angle
+    curve is θ0 cos(sqrt(g/L) t).
+    """
+    omega0 = math.sqrt(gravity_m_per_s2 / length_m)
+    theta0 = math.radians(amplitude_deg)
+    t = np.linspace(0.0, max(duration_s, 0.01), num=max(num_points, 2))
+
+    def rhs(_t, state):
+        theta, omega = state
+        return [omega, -omega0 ** 2 * math.sin(theta)]
+
+    sol = solve_ivp(
+        rhs, (0.0, t[-1]), [theta0, 0.0], t_eval=t, method="DOP853",
+        rtol=1e-10, atol=1e-12, max_step=2.0 * math.pi / omega0 / 20.0,
+    )
+    theta_nonlinear = np.degrees(sol.y[0])
+    theta_small = amplitude_deg * np.cos(omega0 * t)
+    return t, theta_nonlinear, theta_small
+
+
+def measured_period(t: np.ndarray, theta: np.ndarray) -> float:
+    """Period read off the simulated motion: twice the mean spacing between zero crossings."""
+    crossings = np.nonzero(np.sign(theta[:-1]) != np.sign(theta[1:]))[0]
+    if crossings.size < 2:
+        return float("nan")
+    # Linear interpolation of each crossing time inside its sample interval
+    t0, t1 = t[crossings], t[crossings + 1]
+    y0, y1 = theta[crossings], theta[crossings + 1]
+    times = t0 - y0 * (t1 - t0) / (y1 - y0)
+    return float(2.0 * np.mean(np.diff(times)))
@@ -0,0 +1,136 @@
+import functools
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Upper bound on the number of points sent to the browser for one trace.
+# Instructors can lower this for slow connections or raise it for print-quality plots.
+DEFAULT_MAX_POINTS_PER_TRACE = 600
+
+# Traces with more points than this are drawn with WebGL (Scattergl) instead of SVG
+WEBGL_POINT_THRESHOLD = 2000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices selected by the largest-triangle-three-buckets (LTTB) algorithm.
+
+    The first and last points are always kept. The interior is split into
+    n_out − 2 buckets and, from each bucket, the point forming the largest
+    triangle with the previously selected point and the mean of the next bucket
+    is kept. Peaks and troughs survive, which makes the downsampled line visually
+    indistinguishable from the full trace at typical chart widths.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket boundaries over the interior points 1 .. n-2
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < n_out - 1:
+            next_start, next_stop = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_stop].mean()
+            avg_y = y[next_start:next_stop].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        bx = x[start:stop]
+        by = y[start:stop]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((x[prev] - avg_x) * (by - y[prev]) - (x[prev] - bx) * (avg_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of n_out // 2 equal buckets.
+
+    Cheaper than LTTB and fully vectorized; keeps the vertical extent of every
+    bucket, which suits noisy signals where the envelope matters most.
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    n_buckets = (n_out - 2) // 2
+    size = int(np.ceil(n / n_buckets))
+    padded = np.pad(y, (0, n_buckets * size - n), mode="edge").reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    idx = np.concatenate((
+        [0],
+        offsets + np.argmin(padded, axis=1),
+        offsets + np.argmax(padded, axis=1),
+        [n - 1],
+    ))
+    return np.unique(np.clip(idx, 0, n - 1))
+
+
+def decimate_trace(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: int = DEFAULT_MAX_POINTS_PER_TRACE,
+    method: str = "lttb",
+):
+    """Return (x, y) reduced to at most `max_points` for plotting.
+
+    Compute functions should keep producing full-resolution arrays (metrics are
+    taken from those); only the copy handed to Plotly is decimated.
+    method: "lttb" (shape-preserving) or "minmax" (envelope-preserving).
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if x.size <= max_points:
+        return x, y
+    if method == "minmax":
+        idx = minmax_indices(y, max_points)
+    elif method == "lttb":
+        idx = lttb_indices(x, y, max_points)
+    else:
+        raise ValueError(f"unknown decimation method: {method!r}")
+    return x[idx], y[idx]
+
+
+def line_trace(
+    x: np.ndarray,
+    y: np.ndarray,
+    name: str,
+    mode: str = "lines",
+    webgl_threshold: int = WEBGL_POINT_THRESHOLD,
+    **kwargs,
+):
+    """Build a Scatter trace with float32 data, switching to Scattergl for large traces.
+
+    Plotly serializes NumPy arrays as typed binary buffers, so float32 halves the
+    payload relative to float64 with no visible difference on screen.
+    """
+    x32 = np.asarray(x, dtype=np.float32)
+    y32 = np.asarray(y, dtype=np.float32)
+    trace_cls = go.Scattergl if x32.size > webgl_threshold else go.Scatter
+    return trace_cls(x=x32, y=y32, mode=mode, name=name, **kwargs)
+
+
+@functools.lru_cache(maxsize=64)
+def base_layout(title: str, xaxis_title: str, yaxis_title: str, height: int = 500) -> go.Layout:
+    """Validated layout with the shared template, built once per distinct set of labels."""
+    return go.Layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        height=height,
+        template="plotly_white",
+    )
+
+
+def build_figure(traces, title: str, xaxis_title: str, yaxis_title: str, height: int = 500) -> go.Figure:
+    """Assemble a figure from prepared traces on top of the cached base layout."""
+    return go.Figure(data=list(traces), layout=base_layout(title, xaxis_title, yaxis_title, height))
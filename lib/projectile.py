@@ -0,0 +1,532 @@
+import math
+from typing import Tuple
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from compute_cache import memoize
+
+# Drag models: "linear" uses a = −β v (β in 1/s), "quadratic" uses a = −β |v| v (β in 1/m).
+# β is the drag coefficient divided by the mass, so no separate mass input is needed.
+DRAG_MODES = ("none", "linear", "quadratic")
+
+
+@memoize(name="projectile.trajectory")
+def compute_projectile_trajectory(
+    initial_speed_m_per_s: float,
+    launch_angle_deg: float,
+    initial_height_m: float,
+    gravity_m_per_s2: float,
+    num_points: int = 400,
+) -> Tuple[np.ndarray, np.ndarray, float, float, float]:
+    """
+    Compute 2D projectile motion (no air resistance) from analytic solution.
+
+    Returns x(t), y(t), t_flight, x_range, y_max.
+    """
+    theta = math.radians(launch_angle_deg)
+    v0x = initial_speed_m_per_s * math.cos(theta)
+    v0y = initial_speed_m_per_s * math.sin(theta)
+
+    t_flight, x_range, y_max = (
+        float(v) for v in flight_metrics(initial_speed_m_per_s, launch_angle_deg, initial_height_m, gravity_m_per_s2)
+    )
+    t = np.linspace(0.0, t_flight, num=max(num_points, 2))
+
+    x = v0x * t
+    y = initial_height_m + v0y * t - 0.5 * gravity_m_per_s2 * t ** 2
+    return x, y, t_flight, x_range, y_max
+
+
+def flight_metrics(initial_speed_m_per_s, launch_angle_deg, initial_height_m, gravity_m_per_s2):
+    """Return (t_flight, x_range, y_max) for no-drag launches, broadcasting over all inputs.
+
+    These are the closed-form results used by compute_projectile_trajectory, so a
+    (v0, θ) or (θ, h0) grid of any shape is evaluated in one NumPy pass.
+    """
+    v0 = np.asarray(initial_speed_m_per_s, dtype=float)
+    theta = np.radians(np.asarray(launch_angle_deg, dtype=float))
+    h0 = np.asarray(initial_height_m, dtype=float)
+    g = np.asarray(gravity_m_per_s2, dtype=float)
+    v0x = v0 * np.cos(theta)
+    v0y = v0 * np.sin(theta)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Time of flight (for y=0 landing), allowing nonzero initial height
+        disc = v0y ** 2 + 2.0 * g * np.maximum(h0, 0.0)
+        t_flight = np.where(g > 0, (v0y + np.sqrt(disc)) / g, 0.0)
+
+        # Range and max height
+        x_range = v0x * t_flight
+        t_peak = np.where(g > 0, v0y / g, 0.0)
+    y_max = h0 + v0y * t_peak - 0.5 * g * t_peak ** 2
+    return t_flight, x_range, y_max
+
+
+def optimal_launch_angle(initial_speed_m_per_s, initial_height_m, gravity_m_per_s2):
+    """Return (θ* in degrees, maximum range) for launches from height h0 (no drag).
+
+    θ* = arctan( v0 / sqrt(v0² + 2 g h0) ), which reduces to 45° when h0 = 0.
+    """
+    v0 = np.asarray(initial_speed_m_per_s, dtype=float)
+    h0 = np.maximum(np.asarray(initial_height_m, dtype=float), 0.0)
+    g = np.asarray(gravity_m_per_s2, dtype=float)
+    root = np.sqrt(v0 ** 2 + 2.0 * g * h0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        theta_opt = np.degrees(np.arctan2(v0, root))
+        max_range = v0 * root / g
+    return theta_opt, max_range
+
+
+@memoize(name="projectile.sweep")
+def compute_sweep_grid(
+    sweep: str,
+    fixed_value: float,
+    gravity_m_per_s2: float,
+    resolution: int = 400,
+    theta_range_deg: Tuple[float, float] = (0.0, 90.0),
+    other_range: Tuple[float, float] | None = None,
+):
+    """Evaluate flight metrics on a 2-D grid in one broadcast pass.
+
+    sweep="v0_theta": x axis is v0 (m/s) and `fixed_value` is h0 (m).
+    sweep="theta_h0": x axis is h0 (m) and `fixed_value` is v0 (m/s).
+    θ (degrees) is always the y axis. Returns a dict with the axis vectors,
+    the (resolution × resolution) metric grids and the optimal-angle curve
+    along the x axis.
+    """
+    if sweep == "v0_theta":
+        lo, hi = other_range or (1.0, 60.0)
+    elif sweep == "theta_h0":
+        lo, hi = other_range or (0.0, 10.0)
+    else:
+        raise ValueError(f"unknown sweep: {sweep!r}")
+
+    x_axis = np.linspace(lo, hi, resolution)
+    theta_axis = np.linspace(theta_range_deg[0], theta_range_deg[1], resolution)
+    xx = x_axis[np.newaxis, :]
+    tt = theta_axis[:, np.newaxis]
+
+    if sweep == "v0_theta":
+        t_flight, x_range, y_max = flight_metrics(xx, tt, fixed_value, gravity_m_per_s2)
+        theta_opt, range_opt = optimal_launch_angle(x_axis, fixed_value, gravity_m_per_s2)
+    else:
+        t_flight, x_range, y_max = flight_metrics(fixed_value, tt, xx, gravity_m_per_s2)
+        theta_opt, range_opt = optimal_launch_angle(fixed_value, x_axis, gravity_m_per_s2)
+
+    return {
+        "x_axis": x_axis,
+        "theta_axis": theta_axis,
+        "t_flight": t_flight,
+        "x_range": x_range,
+        "y_max": y_max,
+        "theta_opt": np.broadcast_to(theta_opt, x_axis.shape).copy(),
+        "range_opt": np.broadcast_to(range_opt, x_axis.shape).copy(),
+    }
+
+
+def drag_acceleration(vx, vy, gravity_m_per_s2, drag_mode: str, drag_per_mass):
+    """Return (ax, ay) for the chosen drag model; works elementwise on NumPy arrays."""
+    if drag_mode == "none":
+        return np.zeros_like(vx), np.full_like(vy, -gravity_m_per_s2)
+    if drag_mode == "linear":
+        return -drag_per_mass * vx, -gravity_m_per_s2 - drag_per_mass * vy
+    if drag_mode == "quadratic":
+        speed = np.sqrt(vx ** 2 + vy ** 2)
+        return -drag_per_mass * speed * vx, -gravity_m_per_s2 - drag_per_mass * speed * vy
+    raise ValueError(f"unknown drag mode: {drag_mode!r}")
+
+
+@memoize(name="projectile.drag_trajectory")
+def compute_drag_trajectory(
+    initial_speed_m_per_s: float,
+    launch_angle_deg: float,
+    initial_height_m: float,
+    gravity_m_per_s2: float,
+    drag_mode: str,
+    drag_per_mass: float,
+    num_points: int = 400,
+) -> Tuple[np.ndarray, np.ndarray, float, float, float]:
+    """
+    Integrate projectile motion with air resistance using adaptive RK45.
+
+    Ground impact (y = 0 while falling) and the apex (v_y = 0) are located with
+    solve_ivp event detection, so t_flight, x_range and y_max do not depend on
+    the output sampling. Returns x(t), y(t), t_flight, x_range, y_max like
+    compute_projectile_trajectory.
+    """
+    if drag_mode == "none" or drag_per_mass <= 0:
+        return compute_projectile_trajectory(
+            initial_speed_m_per_s, launch_angle_deg, initial_height_m, gravity_m_per_s2, num_points
+        )
+
+    theta = math.radians(launch_angle_deg)
+    v0x = initial_speed_m_per_s * math.cos(theta)
+    v0y = initial_speed_m_per_s * math.sin(theta)
+    h0 = max(initial_height_m, 0.0)
+    if gravity_m_per_s2 <= 0 or (h0 <= 0 and v0y <= 0):
+        t = np.zeros(max(num_points, 2))
+        return t, np.full_like(t, h0), 0.0, 0.0, h0
+
+    def rhs(_t, state):
+        _, _, vx, vy = state
+        ax, ay = drag_acceleration(vx, vy, gravity_m_per_s2, drag_mode, drag_per_mass)
+        return [vx, vy, ax, ay]
+
+    def hit_ground(_t, state):
+        return state[1]
+    hit_ground.terminal = True
+    hit_ground.direction = -1
+
+    def apex(_t, state):
+        return state[3]
+    apex.direction = -1
+
+    # Drag can lengthen the descent (terminal velocity < free fall), so extend
+    # the integration window until the ground event fires.
+    _, _, t_guess, _, _ = compute_projectile_trajectory(
+        initial_speed_m_per_s, launch_angle_deg, h0, gravity_m_per_s2, 2
+    )
+    t_end = 2.0 * max(t_guess, 0.1)
+    for _ in range(20):
+        sol = solve_ivp(
+            rhs, (0.0, t_end), [0.0, h0, v0x, v0y],
+            method="RK45", events=(hit_ground, apex), dense_output=True,
+            rtol=1e-8, atol=1e-10,
+        )
+        if sol.t_events[0].size:
+            break
+        t_end *= 2.0
+    t_flight = float(sol.t_events[0][0]) if sol.t_events[0].size else float(sol.t[-1])
+
+    t = np.linspace(0.0, t_flight, num=max(num_points, 2))
+    x, y = sol.sol(t)[:2]
+    if sol.t_events[0].size:
+        y[-1] = 0.0
+    x_range = float(x[-1])
+    y_max = float(sol.y_events[1][0][1]) if sol.t_events[1].size else h0
+    return x, y, t_flight, x_range, y_max
+
+
+@memoize(name="projectile.drag_batch")
+def simulate_drag_batch(
+    initial_speed_m_per_s,
+    launch_angle_deg,
+    initial_height_m,
+    gravity_m_per_s2: float,
+    drag_mode: str,
+    drag_per_mass: float,
+    steps_per_flight: int = 400,
+    max_steps: int = 20_000,
+):
+    """Fixed-step RK4 for many launches at once.
+
+    The launch inputs broadcast against each other, so a whole family of
+    (v0, θ, h0) runs in one set of array operations per step. Each launch gets
+    its own step size (no-drag flight time / steps_per_flight) and the landing
+    point is linearly interpolated inside the step that crosses y = 0.
+
+    Returns a dict of arrays: t_flight, x_range, y_max.
+    """
+    v0, theta_deg, h0 = np.broadcast_arrays(
+        np.asarray(initial_speed_m_per_s, dtype=float),
+        np.asarray(launch_angle_deg, dtype=float),
+        np.maximum(np.asarray(initial_height_m, dtype=float), 0.0),
+    )
+    theta = np.radians(theta_deg)
+    vx = v0 * np.cos(theta)
+    vy = v0 * np.sin(theta)
+    x = np.zeros_like(v0)
+    y = h0.copy()
+
+    disc = vy ** 2 + 2.0 * gravity_m_per_s2 * h0
+    t_nodrag = (vy + np.sqrt(disc)) / gravity_m_per_s2
+    dt = np.maximum(t_nodrag, 1e-6) / steps_per_flight
+
+    t_flight = np.zeros_like(v0)
+    x_range = np.zeros_like(v0)
+    y_max = h0.copy()
+    active = t_nodrag > 0
+
+    def deriv(vx_, vy_):
+        return drag_acceleration(vx_, vy_, gravity_m_per_s2, drag_mode, drag_per_mass)
+
+    t = np.zeros_like(v0)
+    for _ in range(max_steps):
+        if not active.any():
+            break
+        ax1, ay1 = deriv(vx, vy)
+        ax2, ay2 = deriv(vx + 0.5 * dt * ax1, vy + 0.5 * dt * ay1)
+        ax3, ay3 = deriv(vx + 0.5 * dt * ax2, vy + 0.5 * dt * ay2)
+        ax4, ay4 = deriv(vx + dt * ax3, vy + dt * ay3)
+        x_new = x + dt / 6.0 * (vx + 2 * (vx + 0.5 * dt * ax1) + 2 * (vx + 0.5 * dt * ax2) + (vx + dt * ax3))
+        y_new = y + dt / 6.0 * (vy + 2 * (vy + 0.5 * dt * ay1) + 2 * (vy + 0.5 * dt * ay2) + (vy + dt * ay3))
+        vx_new = vx + dt / 6.0 * (ax1 + 2 * ax2 + 2 * ax3 + ax4)
+        vy_new = vy + dt / 6.0 * (ay1 + 2 * ay2 + 2 * ay3 + ay4)
+
+        landed = active & (y_new <= 0.0)
+        if landed.any():
+            frac = y[landed] / (y[landed] - y_new[landed])
+            t_flight[landed] = t[landed] + frac * dt[landed]
+            x_range[landed] = x[landed] + frac * (x_new[landed] - x[landed])
+
+        x = np.where(active, x_new, x)
+        y = np.where(active, y_new, y)
+        vx = np.where(active, vx_new, vx)
+        vy = np.where(active, vy_new, vy)
+        t = np.where(active, t + dt, t)
+        y_max = np.where(active, np.maximum(y_max, y), y_max)
+        active &= ~landed
+
+    # Launches that never landed within max_steps report where they got to
+    t_flight = np.where(active, t, t_flight)
+    x_range = np.where(active, x, x_range)
+    return {"t_flight": t_flight, "x_range": x_range, "y_max": y_max}
+
+
+def solve_launch_angles(initial_speed_m_per_s, target_x_m, target_y_m, initial_height_m, gravity_m_per_s2):
+    """Closed-form launch angles (no drag) that pass through a target, broadcasting over all inputs.
+
+    tan θ = ( v0² ± sqrt( v0⁴ − g (g x² + 2 Δy v0²) ) ) / (g x),  Δy = y_target − h0.
+    Returns (θ_low, θ_high) in degrees; both are NaN where the target is out of reach
+    and they coincide when it is exactly at the edge of the reachable region.
+    """
+    v0 = np.asarray(initial_speed_m_per_s, dtype=float)
+    x = np.asarray(target_x_m, dtype=float)
+    dy = np.asarray(target_y_m, dtype=float) - np.asarray(initial_height_m, dtype=float)
+    g = np.asarray(gravity_m_per_s2, dtype=float)
+    disc = v0 ** 4 - g * (g * x ** 2 + 2.0 * dy * v0 ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = np.where(disc >= 0, np.sqrt(np.maximum(disc, 0.0)), np.nan)
+        theta_low = np.degrees(np.arctan2(v0 ** 2 - root, g * x))
+        theta_high = np.degrees(np.arctan2(v0 ** 2 + root, g * x))
+    return theta_low, theta_high
+
+
+def solve_launch_speed(launch_angle_deg, target_x_m, target_y_m, initial_height_m, gravity_m_per_s2):
+    """Closed-form launch speed (no drag) that passes through a target at a given angle.
+
+    v0 = x / cos θ · sqrt( g / (2 (x tan θ − Δy)) ); NaN when the target lies on or
+    above the launch line, where no speed can reach it.
+    """
+    theta = np.radians(np.asarray(launch_angle_deg, dtype=float))
+    x = np.asarray(target_x_m, dtype=float)
+    dy = np.asarray(target_y_m, dtype=float) - np.asarray(initial_height_m, dtype=float)
+    g = np.asarray(gravity_m_per_s2, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rise = x * np.tan(theta) - dy
+        v0 = np.where(rise > 0, x / np.cos(theta) * np.sqrt(g / (2.0 * rise)), np.nan)
+    return v0
+
+
+def height_at_distance(
+    initial_speed_m_per_s,
+    launch_angle_deg,
+    initial_height_m,
+    gravity_m_per_s2: float,
+    drag_mode: str,
+    drag_per_mass: float,
+    target_x_m,
+    steps: int = 64,
+):
+    """Height of the trajectory when it reaches horizontal distance x, for many launches at once.
+
+    With drag the equations are integrated with x as the independent variable
+    (dy/dx = v_y / v_x), using fixed-step RK4 with `steps` steps per launch, so no
+    trajectory needs to be stored. Launches whose horizontal velocity dies out
+    before reaching x return −inf.
+    """
+    v0, theta_deg, h0, x_target = np.broadcast_arrays(
+        np.asarray(initial_speed_m_per_s, dtype=float),
+        np.asarray(launch_angle_deg, dtype=float),
+        np.asarray(initial_height_m, dtype=float),
+        np.asarray(target_x_m, dtype=float),
+    )
+    theta = np.radians(theta_deg)
+    if drag_mode == "none" or drag_per_mass <= 0:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return h0 + x_target * np.tan(theta) - gravity_m_per_s2 * x_target ** 2 / (2.0 * (v0 * np.cos(theta)) ** 2)
+
+    def deriv(vx_, vy_):
+        ax, ay = drag_acceleration(vx_, vy_, gravity_m_per_s2, drag_mode, drag_per_mass)
+        return vy_ / vx_, ax / vx_, ay / vx_
+
+    dx = x_target / steps
+    y = h0.copy()
+    vx = v0 * np.cos(theta)
+    vy = v0 * np.sin(theta)
+    reachable = vx > 0
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(steps):
+            dy1, dvx1, dvy1 = deriv(vx, vy)
+            dy2, dvx2, dvy2 = deriv(vx + 0.5 * dx * dvx1, vy + 0.5 * dx * dvy1)
+            dy3, dvx3, dvy3 = deriv(vx + 0.5 * dx * dvx2, vy + 0.5 * dx * dvy2)
+            dy4, dvx4, dvy4 = deriv(vx + dx * dvx3, vy + dx * dvy3)
+            y = y + dx / 6.0 * (dy1 + 2 * dy2 + 2 * dy3 + dy4)
+            vx = vx + dx / 6.0 * (dvx1 + 2 * dvx2 + 2 * dvx3 + dvx4)
+            vy = vy + dx / 6.0 * (dvy1 + 2 * dvy2 + 2 * dvy3 + dvy4)
+            reachable &= vx > 0
+    return np.where(reachable & np.isfinite(y), y, -np.inf)
+
+
+def _bisect(func, lo, hi, iterations: int):
+    """Vectorized bisection: func(lo) and func(hi) must have opposite signs elementwise."""
+    f_lo = func(lo)
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        f_mid = func(mid)
+        left = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(left, mid, lo)
+        f_lo = np.where(left, f_mid, f_lo)
+        hi = np.where(left, hi, mid)
+    return 0.5 * (lo + hi)
+
+
+def solve_launch_angles_drag(
+    initial_speed_m_per_s,
+    target_x_m,
+    target_y_m,
+    initial_height_m,
+    gravity_m_per_s2: float,
+    drag_mode: str,
+    drag_per_mass: float,
+    angle_grid_points: int = 32,
+    iterations: int = 24,
+):
+    """Launch angles that hit each target with drag, via bracketed root-finding.
+
+    miss(θ) = y(x_target; θ) − y_target is evaluated on a coarse angle grid for all
+    targets at once; the lowest and highest sign changes bracket the flat and the
+    lob solution, which are then refined together by vectorized bisection.
+    Returns (θ_low, θ_high) in degrees with NaN where a target cannot be reached.
+    """
+    v0, x, y, h0 = np.broadcast_arrays(
+        np.asarray(initial_speed_m_per_s, dtype=float),
+        np.asarray(target_x_m, dtype=float),
+        np.asarray(target_y_m, dtype=float),
+        np.asarray(initial_height_m, dtype=float),
+    )
+    grid = np.linspace(-85.0, 89.5, angle_grid_points)
+    shape = v0.shape + (1,)
+    miss = height_at_distance(
+        v0.reshape(shape), grid, h0.reshape(shape), gravity_m_per_s2, drag_mode, drag_per_mass, x.reshape(shape)
+    ) - y.reshape(shape)
+
+    crossing = np.sign(miss[..., :-1]) != np.sign(miss[..., 1:])
+    has_root = crossing.any(axis=-1)
+    first = np.argmax(crossing, axis=-1)
+    last = crossing.shape[-1] - 1 - np.argmax(crossing[..., ::-1], axis=-1)
+
+    def solve_from(index):
+        lo = np.where(has_root, grid[index], 0.0)
+        hi = np.where(has_root, grid[index + 1], 1.0)
+
+        def miss_at(theta):
+            return height_at_distance(v0, theta, h0, gravity_m_per_s2, drag_mode, drag_per_mass, x) - y
+
+        return np.where(has_root, _bisect(miss_at, lo, hi, iterations), np.nan)
+
+    return solve_from(first), solve_from(last)
+
+
+def solve_launch_speed_drag(
+    launch_angle_deg,
+    target_x_m,
+    target_y_m,
+    initial_height_m,
+    gravity_m_per_s2: float,
+    drag_mode: str,
+    drag_per_mass: float,
+    speed_bracket: Tuple[float, float] = (0.1, 500.0),
+    iterations: int = 40,
+):
+    """Launch speed that hits each target at a given angle with drag (vectorized bisection).
+
+    The height reached at the target distance grows with v0, so one bracket
+    suffices. Returns NaN where even the upper bracket speed falls short.
+    """
+    theta, x, y, h0 = np.broadcast_arrays(
+        np.asarray(launch_angle_deg, dtype=float),
+        np.asarray(target_x_m, dtype=float),
+        np.asarray(target_y_m, dtype=float),
+        np.asarray(initial_height_m, dtype=float),
+    )
+
+    def miss_at(v0):
+        return height_at_distance(v0, theta, h0, gravity_m_per_s2, drag_mode, drag_per_mass, x) - y
+
+    lo = np.full(theta.shape, speed_bracket[0])
+    hi = np.full(theta.shape, speed_bracket[1])
+    solvable = (miss_at(lo) < 0) & (miss_at(hi) > 0)
+    return np.where(solvable, _bisect(miss_at, lo, hi, iterations), np.nan)
+
+
+# Redraw rounds allowed before generate_target_problems gives up on unreachable settings
+MAX_PROBLEM_DRAW_ROUNDS = 20
+
+
+@memoize(name="projectile.target_problems")
+def generate_target_problems(
+    num_problems: int,
+    seed: int,
+    gravity_m_per_s2: float,
+    initial_height_m: float,
+    drag_mode: str = "none",
+    drag_per_mass: float = 0.0,
+    speed_range: Tuple[float, float] = (10.0, 40.0),
+    distance_range: Tuple[float, float] = (5.0, 60.0),
+    height_range: Tuple[float, float] = (0.0, 10.0),
+):
+    """Randomized "hit the target" problems with answer keys, solved in one batch.
+
+    Each problem draws a speed and a target; targets out of reach are redrawn
+    so every problem has at least one solution. Each round draws enough
+    candidates for the remaining problems at the acceptance rate seen so far.
+    The same seed always gives the same problem set. Returns a dict of
+    equal-length arrays; raises ValueError when MAX_PROBLEM_DRAW_ROUNDS rounds
+    do not produce enough reachable targets.
+    """
+    rng = np.random.default_rng(seed)
+    v0 = np.empty(0)
+    x = np.empty(0)
+    y = np.empty(0)
+    low = np.empty(0)
+    high = np.empty(0)
+    drawn = 0
+    for _ in range(MAX_PROBLEM_DRAW_ROUNDS):
+        remaining = num_problems - v0.size
+        if remaining <= 0:
+            break
+        # Start by assuming half the targets are reachable, then use the observed rate
+        rate = max(v0.size / drawn, 0.02) if drawn else 0.5
+        n = int(np.ceil(1.5 * remaining / rate))
+        drawn += n
+        v_try = rng.uniform(*speed_range, n)
+        x_try = rng.uniform(*distance_range, n)
+        y_try = rng.uniform(*height_range, n)
+        if drag_mode == "none" or drag_per_mass <= 0:
+            low_try, high_try = solve_launch_angles(v_try, x_try, y_try, initial_height_m, gravity_m_per_s2)
+        else:
+            low_try, high_try = solve_launch_angles_drag(
+                v_try, x_try, y_try, initial_height_m, gravity_m_per_s2, drag_mode, drag_per_mass
+            )
+        ok = np.isfinite(low_try)
+        v0 = np.concatenate((v0, v_try[ok]))
+        x = np.concatenate((x, x_try[ok]))
+        y = np.concatenate((y, y_try[ok]))
+        low = np.concatenate((low, low_try[ok]))
+        high = np.concatenate((high, high_try[ok]))
+    if v0.size < num_problems:
+        raise ValueError(
+            f"only {v0.size} of {num_problems} targets were reachable after {drawn:,} draws; "
+            "use less drag, a smaller g or a larger speed range"
+        )
+
+    return {
+        "problem": np.arange(1, num_problems + 1),
+        "v0": v0[:num_problems],
+        "target_x": x[:num_problems],
+        "target_y": y[:num_problems],
+        "theta_low": low[:num_problems],
+        "theta_high": high[:num_problems],
+    }
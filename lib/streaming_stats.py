@@ -0,0 +1,129 @@
+import math
+from typing import Iterable
+
+import numpy as np
+
+# Bins kept by StreamingHistogram; must be even so pairs of bins can be merged
+DEFAULT_HISTOGRAM_BINS = 64
+
+
+class RunningStats:
+    """Count, mean, sample σ, minimum and maximum of a stream of chunks in O(1) memory.
+
+    Each chunk's own (count, mean, M2) is computed with NumPy and folded into
+    the running totals with the pairwise form of Welford's update (Chan et al.),
+    which stays accurate for millions of readings sharing a large offset.
+    Non-finite values are counted as skipped rather than included.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.skipped = 0
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=float).ravel()
+        finite = values[np.isfinite(values)]
+        self.skipped += values.size - finite.size
+        n_b = finite.size
+        if n_b == 0:
+            return
+        mean_b = float(finite.mean())
+        m2_b = float(np.sum((finite - mean_b) ** 2))
+        n = self.count + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta ** 2 * self.count * n_b / n
+        self.count = n
+        self.minimum = min(self.minimum, float(finite.min()))
+        self.maximum = max(self.maximum, float(finite.max()))
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (n − 1 in the denominator)."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+    @property
+    def standard_error(self) -> float:
+        """σ / √N, the uncertainty of the mean."""
+        return self.std / math.sqrt(self.count) if self.count > 1 else math.nan
+
+    @property
+    def value_range(self) -> float:
+        return self.maximum - self.minimum if self.count else math.nan
+
+    @property
+    def half_range(self) -> float:
+        """(max − min) / 2, the range-method uncertainty of a single reading."""
+        return self.value_range / 2.0
+
+
+class StreamingHistogram:
+    """Fixed-size histogram whose range grows to cover every value seen.
+
+    The first chunk sets the initial range. When a later value falls outside
+    it, the bin width is doubled by merging neighbouring pairs and the range is
+    extended towards that value, so memory stays at `num_bins` counts no matter
+    how many readings pass through or how far they spread.
+    """
+
+    def __init__(self, num_bins: int = DEFAULT_HISTOGRAM_BINS) -> None:
+        if num_bins < 2 or num_bins % 2:
+            raise ValueError("num_bins must be an even number of at least 2")
+        self.num_bins = num_bins
+        self.counts = np.zeros(num_bins, dtype=np.int64)
+        self.low = None
+        self.width = None
+
+    @property
+    def high(self) -> float:
+        return self.low + self.width * self.num_bins
+
+    @property
+    def edges(self) -> np.ndarray:
+        return self.low + self.width * np.arange(self.num_bins + 1)
+
+    def _grow(self, toward_low: bool) -> None:
+        merged = self.counts.reshape(-1, 2).sum(axis=1)
+        half = self.num_bins // 2
+        self.counts = np.zeros(self.num_bins, dtype=np.int64)
+        if toward_low:
+            self.counts[half:] = merged
+            self.low -= self.width * self.num_bins
+        else:
+            self.counts[:half] = merged
+        self.width *= 2.0
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        v_min, v_max = float(values.min()), float(values.max())
+        if self.low is None:
+            span = v_max - v_min
+            if span <= 0:
+                span = abs(v_min) * 1e-6 or 1.0
+            self.low = v_min
+            # A little headroom keeps the maximum inside the last bin
+            self.width = span * (1.0 + 1e-9) / self.num_bins
+        while v_min < self.low:
+            self._grow(toward_low=True)
+        while v_max >= self.high:
+            self._grow(toward_low=False)
+        index = ((values - self.low) / self.width).astype(np.intp)
+        np.clip(index, 0, self.num_bins - 1, out=index)
+        self.counts += np.bincount(index, minlength=self.num_bins)
+
+
+def stream_statistics(chunks: Iterable, num_bins: int = DEFAULT_HISTOGRAM_BINS):
+    """One pass over an iterable of value arrays; returns (RunningStats, StreamingHistogram)."""
+    stats = RunningStats()
+    histogram = StreamingHistogram(num_bins)
+    for chunk in chunks:
+        stats.update(chunk)
+        histogram.update(chunk)
+    return stats, histogram
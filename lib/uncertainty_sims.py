@@ -0,0 +1,230 @@
+import math
+
+import numpy as np
+from scipy import stats
+
+from compute_cache import memoize
+from streaming_stats import RunningStats, StreamingHistogram
+
+# Readings drawn per batch; memory use is set by this, not by the total number of samples
+SIM_BATCH_SIZE = 500_000
+
+# Distributions offered by the sampling simulator, each scaled to the requested mean and σ
+SAMPLING_DISTRIBUTIONS = ("normal", "uniform", "exponential")
+
+# Log-spaced reading counts at which the running σ and σ/√N are recorded
+HISTORY_POINTS = 60
+
+# Coverage intervals checked against the normal distribution, in units of σ
+COVERAGE_SIGMAS = (1.0, 2.0, 3.0)
+
+# Largest number of readings per experiment in the estimator comparison
+MAX_READINGS = 100
+# Percentiles drawn as the spread band around each estimator's average
+SPREAD_PERCENTILES = (16.0, 84.0)
+
+# Dart board radius [cm] and the number of image bins across it
+BOARD_RADIUS = 10.0
+BOARD_BINS = 200
+
+
+def _draw(rng, distribution: str, mean: float, sigma: float, size: int) -> np.ndarray:
+    if distribution == "normal":
+        return rng.normal(mean, sigma, size)
+    if distribution == "uniform":
+        half_width = sigma * math.sqrt(3.0)
+        return rng.uniform(mean - half_width, mean + half_width, size)
+    if distribution == "exponential":
+        # Shifted so the mean is `mean`; an exponential's σ equals its scale
+        return rng.exponential(sigma, size) + (mean - sigma)
+    raise ValueError(f"unknown distribution: {distribution!r}")
+
+
+def _running_history(readings: RunningStats, values: np.ndarray, positions: np.ndarray) -> list:
+    """(count, σ, σ/√count) after the first p values of this batch, for each p in `positions`.
+
+    `readings` holds the totals before the batch. Prefix sums of the batch
+    about its own mean give each prefix's (count, mean, M2), which is merged
+    with the totals by the same pairwise update RunningStats uses.
+    """
+    if positions.size == 0:
+        return []
+    shift = float(values.mean())
+    s1 = np.cumsum(values - shift)[positions - 1]
+    s2 = np.cumsum((values - shift) ** 2)[positions - 1]
+    mean_b = shift + s1 / positions
+    m2_b = s2 - s1 ** 2 / positions
+    n = readings.count + positions
+    delta = mean_b - readings.mean
+    m2 = readings.m2 + m2_b + delta ** 2 * readings.count * positions / n
+    std = np.sqrt(np.maximum(m2, 0.0) / np.maximum(n - 1, 1))
+    return list(zip(n.tolist(), std.tolist(), (std / np.sqrt(n)).tolist()))
+
+
+@memoize(name="sims.gaussian_sampling")
+def simulate_sampling(
+    distribution: str,
+    n_samples: int,
+    group_size: int,
+    mean: float = 0.48,
+    sigma: float = 0.0331,
+    seed: int = 0,
+    num_bins: int = 80,
+) -> dict:
+    """Draw `n_samples` readings in batches and keep only running statistics.
+
+    Each batch updates RunningStats (Welford/Chan) and a StreamingHistogram,
+    counts the readings within ±kσ of the true mean, and splits into groups of
+    `group_size` whose averages feed a second RunningStats, so the spread of
+    averages can be compared with σ/√N. Returns the histogram counts, the
+    running σ and σ/√N at HISTORY_POINTS log-spaced reading counts, and the
+    observed coverage next to scipy.stats.norm's.
+    """
+    if distribution not in SAMPLING_DISTRIBUTIONS:
+        raise ValueError(f"unknown distribution: {distribution!r}")
+    rng = np.random.default_rng(seed)
+    readings = RunningStats()
+    averages = RunningStats()
+    histogram = StreamingHistogram(num_bins)
+    within = np.zeros(len(COVERAGE_SIGMAS), dtype=np.int64)
+    limits = np.asarray(COVERAGE_SIGMAS) * sigma
+    # Batches hold whole groups so no average straddles two batches
+    batch = max(group_size, (SIM_BATCH_SIZE // group_size) * group_size)
+    history = []
+    checkpoints = np.unique(np.geomspace(2, max(n_samples, 2), HISTORY_POINTS).astype(np.int64))
+
+    drawn = 0
+    while drawn < n_samples:
+        size = min(batch, n_samples - drawn)
+        values = _draw(rng, distribution, mean, sigma, size)
+        inside = checkpoints[(checkpoints > drawn) & (checkpoints <= drawn + size)]
+        history.extend(_running_history(readings, values, inside - drawn))
+        readings.update(values)
+        histogram.update(values)
+        deviation = np.abs(values - mean)
+        within += np.count_nonzero(deviation[:, np.newaxis] <= limits, axis=0)
+        complete = (size // group_size) * group_size
+        if complete:
+            averages.update(values[:complete].reshape(-1, group_size).mean(axis=1))
+        drawn += size
+
+    return {
+        "count": readings.count,
+        "mean": readings.mean,
+        "std": readings.std,
+        "standard_error": readings.standard_error,
+        "edges": histogram.edges,
+        "counts": histogram.counts.copy(),
+        "coverage": within / readings.count,
+        "normal_coverage": np.array([stats.norm.cdf(k) - stats.norm.cdf(-k) for k in COVERAGE_SIGMAS]),
+        "n_averages": averages.count,
+        "std_of_averages": averages.std,
+        "predicted_std_of_averages": sigma / math.sqrt(group_size),
+        "history": np.array(history),
+    }
+
+
+@memoize(name="sims.estimator_comparison")
+def compare_estimators(
+    distribution: str,
+    replicates: int = 20_000,
+    max_readings: int = MAX_READINGS,
+    mean: float = 0.48,
+    sigma: float = 0.0331,
+    seed: int = 0,
+) -> dict:
+    """Range half-width, sample σ and standard error for every N from 2 to `max_readings`.
+
+    One (replicates × max_readings) matrix of readings is drawn and every
+    experiment of N readings is its first N columns, so running maxima and
+    minima (np.maximum/minimum.accumulate) and cumulative sums give all N at
+    once. Sums are taken about the true mean to avoid cancellation. Returns N
+    and, per estimator, the average over replicates and the SPREAD_PERCENTILES.
+    """
+    rng = np.random.default_rng(seed)
+    readings = _draw(rng, distribution, mean, sigma, replicates * max_readings).reshape(replicates, max_readings)
+    n = np.arange(1, max_readings + 1, dtype=float)
+
+    half_range = (np.maximum.accumulate(readings, axis=1) - np.minimum.accumulate(readings, axis=1)) / 2.0
+    centered = readings - mean
+    s1 = np.cumsum(centered, axis=1)
+    s2 = np.cumsum(centered ** 2, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (s2 - s1 ** 2 / n) / (n - 1.0)
+    std = np.sqrt(np.maximum(variance, 0.0))
+    standard_error = std / np.sqrt(n)
+
+    keep = slice(1, None)  # N = 1 has no spread
+    summary = {"n": n[keep].astype(int)}
+    for name, values in (("half_range", half_range), ("std", std), ("standard_error", standard_error)):
+        values = values[:, keep]
+        summary[name] = {
+            "mean": values.mean(axis=0),
+            "low": np.percentile(values, SPREAD_PERCENTILES[0], axis=0),
+            "high": np.percentile(values, SPREAD_PERCENTILES[1], axis=0),
+        }
+    summary["sigma"] = sigma
+    return summary
+
+
+@memoize(name="sims.dartboard")
+def simulate_dartboard(bias: float, spread: float, n_hits: int, seed: int = 0, bins: int = BOARD_BINS) -> dict:
+    """Throw `n_hits` darts aimed `bias` cm up and to the right of the bullseye with Gaussian scatter σ = `spread` cm.
+
+    Hits are binned with numpy.histogram2d over the board, so only a
+    bins × bins density image is drawn however many darts are thrown.
+    Accuracy is the distance from the bullseye to the average hit (systematic
+    error); precision is the RMS distance of the hits from their own average
+    (random error).
+    """
+    rng = np.random.default_rng(seed)
+    offset = bias / math.sqrt(2.0)
+    hits = rng.normal(offset, spread, size=(2, n_hits)) if spread > 0 else np.full((2, n_hits), offset)
+    counts, x_edges, y_edges = np.histogram2d(hits[0], hits[1], bins=bins, range=[[-BOARD_RADIUS, BOARD_RADIUS]] * 2)
+    center = hits.mean(axis=1)
+    scatter = np.sqrt(np.mean(np.sum((hits - center[:, np.newaxis]) ** 2, axis=0)))
+    return {
+        "density": counts.T,  # rows are y, as an image expects
+        "x_centers": (x_edges[:-1] + x_edges[1:]) / 2.0,
+        "y_centers": (y_edges[:-1] + y_edges[1:]) / 2.0,
+        "mean_hit": center,
+        "accuracy": float(np.hypot(*center)),
+        "precision": float(scatter),
+        "off_board": int(n_hits - counts.sum()),
+        "n_hits": int(n_hits),
+    }
+
+
+@memoize(name="sims.quantization")
+def simulate_quantization(resolution: float, noise: float, trials: int = 200_000, seed: int = 0, bins: int = 81) -> dict:
+    """Read a continuous true value on an instrument with divisions of `resolution`, many times over.
+
+    Each trial places the true value at a random point between divisions,
+    adds Gaussian noise σ = `noise` (hand, eye or signal jitter) and rounds to
+    the nearest division. Returns a histogram of reading − true value, its
+    σ and largest size, and for each reading-uncertainty rule the half-width
+    and the fraction of trials whose error fell inside it.
+    """
+    rng = np.random.default_rng(seed)
+    true_values = rng.uniform(0.0, 100.0 * resolution, trials)
+    observed = true_values + (rng.normal(0.0, noise, trials) if noise > 0 else 0.0)
+    errors = np.rint(observed / resolution) * resolution - true_values
+
+    rules = {
+        "± ½ division": resolution / 2.0,
+        "± 1 division": resolution,
+        "σ of rounding, division / √12": resolution / math.sqrt(12.0),
+        "Rounding and noise, √(division² / 12 + σ²)": math.sqrt(resolution ** 2 / 12.0 + noise ** 2),
+    }
+    abs_errors = np.abs(errors)
+    extent = resolution + 4.0 * noise
+    counts, edges = np.histogram(errors, bins=bins, range=(-extent, extent))
+    return {
+        "counts": counts,
+        "edges": edges,
+        "std": float(errors.std(ddof=1)),
+        "max_abs": float(abs_errors.max()),
+        # A tiny allowance keeps errors that sit exactly on a rule's boundary inside it despite rounding
+        "rules": {name: (width, float(np.mean(abs_errors <= width * (1.0 + 1e-9)))) for name, width in rules.items()},
+        "trials": int(trials),
+    }
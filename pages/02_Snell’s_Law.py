@@ -1,13 +1,42 @@
 import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
 import streamlit as st
 
+# Add the lib directory to the path so we can import shared helpers
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from autodiff import quadrature
+from compute_cache import memoize, row_cache
+from lab_calculations import SNELL_ERRORS, snell_range
+from lab_formulas import snell_index
+from line_fit import fit_through_origin
+from measurement import Measurement
+from monte_carlo import DISTRIBUTIONS, propagate
+from plotting import build_figure, line_trace
+
 
 st.set_page_config(page_title="02 – Snell's Law", page_icon="🔦", layout="wide")
 
+# Starting angle sweep for the table mode (θ2 rounded from n ≈ 1.55)
+EXAMPLE_SWEEP = pd.DataFrame({
+	"θ1 [deg]": [5.0, 10.0, 15.0, 20.0, 25.0, 30.0, 35.0, 40.0],
+	"Δθ1 [deg]": [0.5] * 8,
+	"θ2 [deg]": [7.5, 15.5, 23.5, 32.0, 41.0, 51.0, 62.5, 85.0],
+	"Δθ2 [deg]": [0.5] * 8,
+	"Your n": [None] * 8,
+	"Your half-range": [None] * 8,
+})
+SWEEP_INPUT_COLUMNS = ["θ1 [deg]", "Δθ1 [deg]", "θ2 [deg]", "Δθ2 [deg]"]
+
 st.title("Snell's Law with Uncertainty (Range Method)")
 st.caption("Enter angles in degrees. This tool checks your results and shows how the calculations are done.")
 
 
+@memoize(name="snell.refractive_indices")
 def compute_refractive_indices(theta1_deg: float, theta2_deg: float, dtheta1_deg: float, dtheta2_deg: float):
 
 	# Convert degrees to radians
@@ -15,85 +44,55 @@ def compute_refractive_indices(theta1_deg: float, theta2_deg: float, dtheta1_deg
 	theta2_rad = math.radians(theta2_deg)
 	dtheta1_rad = math.radians(dtheta1_deg)
 	dtheta2_rad = math.radians(dtheta2_deg)
+	parts = {
+		"theta1_rad": theta1_rad,
+		"theta2_rad": theta2_rad,
+		"dtheta1_rad": dtheta1_rad,
+		"dtheta2_rad": dtheta2_rad,
+	}
 
-	# Guard against invalid input leading to division by zero
-	sin_theta1 = math.sin(theta1_rad)
-	if abs(sin_theta1) < 1e-12:
-		return {
-			"ok": False,
-			"error": "sin(θ1) is zero or too small; θ1 must not be 0°, 180°, etc.",
-			"nominal": None,
-			"high": None,
-			"low": None,
-			"half_range": None,
-			"parts": {
-				"theta1_rad": theta1_rad,
-				"theta2_rad": theta2_rad,
-				"dtheta1_rad": dtheta1_rad,
-				"dtheta2_rad": dtheta2_rad,
-			},
-		}
-
-	# Nominal using Snell's law: n2 = sin(theta2)/sin(theta1) (assuming n1 = 1)
-	nominal = math.sin(theta2_rad) / sin_theta1
-
-	# High and low using range method
-	# High: theta2 + dtheta2, theta1 - dtheta1
-	sin_theta1_low = math.sin(theta1_rad - dtheta1_rad)
-	if abs(sin_theta1_low) < 1e-12:
-		return {
-			"ok": False,
-			"error": "sin(θ1 − Δθ1) is zero or too small; adjust uncertainties.",
-			"nominal": None,
-			"high": None,
-			"low": None,
-			"half_range": None,
-			"parts": {
-				"theta1_rad": theta1_rad,
-				"theta2_rad": theta2_rad,
-				"dtheta1_rad": dtheta1_rad,
-				"dtheta2_rad": dtheta2_rad,
-			},
-		}
-	high = math.sin(theta2_rad + dtheta2_rad) / sin_theta1_low
-
-	# Low: theta2 − dtheta2, theta1 + dtheta1
-	sin_theta1_high = math.sin(theta1_rad + dtheta1_rad)
-	if abs(sin_theta1_high) < 1e-12:
+	# Nominal n2 = sin(theta2)/sin(theta1) (assuming n1 = 1), high = sin(theta2 + dtheta2)/sin(theta1 - dtheta1)
+	# and low = sin(theta2 - dtheta2)/sin(theta1 + dtheta1); snell_range guards each division
+	n, error = snell_range(Measurement(theta1_rad, dtheta1_rad, "rad"), Measurement(theta2_rad, dtheta2_rad, "rad"))
+	if error:
 		return {
 			"ok": False,
-			"error": "sin(θ1 + Δθ1) is zero or too small; adjust uncertainties.",
+			"error": SNELL_ERRORS[int(error)],
 			"nominal": None,
 			"high": None,
 			"low": None,
 			"half_range": None,
-			"parts": {
-				"theta1_rad": theta1_rad,
-				"theta2_rad": theta2_rad,
-				"dtheta1_rad": dtheta1_rad,
-				"dtheta2_rad": dtheta2_rad,
-			},
+			"parts": parts,
 		}
-	low = math.sin(theta2_rad - dtheta2_rad) / sin_theta1_high
 
+	high = float(n.high)
+	low = float(n.low)
 	half_range = (high - low) / 2
 
 	return {
 		"ok": True,
 		"error": None,
-		"nominal": nominal,
+		"nominal": float(n.value),
 		"high": high,
 		"low": low,
 		"half_range": half_range,
-		"parts": {
-			"theta1_rad": theta1_rad,
-			"theta2_rad": theta2_rad,
-			"dtheta1_rad": dtheta1_rad,
-			"dtheta2_rad": dtheta2_rad,
-		},
+		"parts": parts,
 	}
 
 
+def snell_rows(rows: np.ndarray) -> np.ndarray:
+	"""Range-method results for an (m, 4) array of θ1, Δθ1, θ2, Δθ2 rows in degrees.
+
+	Returns an (m, 5) array of nominal, low, high, half-range and error code,
+	matching compute_refractive_indices row by row.
+	"""
+	n, error = snell_range(
+		Measurement(np.radians(rows[:, 0]), np.radians(rows[:, 1]), "rad"),
+		Measurement(np.radians(rows[:, 2]), np.radians(rows[:, 3]), "rad"),
+	)
+	return np.column_stack([n.value, n.low, n.high, (n.high - n.low) / 2, error])
+
+
 def is_close(student_value: float, expected_value: float, abs_tol: float = 0.002, rel_tol: float = 0.001) -> bool:
 	"""Return True if student_value is within tolerance of expected_value.
 
@@ -273,3 +272,150 @@ if st.session_state.show_steps:
 		st.info("Values update dynamically as you edit the four inputs above.")
 
 
+# =============================
+# Phase 4 – Comparing Uncertainty Methods
+# =============================
+st.subheader("Comparing Uncertainty Methods")
+
+with st.expander("Range method, quadrature and Monte Carlo side by side"):
+	st.caption(
+		"Quadrature treats Δθ as a standard deviation and combines σ_n = sqrt((∂n/∂θ1 Δθ1)² + (∂n/∂θ2 Δθ2)²) using exact derivatives. "
+		"Monte Carlo draws many (θ1, θ2) pairs around your inputs and computes n for each one. "
+		"Uniform draws stay inside ±Δθ like the range method; normal draws treat Δθ as one standard deviation. "
+		"The same seed always gives the same result."
+	)
+	mc_col1, mc_col2, mc_col3 = st.columns(3)
+	with mc_col1:
+		mc_distribution = st.radio("Input distribution", DISTRIBUTIONS, horizontal=True, key="mc_distribution_snell")
+	with mc_col2:
+		mc_samples = st.select_slider("Samples", options=[10_000, 100_000, 1_000_000, 10_000_000], value=100_000, key="mc_samples_snell")
+	with mc_col3:
+		mc_seed = st.number_input("Seed", min_value=0, value=2025, step=1, key="mc_seed_snell")
+
+	calc = compute_refractive_indices(theta1_deg, theta2_deg, dtheta1_deg, dtheta2_deg)
+	if not calc["ok"]:
+		st.error(calc["error"])
+	else:
+		mc = propagate("snell", (theta1_deg, theta2_deg), (dtheta1_deg, dtheta2_deg), mc_distribution, int(mc_samples), int(mc_seed))["n"]
+		pct = mc["percentiles"]
+		n_quad, sigma_quad, contributions = quadrature(snell_index, (theta1_deg, theta2_deg), (dtheta1_deg, dtheta2_deg))
+		range_col, quad_col, mc_col = st.columns(3)
+		with range_col:
+			st.markdown("**Range method**")
+			st.metric("Nominal n", format_number(calc["nominal"], 6))
+			st.metric("Low – High", f"{format_number(calc['low'], 6)} – {format_number(calc['high'], 6)}")
+			st.metric("Half-range", format_number(calc["half_range"], 6))
+		with quad_col:
+			st.markdown("**Quadrature**")
+			st.metric("Nominal n", format_number(float(n_quad), 6))
+			st.metric("Contributions from θ1, θ2", f"{format_number(float(abs(contributions[0])), 4)}, {format_number(float(abs(contributions[1])), 4)}")
+			st.metric("σ_n", format_number(float(sigma_quad), 6))
+		with mc_col:
+			st.markdown(f"**Monte Carlo** ({mc['n_valid']:,} samples)")
+			st.metric("Mean n", format_number(mc["mean"], 6))
+			st.metric("2.5th – 97.5th percentile", f"{format_number(pct[2.5], 6)} – {format_number(pct[97.5], 6)}")
+			st.metric("Standard deviation σ", format_number(mc["std"], 6))
+		st.caption(
+			f"Median {format_number(pct[50.0], 6)}; 16th–84th percentile {format_number(pct[16.0], 6)} – {format_number(pct[84.0], 6)}. "
+			"The half-range is a worst case, so it is usually larger than either σ."
+		)
+		if mc["n_invalid"]:
+			st.warning(f"{mc['n_invalid']:,} samples gave sin(θ1) = 0 and were left out.")
+
+
+# =============================
+# Phase 5 – Angle Sweep Table
+# =============================
+st.subheader("Angle Sweep Table")
+
+with st.expander("Grade a full angle sweep and fit n"):
+	st.caption(
+		"Enter one measurement per row. Each row is checked the same way as above, then sin θ2 is fitted against sin θ1 "
+		"through the origin, so the slope is n. Only edited rows are recalculated."
+	)
+	sweep = st.data_editor(EXAMPLE_SWEEP, num_rows="dynamic", use_container_width=True, key="snell_sweep_table")
+	inputs = sweep[SWEEP_INPUT_COLUMNS].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+	complete = np.all(np.isfinite(inputs), axis=1)
+	inputs = inputs[complete]
+	student = sweep.loc[complete, ["Your n", "Your half-range"]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+	if inputs.shape[0] == 0:
+		st.info("Add at least one complete row (θ1, Δθ1, θ2, Δθ2).")
+	else:
+		results = row_cache.compute("snell.sweep_rows", inputs, snell_rows)
+		nominal, half_range, error = results[:, 0], results[:, 3], results[:, 4].astype(int)
+		valid = error == 0
+
+		# Same tolerance policy as is_close, applied to every row at once
+		def rows_close(student_values, expected, abs_tol=0.002, rel_tol=0.001):
+			with np.errstate(invalid="ignore"):
+				return np.abs(student_values - expected) <= np.maximum(rel_tol * np.maximum(np.abs(student_values), np.abs(expected)), abs_tol)
+
+		table_sig = hash((inputs.tobytes(), student.tobytes()))
+		if st.session_state.get("prev_sig_snell_table") != table_sig:
+			st.session_state.prev_sig_snell_table = table_sig
+			st.session_state.show_results_snell_table = False
+		if st.button("Check Table"):
+			st.session_state.show_results_snell_table = True
+
+		if st.session_state.get("show_results_snell_table"):
+			def verdicts(student_values, expected):
+				ok = valid & rows_close(student_values, expected)
+				return np.where(~valid, "invalid row", np.where(np.isnan(student_values), "—", np.where(ok, "✓", "✗ — try again")))
+
+			n_ok = valid & rows_close(student[:, 0], nominal)
+			hr_ok = valid & rows_close(student[:, 1], half_range)
+			graded = pd.DataFrame({
+				"θ1 [deg]": inputs[:, 0],
+				"θ2 [deg]": inputs[:, 2],
+				"n": verdicts(student[:, 0], nominal),
+				"Expected n": np.where(n_ok, np.round(nominal, 6).astype(str), ""),
+				"Half-range": verdicts(student[:, 1], half_range),
+				"Expected half-range": np.where(hr_ok, np.round(half_range, 6).astype(str), ""),
+			})
+			st.dataframe(graded, use_container_width=True, hide_index=True)
+			for code in np.unique(error[~valid]):
+				st.error(f"{int(np.count_nonzero(error == code))} row(s): {SNELL_ERRORS[int(code)]}")
+
+		if np.count_nonzero(valid) >= 2:
+			theta1_rad = np.radians(inputs[valid, 0])
+			theta2_rad = np.radians(inputs[valid, 2])
+			x = np.sin(theta1_rad)
+			y = np.sin(theta2_rad)
+			sigma_x = np.abs(np.cos(theta1_rad)) * np.radians(inputs[valid, 1])
+			sigma_y = np.abs(np.cos(theta2_rad)) * np.radians(inputs[valid, 3])
+			fit = fit_through_origin(x, y, sigma_x, sigma_y)
+			if not fit["ok"]:
+				st.error(fit["error"])
+			else:
+				fit1, fit2, fit3 = st.columns(3)
+				fit1.metric("Fitted n (slope)", f"{format_number(fit['slope'], 6)} ± {format_number(fit['sigma_slope'], 2)}")
+				fit2.metric("Rows in fit", f"{fit['n_points']}")
+				fit3.metric("χ² / dof", format_number(fit["reduced_chi2"], 3) if fit["weighted"] else "—")
+
+				x_line = np.linspace(0.0, float(np.max(x)) * 1.05, 50)
+				plot_fit, plot_res = st.columns(2)
+				with plot_fit:
+					fig_fit = build_figure(
+						[
+							line_trace(
+								x, y, "Rows", mode="markers",
+								error_x=dict(type="data", array=sigma_x.astype(np.float32)),
+								error_y=dict(type="data", array=sigma_y.astype(np.float32)),
+							),
+							line_trace(x_line, fit["slope"] * x_line, f"sin θ2 = {fit['slope']:.4f} sin θ1"),
+						],
+						title="sin θ2 versus sin θ1", xaxis_title="sin θ1", yaxis_title="sin θ2", height=400,
+					)
+					st.plotly_chart(fig_fit, use_container_width=True)
+				with plot_res:
+					fig_res = build_figure(
+						[line_trace(
+							inputs[valid, 0], fit["residuals"], "Residual", mode="markers",
+							error_y=dict(type="data", array=np.asarray(fit["sigma_residuals"], dtype=np.float32)),
+						)],
+						title="Fit Residuals", xaxis_title="θ1 [deg]", yaxis_title="sin θ2 − n sin θ1", height=400,
+					)
+					fig_res.add_hline(y=0.0, line_color="gray", line_dash="dot")
+					st.plotly_chart(fig_res, use_container_width=True)
+				st.caption("Residuals that trend with θ1 instead of scattering around zero point to a systematic error, such as an offset in the angle scale.")
@@ -1,13 +1,42 @@
 import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
 import streamlit as st
 
+# Add the lib directory to the path so we can import shared helpers
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from autodiff import quadrature
+from compute_cache import memoize
+from lab_calculations import thin_lens_range
+from lab_formulas import image_distance, reciprocal
+from lens_fit import fit_focal_length
+from monte_carlo import DISTRIBUTIONS, propagate
+from plotting import build_figure, line_trace
+
 
 st.set_page_config(page_title="03 – Optics Lab", page_icon="🔭", layout="wide")
 
+# Largest number of rows drawn with error bars in the focal-length plot (the fit always uses every row)
+MAX_FIT_PLOT_ROWS = 2000
+
+# Example rows for a lens with f ≈ 10 cm (columns as in the workbook)
+EXAMPLE_FIT_ROWS = pd.DataFrame({
+	"A": [0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+	"B": [15.0, 18.0, 20.0, 25.0, 30.0, 40.0],
+	"C": [0.1, 0.1, 0.1, 0.1, 0.1, 0.1],
+	"D": [44.2, 40.0, 39.2, 40.9, 44.2, 52.6],
+	"F": [45.6, 41.2, 40.6, 42.6, 45.6, 54.2],
+})
+
 st.title("Optics Lab: Thin Lens with Range-Method Uncertainty")
 st.caption("Enter positions in cm. This tool checks your results and shows how the calculations are done.")
 
 
+@memoize(name="optics.thin_lens")
 def compute_optics(
 	object_pos_cm: float,
 	lens_pos_cm: float,
@@ -32,28 +61,37 @@ def compute_optics(
 	The do absolute uncertainty uses the fixed ±0.2 cm as per the sheet.
 	"""
 
-	E_best = (smallest_focal_pos_cm + largest_focal_pos_cm) / 2.0
-	G_do = lens_pos_cm - object_pos_cm
-	H_di = E_best - lens_pos_cm
-	J_unc_image_pos = (largest_focal_pos_cm - smallest_focal_pos_cm) / 2.0
-	K_unc_image_dist = J_unc_image_pos + unc_lens_pos_cm
+	row = thin_lens_range(
+		object_pos_cm,
+		lens_pos_cm,
+		unc_lens_pos_cm,
+		smallest_focal_pos_cm,
+		largest_focal_pos_cm,
+		assumed_do_abs_unc_cm,
+	)
+
+	def cell(x):
+		# Blank workbook cells (division by zero) come back as NaN
+		x = float(x)
+		return None if math.isnan(x) else x
 
-	def safe_inv(x: float):
-		if x is None or abs(x) < 1e-12:
-			return None
-		return 1.0 / x
+	E_best = float(row["E_best_focal_pos"])
+	G_do = float(row["object_distance"].value)
+	H_di = float(row["image_distance"].value)
+	J_unc_image_pos = float(row["J_unc_image_pos"])
+	K_unc_image_dist = float(row["K_unc_image_distance"])
 
-	L_inv_di = safe_inv(H_di)
-	M_inv_do = safe_inv(G_do)
+	L_inv_di = cell(row["inv_di"].value)
+	M_inv_do = cell(row["inv_do"].value)
 
-	N_inv_di_max = safe_inv(H_di - K_unc_image_dist)
-	O_inv_di_min = safe_inv(H_di + K_unc_image_dist)
+	N_inv_di_max = cell(row["inv_di"].high)
+	O_inv_di_min = cell(row["inv_di"].low)
 	P_unc_inv_di = None
 	if N_inv_di_max is not None and O_inv_di_min is not None:
 		P_unc_inv_di = (N_inv_di_max - O_inv_di_min) / 2.0
 
-	Q_inv_do_max = safe_inv(G_do - assumed_do_abs_unc_cm)
-	R_inv_do_min = safe_inv(G_do + assumed_do_abs_unc_cm)
+	Q_inv_do_max = cell(row["inv_do"].high)
+	R_inv_do_min = cell(row["inv_do"].low)
 	S_unc_inv_do = None
 	if Q_inv_do_max is not None and R_inv_do_min is not None:
 		S_unc_inv_do = (Q_inv_do_max - R_inv_do_min) / 2.0
@@ -296,3 +334,133 @@ if st.session_state.show_steps_optics:
 		st.markdown(f"unc 1/do = (max − min)/2 = ({format_number(d['Q_inv_do_max'], 6)} − {format_number(d['R_inv_do_min'], 6)})/2 = {format_number(d['S_unc_inv_do'], 6)} cm⁻¹")
 
 
+# =============================
+# Phase 3 – Comparing Uncertainty Methods
+# =============================
+st.subheader("Comparing Uncertainty Methods")
+
+with st.expander("Range method, quadrature and Monte Carlo side by side"):
+	st.caption(
+		"Quadrature treats C, J and |Δdo| as standard deviations and combines them with exact derivatives, e.g. σ(1/di) = sqrt((∂/∂B · C)² + (∂/∂E · J)²). "
+		"Monte Carlo draws many sets of do (± |Δdo|), lens position B (± C) and best focal position E (± J) and computes 1/di and 1/do for each. "
+		"Uniform draws stay inside the stated uncertainties like the range method; normal draws treat each one as a standard deviation. "
+		"The same seed always gives the same result."
+	)
+	mc_col1, mc_col2, mc_col3 = st.columns(3)
+	with mc_col1:
+		mc_distribution = st.radio("Input distribution", DISTRIBUTIONS, horizontal=True, key="mc_distribution_optics")
+	with mc_col2:
+		mc_samples = st.select_slider("Samples", options=[10_000, 100_000, 1_000_000, 10_000_000], value=100_000, key="mc_samples_optics")
+	with mc_col3:
+		mc_seed = st.number_input("Seed", min_value=0, value=2025, step=1, key="mc_seed_optics")
+
+	calc = compute_optics(
+		object_pos_cm=A_object_pos,
+		lens_pos_cm=B_lens_pos,
+		unc_lens_pos_cm=C_unc_lens_pos,
+		smallest_focal_pos_cm=D_smallest_focal,
+		largest_focal_pos_cm=F_largest_focal,
+		assumed_do_abs_unc_cm=assumed_do_unc,
+	)
+	if not calc["ok"]:
+		st.error(calc["error"])
+	else:
+		d = calc["derived"]
+		mc = propagate(
+			"thin_lens",
+			(d["G_object_distance"], B_lens_pos, d["E_best_focal_pos"]),
+			(assumed_do_unc, C_unc_lens_pos, d["J_unc_image_pos"]),
+			mc_distribution, int(mc_samples), int(mc_seed),
+		)
+		_, sigma_inv_di, _ = quadrature(
+			lambda lens_pos, image_pos: reciprocal(image_distance(lens_pos, image_pos)),
+			(B_lens_pos, d["E_best_focal_pos"]), (C_unc_lens_pos, d["J_unc_image_pos"]),
+		)
+		_, sigma_inv_do, _ = quadrature(reciprocal, (d["G_object_distance"],), (assumed_do_unc,))
+		rows = [
+			("1/di", d["L_inv_di"], d["P_unc_inv_di"], sigma_inv_di, mc["inv_di"]),
+			("1/do", d["M_inv_do"], d["S_unc_inv_do"], sigma_inv_do, mc["inv_do"]),
+		]
+		for label, nominal_value, half_range, sigma_quad, stats in rows:
+			pct = stats["percentiles"]
+			st.markdown(f"**{label} [cm⁻¹]**")
+			m1, m2, m3, m4, m5 = st.columns(5)
+			m1.metric("Range nominal", format_number(nominal_value, 6))
+			m2.metric("Range half-width", format_number(half_range, 6))
+			m3.metric("Quadrature σ", format_number(float(sigma_quad), 6))
+			m4.metric("Monte Carlo mean ± σ", f"{format_number(stats['mean'], 6)} ± {format_number(stats['std'], 3)}")
+			m5.metric("2.5th – 97.5th percentile", f"{format_number(pct[2.5], 5)} – {format_number(pct[97.5], 5)}")
+			if stats["n_invalid"]:
+				st.warning(f"{stats['n_invalid']:,} samples put the lens on the object or image and were left out.")
+		st.caption("The range half-width is a worst case, so it is usually larger than either σ. A reciprocal of an uncertain distance is skewed, so its mean differs from the nominal value.")
+
+
+# =============================
+# Phase 4 – Focal Length from Many Rows
+# =============================
+st.subheader("Focal Length from Many Rows")
+
+with st.expander("Fit 1/di = 1/f − 1/do to a whole data set"):
+	st.caption(
+		"Each row uses the workbook columns (A, B, C, D, F). Its 1/do and 1/di uncertainties are the range-method "
+		"half-widths S and P, and the assumed |Δdo| above applies to every row. The fit keeps the slope at −1 and "
+		"weights each row by 1/(P² + S²). The bootstrap refits many resampled copies of the rows to give a confidence interval for f."
+	)
+	uploaded = st.file_uploader("Upload rows as CSV (columns A, B, C, D, F)", type=["csv"], key="focal_fit_csv")
+	if uploaded is not None:
+		fit_rows = pd.read_csv(uploaded)
+		fit_rows.columns = [str(col).strip().upper() for col in fit_rows.columns]
+		missing = [col for col in "ABCDF" if col not in fit_rows.columns]
+		if missing:
+			st.error(f"The CSV is missing column(s): {', '.join(missing)}")
+			fit_rows = None
+		else:
+			st.caption(f"{len(fit_rows):,} rows loaded from {uploaded.name}.")
+	else:
+		fit_rows = st.data_editor(EXAMPLE_FIT_ROWS, num_rows="dynamic", use_container_width=True, key="focal_fit_rows")
+
+	# Nothing is fitted when the uploaded file lacks the needed columns
+	if fit_rows is not None:
+		fit_col1, fit_col2 = st.columns(2)
+		with fit_col1:
+			n_resamples = st.select_slider("Bootstrap resamples", options=[1_000, 10_000, 50_000, 100_000], value=10_000, key="focal_fit_resamples")
+		with fit_col2:
+			fit_seed = st.number_input("Seed", min_value=0, value=2025, step=1, key="focal_fit_seed")
+
+		columns = {col: pd.to_numeric(fit_rows[col], errors="coerce").to_numpy(dtype=float) for col in "ABCDF"}
+		rows = thin_lens_range(columns["A"], columns["B"], columns["C"], columns["D"], columns["F"], assumed_do_unc)
+		inv_di_rows, inv_do_rows = rows["inv_di"], rows["inv_do"]
+		fit = fit_focal_length(
+			np.ascontiguousarray(inv_do_rows.value), np.ascontiguousarray(inv_do_rows.uncertainty),
+			np.ascontiguousarray(inv_di_rows.value), np.ascontiguousarray(inv_di_rows.uncertainty),
+			int(n_resamples), int(fit_seed),
+		)
+		if not fit["ok"]:
+			st.error(fit["error"])
+		else:
+			ci_low, ci_high = fit["bootstrap_ci"]
+			f1, f2, f3, f4 = st.columns(4)
+			f1.metric("Focal length f [cm]", f"{format_number(fit['f'], 5)} ± {format_number(fit['sigma_f'], 2)}")
+			f2.metric(f"Bootstrap {fit['confidence']:.0%} interval [cm]", f"{format_number(ci_low, 5)} – {format_number(ci_high, 5)}")
+			f3.metric("χ² / dof", format_number(fit["reduced_chi2"], 3))
+			f4.metric("Free-slope fit slope", f"{format_number(fit['free_slope'], 4)} ± {format_number(fit['sigma_free_slope'], 2)}")
+			st.caption(
+				f"{fit['n_rows']:,} rows used" + (f", {fit['n_dropped']:,} dropped (blank, zero distance or zero uncertainty)" if fit["n_dropped"] else "")
+				+ ". χ²/dof well above 1 means the scatter is larger than the stated uncertainties; a free slope far from −1 points to a systematic error."
+			)
+
+			good = np.flatnonzero(np.isfinite(inv_do_rows.value) & np.isfinite(inv_di_rows.value))
+			shown = good[np.linspace(0, good.size - 1, num=min(good.size, MAX_FIT_PLOT_ROWS)).astype(int)] if good.size else good
+			x_line = np.linspace(0.0, float(np.max(inv_do_rows.value[good])) * 1.1, 50)
+			fig_fit = build_figure(
+				[
+					line_trace(
+						inv_do_rows.value[shown], inv_di_rows.value[shown], "Rows", mode="markers",
+						error_x=dict(type="data", array=inv_do_rows.uncertainty[shown].astype(np.float32)),
+						error_y=dict(type="data", array=inv_di_rows.uncertainty[shown].astype(np.float32)),
+					),
+					line_trace(x_line, fit["inv_f"] - x_line, f"Fit: 1/f = {format_number(fit['inv_f'], 4)} cm⁻¹"),
+				],
+				title="1/di versus 1/do", xaxis_title="1/do [cm⁻¹]", yaxis_title="1/di [cm⁻¹]", height=450,
+			)
+			st.plotly_chart(fig_fit, use_container_width=True)
@@ -1,6 +1,24 @@
 import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 
+# Add the lib directory to the path so we can import shared helpers
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from autodiff import quadrature
+from compute_cache import memoize
+from formula_engine import corner_signs
+from lab_calculations import SLIP_ERRORS, slip_iteration
+from lab_formulas import slip_corrected_radius, slip_corrected_viscosity
+from millikan import MILLIKAN_ERRORS, analyze_droplets, simulate_droplets
+from monte_carlo import DISTRIBUTIONS, propagate_until_stable
+from plotting import build_figure, line_trace
+
 
 st.set_page_config(page_title="04 – Slip Correction", page_icon="💨", layout="wide")
 
@@ -8,36 +26,7 @@ st.title("Slip Correction (Cunningham) with Iteration")
 st.caption("Enter physical parameters and a measured terminal speed. This tool checks your results and shows the iterative slip-correction steps.")
 
 
-def compute_radius_from_eta(eta: float, velocity: float, density_difference: float, gravity: float) -> float | None:
-    """Radius from Stokes terminal velocity with constants arranged to match the workbook.
-
-    r = sqrt( 6 * eta * v / ( (rho_oil - rho_air) * (4*g/3) ) )
-    Equivalent to the classic r = sqrt( (9/2) * eta * v / (g * density_difference) ).
-    Returns None if inputs lead to invalid domain.
-    """
-    denom = density_difference * (4.0 * gravity / 3.0)
-    if denom <= 0 or eta <= 0 or velocity <= 0:
-        return None
-    val = 6.0 * eta * velocity / denom
-    if val <= 0:
-        return None
-    return math.sqrt(val)
-
-
-def compute_cunningham_correction(knudsen_number: float, a0: float, a1: float, a2: float) -> tuple[float, float]:
-    """Return (A, C) where A = a0 + a1*exp(-a2/Kn), and C = 1 + A*Kn.
-
-    This matches the workbook structure and corresponds to a common form of the
-    Cunningham slip correction C ≈ 1 + Kn*(1.257 + 0.4*exp(-1.1/Kn)) when using
-    defaults a0=1.257, a1=0.4, a2=1.1.
-    """
-    if knudsen_number <= 0:
-        return (float("nan"), float("nan"))
-    A_val = a0 + a1 * math.exp(-a2 / knudsen_number)
-    C_val = 1.0 + A_val * knudsen_number
-    return (A_val, C_val)
-
-
+@memoize(name="slip.iterate")
 def iterate_slip_correction(
     rho_oil: float,
     rho_air: float,
@@ -57,37 +46,59 @@ def iterate_slip_correction(
 
     Note: eta_base is the uncorrected viscosity used in each division by C_i, as in the sheet formula.
     """
-    rho_diff = rho_oil - rho_air
-    if rho_diff <= 0:
-        return {
-            "ok": False,
-            "error": "density difference (oil − air) must be positive.",
-            "stages": [],
+    stage_array, num_valid, error = slip_iteration(
+        rho_oil, rho_air, gravity, velocity, eta_base, mean_free_path_m, a0, a1, a2, iterations
+    )
+    stages = [
+        {
+            "index": i,
+            "eta_in": float(stage_array["eta_in"][i]),
+            "radius": float(stage_array["radius"][i]),
+            "kn": float(stage_array["kn"][i]),
+            "A": float(stage_array["A"][i]),
+            "C": float(stage_array["C"][i]),
+            "eta_out": float(stage_array["eta_out"][i]),
         }
+        for i in range(int(num_valid))
+    ]
+    if error:
+        return {"ok": False, "error": SLIP_ERRORS[int(error)], "stages": stages}
+    return {"ok": True, "error": None, "stages": stages}
 
-    stages = []
-    eta_i = eta_base
-    for i in range(iterations):
-        r_i = compute_radius_from_eta(eta_i, velocity, rho_diff, gravity)
-        if not r_i or r_i <= 0:
-            return {"ok": False, "error": "invalid radius computed (check inputs).", "stages": stages}
-        kn_i = mean_free_path_m / r_i if r_i > 0 else float("nan")
-        A_i, C_i = compute_cunningham_correction(kn_i, a0, a1, a2)
-        if not (C_i > 0):
-            return {"ok": False, "error": "invalid Cunningham factor C (≤0).", "stages": stages}
-        eta_next = eta_base / C_i
-        stages.append({
-            "index": i,
-            "eta_in": eta_i,
-            "radius": r_i,
-            "kn": kn_i,
-            "A": A_i,
-            "C": C_i,
-            "eta_out": eta_next,
-        })
-        eta_i = eta_next
 
-    return {"ok": True, "error": None, "stages": stages}
+# Second axis choices for the sensitivity explorer: label → (argument name, unit, scale from the input to SI)
+SENSITIVITY_AXES = {
+    "Mean free path λ": ("mean_free_path_m", "nm", 1e-9),
+    "Oil density ρ_oil": ("rho_oil", "kg/m³", 1.0),
+}
+
+
+@memoize(name="slip.sensitivity_grid")
+def compute_sensitivity_grid(
+    axis: str,
+    velocities: np.ndarray,
+    axis_values: np.ndarray,
+    rho_oil: float,
+    rho_air: float,
+    gravity: float,
+    eta_base: float,
+    mean_free_path_m: float,
+    a0: float,
+    a1: float,
+    a2: float,
+    iterations: int = 5,
+):
+    """r_N and C_N over a (second axis × speed) grid from one broadcasted run of the iteration.
+
+    `axis_values` are in SI units and replace the input named by SENSITIVITY_AXES[axis].
+    """
+    inputs = {"rho_oil": rho_oil, "mean_free_path_m": mean_free_path_m}
+    inputs[SENSITIVITY_AXES[axis][0]] = np.asarray(axis_values, dtype=float)[:, np.newaxis]
+    stages, _, _ = slip_iteration(
+        inputs["rho_oil"], rho_air, gravity, np.asarray(velocities, dtype=float)[np.newaxis, :], eta_base,
+        inputs["mean_free_path_m"], a0, a1, a2, iterations,
+    )
+    return {"radius": stages["radius"][-1], "C": stages["C"][-1]}
 
 
 def is_close(student_value: float, expected_value: float, abs_tol: float = 0.002, rel_tol: float = 0.001) -> bool:
@@ -296,3 +307,218 @@ if st.session_state.show_steps_slip:
         st.markdown(f"r_N = {sN['radius']:.6g} m,  η_N = {sN['eta_out']:.6g} kg/(m·s),  Kn_N = {sN['kn']:.6g},  C_N = {sN['C']:.6g}")
 
 
+# =============================
+# Uncertainty in the Final Radius
+# =============================
+st.subheader("Uncertainty in the Final Radius")
+
+with st.expander("Range method, quadrature and Monte Carlo for r_N and η_N"):
+    st.caption(
+        "The range method runs the whole iteration at every high/low combination of the uncertain inputs. "
+        "Quadrature treats each uncertainty as a standard deviation and uses exact derivatives of r_N, "
+        "carried through every iteration stage."
+    )
+    u1, u2, u3, u4 = st.columns(4)
+    d_velocity = u1.number_input("Δv [m/s]", value=1e-06, min_value=0.0, step=1e-07, format="%.3e")
+    d_rho_oil = u2.number_input("Δρ_oil [kg/m³]", value=1.0, min_value=0.0, step=0.1, format="%.4f")
+    d_eta_base = u3.number_input("Δη [kg/(m·s)]", value=1e-07, min_value=0.0, step=1e-08, format="%.3e")
+    d_lambda_nm = u4.number_input("Δλ [nm]", value=1.0, min_value=0.0, step=0.1, format="%.4f")
+
+    def final_radius(v, rho, eta, lam):
+        return slip_corrected_radius(rho, rho_air, gravity, v, eta, lam, a0, a1, a2, int(iterations))
+
+    nominal_inputs = np.array([velocity, rho_oil, eta_base, lambda_nm * 1e-9])
+    half_widths = np.array([d_velocity, d_rho_oil, d_eta_base, d_lambda_nm * 1e-9])
+    if rho_oil - d_rho_oil <= rho_air or velocity - d_velocity <= 0 or eta_base - d_eta_base <= 0:
+        st.error("The uncertainties are larger than the values they apply to; reduce them to keep every combination physical.")
+    else:
+        # Every corner of the 4-D uncertainty box is one column of a single vectorized call
+        corners = nominal_inputs[:, np.newaxis] + corner_signs(4).T * half_widths[:, np.newaxis]
+        r_corners = final_radius(*corners)
+        r_nominal, sigma_r, contributions = quadrature(final_radius, nominal_inputs, half_widths)
+        r_high, r_low = float(np.max(r_corners)), float(np.min(r_corners))
+
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("r_N [m]", fmt(float(r_nominal), 6))
+        m2.metric("Range low – high [m]", f"{fmt(r_low, 5)} – {fmt(r_high, 5)}")
+        m3.metric("Half-range [m]", fmt((r_high - r_low) / 2.0, 5))
+        m4.metric("Quadrature σ [m]", fmt(float(sigma_r), 5))
+
+        st.dataframe(
+            pd.DataFrame({
+                "Input": ["v", "ρ_oil", "η", "λ"],
+                "|∂r_N/∂x · Δx| [m]": [fmt(float(abs(c)), 4) for c in contributions],
+                "Share of σ²": [f"{100.0 * float(c) ** 2 / float(sigma_r) ** 2:.1f}%" if sigma_r > 0 else "—" for c in contributions],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        def final_viscosity(v, rho, eta, lam):
+            return slip_corrected_viscosity(rho, rho_air, gravity, v, eta, lam, a0, a1, a2, int(iterations))
+
+        eta_nominal, sigma_eta, _ = quadrature(final_viscosity, nominal_inputs, half_widths)
+
+        st.markdown("**Monte Carlo through the iteration**")
+        st.caption(
+            "Each sample draws v, ρ_oil, η and λ, then runs the full iteration for every sample at once. "
+            "Samples are drawn in chunks of 5,000 and stop once the standard error of σ_r falls below the chosen tolerance."
+        )
+        mc1, mc2, mc3 = st.columns(3)
+        mc_distribution = mc1.radio("Input distribution", DISTRIBUTIONS, index=1, horizontal=True, key="mc_distribution_slip")
+        mc_tolerance = mc2.select_slider("Tolerance on σ_r", options=[0.02, 0.01, 0.005, 0.002, 0.001], value=0.005, format_func=lambda t: f"{100 * t:g}%", key="mc_tol_slip")
+        mc_seed = mc3.number_input("Seed", min_value=0, value=2025, step=1, key="mc_seed_slip")
+        mc = propagate_until_stable(
+            "slip",
+            tuple(float(x) for x in nominal_inputs),
+            tuple(float(x) for x in half_widths),
+            mc_distribution,
+            int(mc_seed),
+            params=(rho_air, gravity, a0, a1, a2, int(iterations)),
+            watch="r",
+            rel_tol=mc_tolerance,
+        )
+        mc_r, mc_eta = mc["outputs"]["r"], mc["outputs"]["eta"]
+
+        e1, e2, e3, e4 = st.columns(4)
+        e1.metric("Quadrature σ_η [kg/(m·s)]", fmt(float(sigma_eta), 5), help=f"η_N = {fmt(float(eta_nominal), 6)}")
+        e2.metric("Monte Carlo σ_r [m]", fmt(mc_r["std"], 5))
+        e3.metric("Monte Carlo σ_η [kg/(m·s)]", fmt(mc_eta["std"], 5))
+        e4.metric("Samples used", f"{mc['n_samples']:,}" + ("" if mc["converged"] else " (cap)"))
+
+        history = np.array(mc["sigma_history"])
+        if history.size:
+            fig_sigma = build_figure(
+                [line_trace(history[:, 0], history[:, 1], "Monte Carlo σ_r", mode="lines+markers")],
+                title="σ_r as Samples Accumulate", xaxis_title="Samples", yaxis_title="σ_r [m]", height=350,
+            )
+            fig_sigma.add_hline(y=float(sigma_r), line_color="gray", line_dash="dot", annotation_text="quadrature")
+            st.plotly_chart(fig_sigma, use_container_width=True)
+        if mc_r["n_invalid"]:
+            st.warning(f"{mc_r['n_invalid']:,} samples gave an unphysical radius and were left out.")
+        if not mc["converged"]:
+            st.info("The sample cap was reached before σ_r settled; try a looser tolerance.")
+
+
+# =============================
+# Millikan Charge Analysis
+# =============================
+st.subheader("Millikan Charge Analysis")
+
+with st.expander("From droplet speeds to the elementary charge"):
+    st.caption(
+        "Each droplet's radius comes from its fall speed through the same slip-correction iteration as above "
+        "(using the inputs at the top of the page). Its charge follows from q = m g (v_fall + v_rise) / (E v_fall) "
+        "with E = V / d. The elementary charge is the value whose whole-number multiples best match every charge."
+    )
+    plate_separation_mm = st.number_input("Plate separation d [mm]", value=7.6, min_value=0.01, step=0.1, format="%.3f")
+    source = st.radio("Droplet data", ["Synthetic class data", "Upload CSV"], horizontal=True, key="millikan_source")
+    if source == "Upload CSV":
+        uploaded = st.file_uploader("Droplets as CSV (columns v_fall, v_rise in m/s and voltage in V)", type=["csv"], key="millikan_csv")
+        if uploaded is None:
+            droplets = None
+        else:
+            droplets = pd.read_csv(uploaded)
+            droplets.columns = [str(col).strip().lower() for col in droplets.columns]
+            missing = [col for col in ("v_fall", "v_rise", "voltage") if col not in droplets.columns]
+            if missing:
+                st.error(f"Missing column(s): {', '.join(missing)}")
+                droplets = None
+    else:
+        g1, g2, g3, g4 = st.columns(4)
+        num_droplets = g1.number_input("Droplets", min_value=2, max_value=20000, value=500, step=100)
+        sim_voltage = g2.number_input("Voltage V [V]", min_value=1.0, value=500.0, step=10.0)
+        noise_pct = g3.number_input("Speed noise [%]", min_value=0.0, max_value=20.0, value=1.0, step=0.5)
+        sim_seed = g4.number_input("Seed", min_value=0, value=0, step=1)
+        v_fall_sim, v_rise_sim, voltage_sim = simulate_droplets(
+            int(num_droplets), int(sim_seed), sim_voltage, plate_separation_mm * 1e-3,
+            rho_oil, rho_air, gravity, eta_base, lambda_nm * 1e-9, a0, a1, a2, noise_fraction=noise_pct / 100.0,
+        )
+        droplets = pd.DataFrame({"v_fall": v_fall_sim, "v_rise": v_rise_sim, "voltage": voltage_sim})
+
+    if droplets is not None:
+        analysis = analyze_droplets(
+            pd.to_numeric(droplets["v_fall"], errors="coerce").to_numpy(dtype=float),
+            pd.to_numeric(droplets["v_rise"], errors="coerce").to_numpy(dtype=float),
+            pd.to_numeric(droplets["voltage"], errors="coerce").to_numpy(dtype=float),
+            plate_separation_mm * 1e-3,
+            rho_oil, rho_air, gravity, eta_base, lambda_nm * 1e-9, a0, a1, a2, int(iterations),
+        )
+        codes, counts = np.unique(analysis["error_code"][analysis["error_code"] > 0], return_counts=True)
+        for code, count in zip(codes, counts):
+            st.warning(f"{int(count)} droplet(s) skipped: {MILLIKAN_ERRORS[int(code)]}")
+
+        fit = analysis["fit"]
+        if not fit["ok"]:
+            st.error(fit["error"])
+        else:
+            k1, k2, k3 = st.columns(3)
+            k1.metric("Elementary charge e [C]", f"{fmt(fit['e'], 6)} ± {fmt(fit['sigma_e'], 2)}")
+            k2.metric("Droplets used", f"{fit['n_droplets']:,}")
+            k3.metric("Scan minimum [C]", fmt(fit["e_scan"], 5))
+
+            plot_q, plot_scan = st.columns(2)
+            with plot_q:
+                fig_q = go.Figure(
+                    data=[go.Histogram(x=(fit["charges"] / fit["e"]).astype(np.float32), nbinsx=200, name="Droplets")],
+                    layout=go.Layout(title="Charges in Units of the Fitted e", xaxis_title="q / e", yaxis_title="Droplets", height=400, template="plotly_white"),
+                )
+                st.plotly_chart(fig_q, use_container_width=True)
+            with plot_scan:
+                fig_scan = build_figure(
+                    [line_trace(fit["candidates"], fit["residuals"], "Residual")],
+                    title="Quantization Scan", xaxis_title="Candidate e [C]", yaxis_title="Mean squared distance from a whole multiple", height=400,
+                )
+                fig_scan.add_vline(x=fit["e"], line_color="gray", line_dash="dot")
+                st.plotly_chart(fig_scan, use_container_width=True)
+            st.caption("Peaks of the histogram at whole numbers show the charges are quantized; the deepest dip of the scan is the elementary charge.")
+
+
+# =============================
+# Sensitivity Explorer
+# =============================
+st.subheader("Sensitivity Explorer")
+
+with st.expander("How r_N and C respond to the terminal speed and λ or ρ_oil"):
+    st.caption(
+        "The whole grid is computed in one pass of the iteration, using the other inputs at the top of the page, "
+        "and is reused while you pan and zoom. Contour lines join points with the same value."
+    )
+    sx1, sx2, sx3 = st.columns(3)
+    axis_label = sx1.selectbox("Second axis", list(SENSITIVITY_AXES), key="sens_axis")
+    speed_factor = sx2.slider("Speed range (× your v)", min_value=0.1, max_value=5.0, value=(0.25, 4.0), step=0.05, key="sens_speed_range")
+    axis_factor = sx3.slider("Second-axis range (× your value)", min_value=0.1, max_value=3.0, value=(0.5, 2.0), step=0.05, key="sens_axis_range")
+    resolution = st.select_slider("Grid points per axis", options=[50, 100, 200, 400], value=100, key="sens_resolution")
+
+    axis_name, axis_unit, axis_scale = SENSITIVITY_AXES[axis_label]
+    axis_nominal = lambda_nm if axis_name == "mean_free_path_m" else rho_oil
+    speeds = np.linspace(speed_factor[0] * velocity, speed_factor[1] * velocity, int(resolution))
+    axis_display = np.linspace(axis_factor[0] * axis_nominal, axis_factor[1] * axis_nominal, int(resolution))
+    if axis_name == "rho_oil" and axis_display[0] <= rho_air:
+        st.error("The oil density range must stay above the air density; narrow the second-axis range.")
+    elif velocity <= 0:
+        st.error("Enter a positive terminal speed to explore around it.")
+    else:
+        grid = compute_sensitivity_grid(
+            axis_label, speeds, axis_display * axis_scale,
+            rho_oil, rho_air, gravity, eta_base, lambda_nm * 1e-9, a0, a1, a2, int(iterations),
+        )
+        heat_r, heat_c = st.columns(2)
+        for column, key, title, bar_title in (
+            (heat_r, "radius", "Final Radius r_N [µm]", "r_N [µm]"),
+            (heat_c, "C", "Cunningham Factor C", "C"),
+        ):
+            z = (grid[key] * (1e6 if key == "radius" else 1.0)).astype(np.float32)
+            x = speeds.astype(np.float32)
+            y = axis_display.astype(np.float32)
+            fig = go.Figure(
+                data=[
+                    go.Heatmap(x=x, y=y, z=z, colorscale="Viridis", colorbar=dict(title=bar_title)),
+                    go.Contour(x=x, y=y, z=z, contours_coloring="lines", line=dict(color="white", width=1), showscale=False, contours=dict(showlabels=True)),
+                    go.Scatter(x=[velocity], y=[axis_nominal], mode="markers", marker=dict(color="red", size=9, symbol="x"), name="Your inputs"),
+                ],
+                layout=go.Layout(title=title, xaxis_title="Terminal speed v [m/s]", yaxis_title=f"{axis_label} [{axis_unit}]", height=450, template="plotly_white"),
+            )
+            with column:
+                st.plotly_chart(fig, use_container_width=True)
+        st.caption("Slow drops are small, so λ / r is large and the correction C grows; that is where the slip correction matters most.")
@@ -1,42 +1,48 @@
-import math
-from typing import Tuple
+import os
+import sys
 
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
-st.set_page_config(page_title="Projectile Motion", page_icon="🏹")
-
+# Add the lib directory to the path so we can import shared helpers
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lib'))
 
-def compute_projectile_trajectory(
-    initial_speed_m_per_s: float,
-    launch_angle_deg: float,
-    initial_height_m: float,
-    gravity_m_per_s2: float,
-    num_points: int = 400,
-) -> Tuple[np.ndarray, np.ndarray, float, float, float]:
-    """
-    Compute 2D projectile motion (no air resistance) from analytic solution.
+from plotting import DEFAULT_MAX_POINTS_PER_TRACE, build_figure, decimate_trace, line_trace
+from projectile import (
+    compute_drag_trajectory,
+    compute_projectile_trajectory,
+    compute_sweep_grid,
+    flight_metrics,
+    generate_target_problems,
+    optimal_launch_angle,
+    simulate_drag_batch,
+    solve_launch_angles,
+    solve_launch_angles_drag,
+    solve_launch_speed,
+    solve_launch_speed_drag,
+)
 
-    Returns x(t), y(t), t_flight, x_range, y_max.
-    """
-    theta = math.radians(launch_angle_deg)
-    v0x = initial_speed_m_per_s * math.cos(theta)
-    v0y = initial_speed_m_per_s * math.sin(theta)
+st.set_page_config(page_title="Projectile Motion", page_icon="🏹")
 
-    # Time of flight (for y=0 landing), allowing nonzero initial height
-    disc = v0y ** 2 + 2.0 * gravity_m_per_s2 * max(initial_height_m, 0.0)
-    t_flight = (v0y + math.sqrt(disc)) / gravity_m_per_s2 if gravity_m_per_s2 > 0 else 0.0
-    t = np.linspace(0.0, t_flight, num=max(num_points, 2))
+# Cap on points per plotted trace (edit to trade payload size for detail)
+MAX_PLOT_POINTS = DEFAULT_MAX_POINTS_PER_TRACE
+MAX_HEATMAP_POINTS_PER_AXIS = 250
+# Launch angles in the range-versus-angle comparison (0° to 90° in 0.5° steps)
+ANGLE_SCAN_POINTS = 181
 
-    x = v0x * t
-    y = initial_height_m + v0y * t - 0.5 * gravity_m_per_s2 * t ** 2
+DRAG_LABELS = {
+    "None": "none",
+    "Linear (F ∝ v)": "linear",
+    "Quadratic (F ∝ v²)": "quadratic",
+}
 
-    # Range and max height
-    x_range = v0x * t_flight
-    t_peak = v0y / gravity_m_per_s2 if gravity_m_per_s2 > 0 else 0.0
-    y_max = initial_height_m + v0y * t_peak - 0.5 * gravity_m_per_s2 * t_peak ** 2
-    return x, y, t_flight, x_range, y_max
+SWEEP_QUANTITIES = {
+    "Horizontal range": ("x_range", "m"),
+    "Time of flight": ("t_flight", "s"),
+    "Maximum height": ("y_max", "m"),
+}
 
 
 st.title("Projectile Motion")
@@ -48,30 +54,208 @@ Adjust the parameters and observe how the trajectory, range, and flight time cha
 )
 
 with st.sidebar:
+    mode = st.radio("Mode", ["Single launch", "Parameter sweep", "Hit the target"])
+
     st.header("Parameters")
     v0 = st.slider("Initial speed v₀ (m/s)", min_value=1.0, max_value=60.0, value=20.0, step=0.5)
     angle = st.slider("Launch angle θ (degrees)", min_value=0.0, max_value=90.0, value=35.0, step=0.5)
     h0 = st.slider("Initial height h₀ (m)", min_value=0.0, max_value=10.0, value=0.0, step=0.1)
     g = st.slider("Gravity g (m/s²)", min_value=1.0, max_value=20.0, value=9.81, step=0.01)
 
-x, y, t_f, x_range, y_max = compute_projectile_trajectory(v0, angle, h0, g)
+    if mode in ("Single launch", "Hit the target"):
+        st.header("Air Resistance")
+        drag_label = st.selectbox("Drag model", list(DRAG_LABELS.keys()), index=0)
+        drag_mode = DRAG_LABELS[drag_label]
+        if drag_mode == "linear":
+            drag_per_mass = st.slider("Drag b/m (1/s)", min_value=0.0, max_value=2.0, value=0.2, step=0.01)
+        elif drag_mode == "quadratic":
+            drag_per_mass = st.slider("Drag k/m (1/m)", min_value=0.0, max_value=0.1, value=0.01, step=0.001, format="%.3f")
+        else:
+            drag_per_mass = 0.0
+    if mode == "Hit the target":
+        st.header("Target")
+        target_x = st.slider("Target distance x (m)", min_value=0.5, max_value=100.0, value=25.0, step=0.5)
+        target_y = st.slider("Target height y (m)", min_value=0.0, max_value=20.0, value=2.0, step=0.1)
+        solve_for = st.radio("Solve for", ["Launch angle (given v₀)", "Launch speed (given θ)"])
+    elif mode == "Parameter sweep":
+        st.header("Sweep")
+        sweep_label = st.radio("Grid", ["Speed v₀ × angle θ", "Height h₀ × angle θ"])
+        sweep_quantity = st.selectbox("Show", list(SWEEP_QUANTITIES.keys()))
+        sweep_resolution = st.select_slider("Grid points per axis", options=[100, 200, 400, 700, 1000], value=400)
 
-fig = go.Figure()
-fig.add_trace(go.Scatter(x=x, y=y, mode="lines", name="Trajectory"))
-fig.add_hline(y=0.0, line_color="gray", line_dash="dot")
-fig.update_layout(
-    xaxis_title="x (m)", yaxis_title="y (m)",
-    title="Projectile Trajectory",
-    height=500,
-    template="plotly_white",
-)
+if mode == "Single launch":
+    x, y, t_f, x_range, y_max = compute_projectile_trajectory(v0, angle, h0, g)
+    with_drag = drag_mode != "none" and drag_per_mass > 0
+    if with_drag:
+        xd, yd, t_fd, x_range_d, y_max_d = compute_drag_trajectory(v0, angle, h0, g, drag_mode, drag_per_mass)
+
+    # Full-resolution arrays feed the metrics; only a decimated copy is sent to the browser
+    x_plot, y_plot = decimate_trace(x, y, MAX_PLOT_POINTS)
+    traces = [line_trace(x_plot, y_plot, "No drag" if with_drag else "Trajectory")]
+    if with_drag:
+        xd_plot, yd_plot = decimate_trace(xd, yd, MAX_PLOT_POINTS)
+        traces.append(line_trace(xd_plot, yd_plot, f"With drag ({drag_label})"))
+
+    fig = build_figure(
+        traces,
+        title="Projectile Trajectory", xaxis_title="x (m)", yaxis_title="y (m)",
+    )
+    fig.add_hline(y=0.0, line_color="gray", line_dash="dot")
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    if with_drag:
+        col_nd, col_d = st.columns(2)
+        with col_nd:
+            st.markdown("**No drag**")
+            st.metric("Time of flight", f"{t_f:.2f} s")
+            st.metric("Horizontal range", f"{x_range:.2f} m")
+            st.metric("Maximum height", f"{y_max:.2f} m")
+        with col_d:
+            st.markdown(f"**With drag** ({drag_label})")
+            st.metric("Time of flight", f"{t_fd:.2f} s", delta=f"{t_fd - t_f:+.2f} s", delta_color="off")
+            st.metric("Horizontal range", f"{x_range_d:.2f} m", delta=f"{x_range_d - x_range:+.2f} m", delta_color="off")
+            st.metric("Maximum height", f"{y_max_d:.2f} m", delta=f"{y_max_d - y_max:+.2f} m", delta_color="off")
+
+        # Every angle is flown at once by the batch RK4 solver
+        scan_angles = np.linspace(0.0, 90.0, ANGLE_SCAN_POINTS)
+        _, scan_range, _ = flight_metrics(v0, scan_angles, h0, g)
+        scan_range_d = simulate_drag_batch(v0, scan_angles, h0, g, drag_mode, drag_per_mass)["x_range"]
+        best_angle, best_angle_d = scan_angles[np.argmax(scan_range)], scan_angles[np.argmax(scan_range_d)]
+        fig_scan = build_figure(
+            [line_trace(scan_angles, scan_range, "No drag"), line_trace(scan_angles, scan_range_d, f"With drag ({drag_label})")],
+            title="Range vs Launch Angle", xaxis_title="θ (deg)", yaxis_title="Horizontal range (m)", height=350,
+        )
+        fig_scan.add_vline(x=angle, line_color="gray", line_dash="dot", annotation_text="current θ")
+        st.plotly_chart(fig_scan, use_container_width=True)
+        st.caption(
+            f"At v₀ = {v0:.1f} m/s the longest range comes at θ ≈ {best_angle:.1f}° without drag "
+            f"and θ ≈ {best_angle_d:.1f}° with drag: drag favours flatter launches."
+        )
+    else:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Time of flight", f"{t_f:.2f} s")
+        col2.metric("Horizontal range", f"{x_range:.2f} m")
+        col3.metric("Maximum height", f"{y_max:.2f} m")
+elif mode == "Parameter sweep":
+    st.subheader("Parameter Sweep")
+    st.caption("Every cell of the grid is a separate launch (no drag). The dashed line marks the launch angle with the longest range.")
+    if sweep_label == "Speed v₀ × angle θ":
+        grid = compute_sweep_grid("v0_theta", h0, g, sweep_resolution)
+        x_title = "v₀ (m/s)"
+        st.markdown(f"Launch height fixed at h₀ = {h0:.1f} m (set in the sidebar).")
+    else:
+        grid = compute_sweep_grid("theta_h0", v0, g, sweep_resolution)
+        x_title = "h₀ (m)"
+        st.markdown(f"Initial speed fixed at v₀ = {v0:.1f} m/s (set in the sidebar).")
+
+    # The full grid feeds the metrics; the heatmap is strided to keep the browser payload small
+    quantity_key, quantity_unit = SWEEP_QUANTITIES[sweep_quantity]
+    stride = -(-sweep_resolution // MAX_HEATMAP_POINTS_PER_AXIS)
+    z = grid[quantity_key][::stride, ::stride].astype(np.float32)
+    x_axis = grid["x_axis"][::stride].astype(np.float32)
+    theta_axis = grid["theta_axis"][::stride].astype(np.float32)
+
+    fig = build_figure(
+        [
+            # One trace carries both the colour fill and the labelled contour lines, so z is sent once
+            go.Contour(
+                x=x_axis, y=theta_axis, z=z,
+                colorscale="Viridis", colorbar=dict(title=quantity_unit),
+                contours=dict(coloring="heatmap", showlabels=True),
+                line=dict(color="white", width=1),
+                name=sweep_quantity,
+            ),
+            line_trace(
+                grid["x_axis"], grid["theta_opt"], "Optimal angle θ*",
+                line=dict(color="red", dash="dash", width=2),
+            ),
+        ],
+        title=f"{sweep_quantity} across the sweep", xaxis_title=x_title, yaxis_title="θ (degrees)",
+    )
+    fig.update_layout(legend=dict(orientation="h", y=-0.15))
+    st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Grid cells", f"{grid[quantity_key].size:,}")
+    col2.metric("Largest range on grid", f"{float(np.max(grid['x_range'])):.2f} m")
+    col3.metric("θ* at the current sidebar values", f"{float(optimal_launch_angle(v0, h0, g)[0]):.2f}°")
+else:
+    st.subheader("Hit the Target")
+    with_drag = drag_mode != "none" and drag_per_mass > 0
+    if solve_for == "Launch angle (given v₀)":
+        if with_drag:
+            theta_low, theta_high = solve_launch_angles_drag(v0, target_x, target_y, h0, g, drag_mode, drag_per_mass)
+        else:
+            theta_low, theta_high = solve_launch_angles(v0, target_x, target_y, h0, g)
+        solutions = [(v0, float(theta)) for theta in np.unique(np.round([theta_low, theta_high], 6)) if np.isfinite(theta)]
+    else:
+        if with_drag:
+            speed = solve_launch_speed_drag(angle, target_x, target_y, h0, g, drag_mode, drag_per_mass)
+        else:
+            speed = solve_launch_speed(angle, target_x, target_y, h0, g)
+        solutions = [(float(speed), angle)] if np.isfinite(speed) else []
+
+    traces = []
+    for speed_i, theta_i in solutions:
+        xs, ys, _, _, _ = compute_drag_trajectory(speed_i, theta_i, h0, g, drag_mode, drag_per_mass)
+        xs_plot, ys_plot = decimate_trace(xs, ys, MAX_PLOT_POINTS)
+        traces.append(line_trace(xs_plot, ys_plot, f"v₀ = {speed_i:.2f} m/s, θ = {theta_i:.2f}°"))
+    traces.append(go.Scatter(
+        x=[target_x], y=[target_y], mode="markers", name="Target",
+        marker=dict(symbol="x", size=14, color="red"),
+    ))
+    fig = build_figure(traces, title="Launches Through the Target", xaxis_title="x (m)", yaxis_title="y (m)")
+    fig.add_hline(y=0.0, line_color="gray", line_dash="dot")
+    st.plotly_chart(fig, use_container_width=True)
 
-st.plotly_chart(fig, use_container_width=True)
+    if not solutions:
+        st.warning("The target cannot be reached with these settings. Try a larger speed or a different angle.")
+    else:
+        cols = st.columns(len(solutions))
+        for col, (speed_i, theta_i) in zip(cols, solutions):
+            if solve_for == "Launch angle (given v₀)":
+                col.metric("Launch angle", f"{theta_i:.2f}°")
+            else:
+                col.metric("Launch speed", f"{speed_i:.2f} m/s")
 
-col1, col2, col3 = st.columns(3)
-col1.metric("Time of flight", f"{t_f:.2f} s")
-col2.metric("Horizontal range", f"{x_range:.2f} m")
-col3.metric("Maximum height", f"{y_max:.2f} m")
+    with st.expander("Answer key generator (instructors)"):
+        st.caption(
+            "Generates randomized targets, one per student, with every launch angle that hits each target. "
+            "The sidebar's launch height, gravity and drag settings apply. The same seed always gives the same problem set."
+        )
+        col_n, col_seed = st.columns(2)
+        num_problems = col_n.number_input("Number of problems", min_value=1, max_value=10000, value=100, step=10)
+        seed = col_seed.number_input("Random seed", min_value=0, value=2025, step=1)
+        params = (int(num_problems), int(seed), g, h0, drag_mode, drag_per_mass)
+        # Generated only on request; under heavy drag each problem needs several drag solves
+        if st.button("Generate problems", key="target_generate"):
+            try:
+                with st.spinner("Generating problems…"):
+                    st.session_state.target_problems = generate_target_problems(*params)
+                st.session_state.target_problems_key = params
+            except ValueError as exc:
+                st.session_state.pop("target_problems_key", None)
+                st.error(f"Could not generate the problems: {exc}")
+        if st.session_state.get("target_problems_key") == params:
+            problems = st.session_state.target_problems
+            key_df = pd.DataFrame({
+                "Problem": problems["problem"],
+                "v₀ (m/s)": problems["v0"].round(2),
+                "Target x (m)": problems["target_x"].round(2),
+                "Target y (m)": problems["target_y"].round(2),
+                "θ low (deg)": problems["theta_low"].round(2),
+                "θ high (deg)": problems["theta_high"].round(2),
+            })
+            st.dataframe(key_df, use_container_width=True, hide_index=True)
+            st.download_button(
+                "📥 Download answer key (CSV)",
+                key_df.to_csv(index=False).encode("utf-8"),
+                file_name=f"projectile_targets_seed{int(seed)}.csv",
+                mime="text/csv",
+            )
+        elif "target_problems_key" in st.session_state:
+            st.caption("The settings have changed; press Generate problems for a new answer key.")
 
 # Mark completion
 if st.button("Mark this module complete"):
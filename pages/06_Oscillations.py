@@ -1,87 +1,213 @@
 import math
-from typing import Tuple
+import os
+import sys
 
 import numpy as np
-import plotly.graph_objects as go
 import streamlit as st
 
-st.set_page_config(page_title="Oscillations", page_icon="🪗")
-
-
-def compute_damped_oscillation(
-    mass_kg: float,
-    spring_constant_n_per_m: float,
-    damping_coefficient_kg_per_s: float,
-    amplitude_m: float,
-    phase_rad: float,
-    duration_s: float,
-    num_points: int = 1200,
-) -> Tuple[np.ndarray, np.ndarray]:
-    """
-    Compute x(t) for a damped mass–spring system with analytic solution.
-
-    x(t) = A e^{-γ t} cos(ω_d t + φ),
-      γ = c / (2m),  ω_0 = sqrt(k/m),  ω_d = sqrt(ω_0^2 - γ^2) for underdamped.
+# Add the lib directory to the path so we can import shared helpers
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from oscillator import (
+    compute_damped_oscillation,
+    compute_damping_family,
+    compute_driven_response,
+    compute_resonance_curves,
+    damping_regime,
+    quality_factor,
+    steady_state_response,
+)
+from pendulum import (
+    compute_pendulum_motion,
+    compute_period_table,
+    measured_period,
+    period_ratio,
+    small_angle_period,
+)
+from plotting import DEFAULT_MAX_POINTS_PER_TRACE, build_figure, decimate_trace, line_trace
 
-    If overdamped/critical, falls back to a numerically stable envelope using real ω_d = 0.
-    """
-    gamma = damping_coefficient_kg_per_s / (2.0 * max(mass_kg, 1e-9))
-    omega0 = math.sqrt(max(spring_constant_n_per_m, 0.0) / max(mass_kg, 1e-9))
-    under = omega0 ** 2 - gamma ** 2
-    omega_d = math.sqrt(under) if under > 0 else 0.0
+st.set_page_config(page_title="Oscillations", page_icon="🪗")
 
-    t = np.linspace(0.0, max(duration_s, 0.01), num=max(num_points, 2))
-    envelope = np.exp(-gamma * t)
+# Cap on points per plotted trace (edit to trade payload size for detail)
+MAX_PLOT_POINTS = DEFAULT_MAX_POINTS_PER_TRACE
 
-    if omega_d > 0:
-        x = amplitude_m * envelope * np.cos(omega_d * t + phase_rad)
-    else:
-        # Critically damped or overdamped: show non-oscillatory decay using cosine term frozen at phase
-        x = amplitude_m * envelope * np.cos(phase_rad)
-    return t, x
+DAMPING_FAMILY_OPTIONS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0]
+RESONANCE_COMPARE_OPTIONS = [0.1, 0.2, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0]
+# Top of the drive-frequency slider [rad/s]; the resonance curves always reach past it
+MAX_DRIVE_FREQUENCY = 30.0
 
 
-st.title("Oscillations (Mass–Spring–Damper)")
+st.title("Oscillations (Mass–Spring–Damper and Pendulum)")
 
 st.markdown(
     """
 Explore how mass m, spring constant k, and damping c affect a mass–spring system.
+In pendulum mode, release a pendulum from any angle up to 179° and see how far its period
+departs from the small-angle formula T₀ = 2π√(L/g).
     """
 )
 
 with st.sidebar:
+    mode = st.radio("Mode", ["Free oscillation", "Driven oscillation", "Pendulum (large amplitude)"], horizontal=True)
+
     st.header("Parameters")
-    m = st.slider("Mass m (kg)", min_value=0.1, max_value=5.0, value=1.0, step=0.1)
-    k = st.slider("Spring constant k (N/m)", min_value=1.0, max_value=200.0, value=50.0, step=1.0)
-    c = st.slider("Damping c (kg/s)", min_value=0.0, max_value=10.0, value=0.5, step=0.1)
-    A = st.slider("Amplitude A (m)", min_value=0.0, max_value=1.0, value=0.2, step=0.01)
-    phi = st.slider("Phase φ (deg)", min_value=0.0, max_value=360.0, value=0.0, step=1.0)
-    T = st.slider("Duration (s)", min_value=1.0, max_value=30.0, value=10.0, step=0.5)
-
-phi_rad = math.radians(phi)
-
-t, x = compute_damped_oscillation(m, k, c, A, phi_rad, T)
-
-omega0 = math.sqrt(k / m)
-gamma = c / (2.0 * m)
-under = omega0 ** 2 - gamma ** 2
-omega_d = math.sqrt(under) if under > 0 else 0.0
-
-fig = go.Figure()
-fig.add_trace(go.Scatter(x=t, y=x, mode="lines", name="x(t)"))
-fig.update_layout(
-    xaxis_title="t (s)", yaxis_title="x (m)",
-    title="Damped Oscillation",
-    height=500,
-    template="plotly_white",
-)
+    if mode == "Pendulum (large amplitude)":
+        L = st.slider("Length L (m)", min_value=0.1, max_value=5.0, value=1.0, step=0.05)
+        g = st.slider("Gravity g (m/s²)", min_value=1.0, max_value=20.0, value=9.81, step=0.01)
+        theta0 = st.slider("Release angle θ₀ (deg)", min_value=1.0, max_value=179.0, value=60.0, step=1.0)
+        T = st.slider("Duration (s)", min_value=1.0, max_value=60.0, value=10.0, step=0.5)
+    else:
+        m = st.slider("Mass m (kg)", min_value=0.1, max_value=5.0, value=1.0, step=0.1)
+        k = st.slider("Spring constant k (N/m)", min_value=1.0, max_value=200.0, value=50.0, step=1.0)
+        c = st.slider("Damping c (kg/s)", min_value=0.0, max_value=10.0, value=0.5, step=0.1)
+    if mode == "Free oscillation":
+        A = st.slider("Amplitude A (m)", min_value=0.0, max_value=1.0, value=0.2, step=0.01)
+        phi = st.slider("Phase φ (deg)", min_value=0.0, max_value=360.0, value=0.0, step=1.0)
+        T = st.slider("Duration (s)", min_value=1.0, max_value=30.0, value=10.0, step=0.5)
+        family = st.multiselect(
+            "Overlay damping ratios ζ = c / (2√(km))",
+            DAMPING_FAMILY_OPTIONS,
+            default=[],
+            help="Each selected ζ is drawn with the same m, k, A and φ; ζ = 1 is critical damping.",
+        )
+    elif mode == "Driven oscillation":
+        F0 = st.slider("Drive amplitude F₀ (N)", min_value=0.0, max_value=10.0, value=1.0, step=0.1)
+        omega_drive = st.slider("Drive frequency ω (rad/s)", min_value=0.1, max_value=MAX_DRIVE_FREQUENCY, value=7.0, step=0.05)
+        T = st.slider("Duration (s)", min_value=1.0, max_value=60.0, value=20.0, step=0.5)
+        compare = st.multiselect(
+            "Compare damping values c (kg/s)",
+            RESONANCE_COMPARE_OPTIONS,
+            default=[0.2, 1.0, 3.0],
+            help="Resonance curves for these damping values are drawn next to the current c.",
+        )
+
+if mode == "Free oscillation":
+    phi_rad = math.radians(phi)
+
+    t, x = compute_damped_oscillation(m, k, c, A, phi_rad, T)
+
+    omega0 = math.sqrt(k / m)
+    gamma = c / (2.0 * m)
+    under = omega0 ** 2 - gamma ** 2
+    omega_d = math.sqrt(under) if under > 0 else 0.0
+
+    # Full-resolution arrays feed the metrics; only a decimated copy is sent to the browser
+    t_plot, x_plot = decimate_trace(t, x, MAX_PLOT_POINTS)
+    traces = [line_trace(t_plot, x_plot, f"x(t), c = {c:.2f} kg/s")]
+
+    if family:
+        # The whole family is evaluated in one broadcast call on a shared time grid
+        t_family, c_family, x_family = compute_damping_family(m, k, tuple(sorted(family)), A, phi_rad, T)
+        for zeta_i, c_i, x_i in zip(sorted(family), c_family, x_family):
+            t_i, x_i_plot = decimate_trace(t_family, x_i, MAX_PLOT_POINTS)
+            traces.append(line_trace(t_i, x_i_plot, f"ζ = {zeta_i:g} (c = {c_i:.2f} kg/s)", line=dict(dash="dot")))
 
-st.plotly_chart(fig, use_container_width=True)
+    fig = build_figure(
+        traces,
+        title="Damped Oscillation", xaxis_title="t (s)", yaxis_title="x (m)",
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("ω₀ (rad/s)", f"{omega0:.2f}")
+    col2.metric("γ (1/s)", f"{gamma:.2f}")
+    col3.metric("ω_d (rad/s)", f"{omega_d:.2f}")
+    st.caption(f"Regime: **{damping_regime(m, k, c)}** (critical damping at c = 2√(km) = {2.0 * math.sqrt(k * m):.2f} kg/s)")
+
+elif mode == "Driven oscillation":
+    omega0 = math.sqrt(k / m)
+    gamma = c / (2.0 * m)
+    damping_values = tuple(sorted({c, *compare}))
+    # The frequency axis depends only on ω₀ and the slider's fixed top, never on ω_drive,
+    # so the resonance curves stay cached while the drive-frequency slider moves
+    omega_max = max(3.0 * omega0, 1.2 * MAX_DRIVE_FREQUENCY)
+
+    omega_grid, amp_grid, phase_grid = compute_resonance_curves(m, k, damping_values, F0, omega_max)
+    amp_now, phase_now = steady_state_response(m, k, c, F0, omega_drive)
+
+    amp_traces = []
+    phase_traces = []
+    for c_i, amp_i, phase_i in zip(damping_values, amp_grid, phase_grid):
+        style = dict() if c_i == c else dict(dash="dot")
+        label = f"c = {c_i:g} kg/s (Q = {quality_factor(m, k, c_i):.1f})"
+        w_plot, a_plot = decimate_trace(omega_grid, amp_i, MAX_PLOT_POINTS)
+        amp_traces.append(line_trace(w_plot, a_plot, label, line=style))
+        w_plot, p_plot = decimate_trace(omega_grid, np.degrees(phase_i), MAX_PLOT_POINTS)
+        phase_traces.append(line_trace(w_plot, p_plot, label, line=style))
+
+    col_amp, col_phase = st.columns(2)
+    with col_amp:
+        fig_amp = build_figure(
+            amp_traces,
+            title="Steady-State Amplitude", xaxis_title="ω (rad/s)", yaxis_title="A (m)", height=400,
+        )
+        fig_amp.add_vline(x=omega_drive, line_color="gray", line_dash="dash")
+        st.plotly_chart(fig_amp, use_container_width=True)
+    with col_phase:
+        fig_phase = build_figure(
+            phase_traces,
+            title="Phase Lag", xaxis_title="ω (rad/s)", yaxis_title="δ (degrees)", height=400,
+        )
+        fig_phase.add_vline(x=omega_drive, line_color="gray", line_dash="dash")
+        st.plotly_chart(fig_phase, use_container_width=True)
+
+    t, x, x_steady = compute_driven_response(m, k, c, F0, omega_drive, 0.0, 0.0, T)
+    t_plot, x_plot = decimate_trace(t, x, MAX_PLOT_POINTS)
+    t_plot_s, x_plot_s = decimate_trace(t, x_steady, MAX_PLOT_POINTS)
+    fig = build_figure(
+        [
+            line_trace(t_plot, x_plot, "x(t) from rest"),
+            line_trace(t_plot_s, x_plot_s, "Steady state", line=dict(dash="dot")),
+        ],
+        title="Driven Response (transient + steady state)", xaxis_title="t (s)", yaxis_title="x (m)",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("ω₀ (rad/s)", f"{omega0:.2f}")
+    col2.metric("Q factor", f"{quality_factor(m, k, c):.2f}")
+    col3.metric("Steady amplitude (m)", f"{float(amp_now):.4g}")
+    col4.metric("Phase lag δ (deg)", f"{math.degrees(float(phase_now)):.1f}")
+    if omega0 ** 2 > 2.0 * gamma ** 2:
+        st.caption(f"Amplitude peaks at ω_r = √(ω₀² − 2γ²) = {math.sqrt(omega0 ** 2 - 2.0 * gamma ** 2):.2f} rad/s; the transient decays as e^(−γt) with γ = {gamma:.2f} 1/s.")
+    else:
+        st.caption("Damping is too large for a resonance peak (2γ² ≥ ω₀²): the amplitude falls off from ω = 0.")
+
+else:
+    st.markdown("A pendulum obeys θ'' = −(g/L) sin θ. For small θ, sin θ ≈ θ gives simple harmonic motion; at large release angles the swing is slower.")
+
+    t, theta_nl, theta_small = compute_pendulum_motion(L, g, theta0, T)
+    t_plot, nl_plot = decimate_trace(t, theta_nl, MAX_PLOT_POINTS)
+    t_plot_s, small_plot = decimate_trace(t, theta_small, MAX_PLOT_POINTS)
+    fig = build_figure(
+        [
+            line_trace(t_plot, nl_plot, "Nonlinear (numerical)"),
+            line_trace(t_plot_s, small_plot, "Small-angle approximation", line=dict(dash="dot")),
+        ],
+        title="Pendulum Angle", xaxis_title="t (s)", yaxis_title="θ (degrees)",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # The elliptic-integral table is built once per process; this plot only reads it
+    amp_table, ratio_table = compute_period_table()
+    T0 = small_angle_period(L, g)
+    ratio_now = float(period_ratio(theta0))
+    a_plot, r_plot = decimate_trace(amp_table, ratio_table, MAX_PLOT_POINTS)
+    fig_period = build_figure(
+        [line_trace(a_plot, r_plot, "Exact T/T₀ = (2/π) K(sin²(θ₀/2))")],
+        title="Period versus Amplitude", xaxis_title="θ₀ (degrees)", yaxis_title="T / T₀", height=400,
+    )
+    fig_period.add_vline(x=theta0, line_color="gray", line_dash="dash")
+    st.plotly_chart(fig_period, use_container_width=True)
 
-col1, col2, col3 = st.columns(3)
-col1.metric("ω₀ (rad/s)", f"{omega0:.2f}")
-col2.metric("γ (1/s)", f"{gamma:.2f}")
-col3.metric("ω_d (rad/s)", f"{omega_d:.2f}")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Small-angle period T₀ (s)", f"{T0:.4f}")
+    col2.metric("Exact period T (s)", f"{ratio_now * T0:.4f}", delta=f"{100.0 * (ratio_now - 1.0):+.2f}%", delta_color="off")
+    T_sim = measured_period(t, theta_nl)
+    col3.metric("Period from simulation (s)", f"{T_sim:.4f}" if math.isfinite(T_sim) else "—")
+    if not math.isfinite(T_sim):
+        st.caption("Increase the duration to see at least one full swing in the simulation.")
 
 # Quick prompts
 st.divider()
@@ -89,7 +215,9 @@ with st.expander("Checks for understanding"):
     st.markdown(
         "- How does increasing damping c affect ω_d and the envelope?\n"
         "- What happens as c approaches the critical value 2√(km)?\n"
-        "- How do m and k change ω₀ and the period?"
+        "- How do m and k change ω₀ and the period?\n"
+        "- In driven mode, how do the height and width of the resonance peak change with c (and Q)?\n"
+        "- For the pendulum, at what release angle does the small-angle period become 1% too short?"
     )
 
 # Mark completion
@@ -0,0 +1,138 @@
+import math
+import os
+import sys
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+# Add the lib directory to the path so we can import shared helpers
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from coupled_oscillators import BOUNDARIES, compute_chain_animation, compute_normal_modes, uniform_chain_frequencies
+from plotting import DEFAULT_MAX_POINTS_PER_TRACE, build_figure, decimate_trace, line_trace
+
+st.set_page_config(page_title="Coupled Oscillators", page_icon="🔗")
+
+# Cap on points per plotted trace (edit to trade payload size for detail)
+MAX_PLOT_POINTS = DEFAULT_MAX_POINTS_PER_TRACE
+
+START_LABELS = {
+    "Pluck the first mass": "pluck",
+    "Gaussian pulse": "pulse",
+    "Single normal mode": "mode",
+}
+
+
+st.title("Coupled Oscillators (Mass–Spring Chain)")
+
+st.markdown(
+    """
+N identical masses m are joined in a line by identical springs k. Every motion of the chain is a
+superposition of **normal modes**, each oscillating at its own frequency ω.
+    """
+)
+
+with st.sidebar:
+    st.header("Parameters")
+    n = st.slider("Number of masses N", min_value=2, max_value=1000, value=10, step=1)
+    m = st.slider("Mass m (kg)", min_value=0.1, max_value=5.0, value=1.0, step=0.1)
+    k = st.slider("Spring constant k (N/m)", min_value=1.0, max_value=200.0, value=50.0, step=1.0)
+    boundary = st.selectbox("Ends", BOUNDARIES, index=0)
+    start_label = st.selectbox("Initial displacement", list(START_LABELS.keys()), index=0)
+    mode_number = st.number_input("Mode number", min_value=1, max_value=1000, value=1, step=1, help="Values above N use mode N.")
+    A = st.slider("Amplitude (m)", min_value=0.01, max_value=1.0, value=0.1, step=0.01)
+    T = st.slider("Animation duration (s)", min_value=1.0, max_value=60.0, value=10.0, step=0.5)
+    num_frames = st.slider("Animation frames", min_value=20, max_value=200, value=60, step=10)
+
+mode_number = int(min(mode_number, n))
+omegas, modes = compute_normal_modes(n, m, k, boundary)
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Lowest ω (rad/s)", f"{omegas[0]:.4g}")
+col2.metric("Highest ω (rad/s)", f"{omegas[-1]:.4g}")
+col3.metric(f"Mode {mode_number} ω (rad/s)", f"{omegas[mode_number - 1]:.4g}")
+
+# Animated superposition
+times, displacement = compute_chain_animation(
+    n, m, k, boundary, START_LABELS[start_label], A, mode_number, T, num_frames
+)
+index = np.arange(1, n + 1, dtype=np.float32)
+frame_values = displacement.astype(np.float32)
+trace_mode = "lines+markers" if n <= 60 else "lines"
+y_limit = 1.1 * max(float(np.max(np.abs(frame_values))), 1e-9)
+
+fig = go.Figure(
+    data=[go.Scatter(x=index, y=frame_values[0], mode=trace_mode, name="Displacement")],
+    frames=[
+        go.Frame(data=[go.Scatter(x=index, y=frame)], name=f"{t_i:.2f}")
+        for t_i, frame in zip(times, frame_values)
+    ],
+    layout=go.Layout(
+        title="Chain Displacement (press ▶ to animate)",
+        xaxis_title="Mass number i",
+        yaxis_title="Displacement (m)",
+        yaxis_range=[-y_limit, y_limit],
+        height=450,
+        template="plotly_white",
+        updatemenus=[dict(
+            type="buttons",
+            showactive=False,
+            buttons=[
+                dict(label="▶", method="animate", args=[None, dict(frame=dict(duration=50, redraw=False), fromcurrent=True)]),
+                dict(label="⏸", method="animate", args=[[None], dict(frame=dict(duration=0, redraw=False), mode="immediate")]),
+            ],
+        )],
+        sliders=[dict(
+            currentvalue=dict(prefix="t = ", suffix=" s"),
+            steps=[
+                dict(method="animate", label=f"{t_i:.2f}", args=[[f"{t_i:.2f}"], dict(mode="immediate", frame=dict(duration=0, redraw=False))])
+                for t_i in times
+            ],
+        )],
+    ),
+)
+st.plotly_chart(fig, use_container_width=True)
+
+# Spectrum and selected mode shape
+col_a, col_b = st.columns(2)
+with col_a:
+    j_plot, w_plot = decimate_trace(np.arange(1, n + 1), omegas, MAX_PLOT_POINTS)
+    spec_traces = [line_trace(j_plot, w_plot, "ω_j (eigensolver)", mode="lines+markers" if n <= 60 else "lines")]
+    if boundary == "fixed-fixed":
+        # A fixed-fixed chain has closed-form frequencies to check the eigensolver against
+        exact = uniform_chain_frequencies(n, m, k)
+        j_exact, w_exact = decimate_trace(np.arange(1, n + 1), exact, MAX_PLOT_POINTS)
+        spec_traces.append(line_trace(j_exact, w_exact, "2√(k/m) sin(jπ / 2(N+1))", line=dict(dash="dot")))
+    fig_spec = build_figure(spec_traces, title="Normal-Mode Frequencies", xaxis_title="Mode number j", yaxis_title="ω (rad/s)", height=400)
+    st.plotly_chart(fig_spec, use_container_width=True)
+    if boundary == "fixed-fixed":
+        st.caption(f"Largest relative difference from the closed form: {float(np.max(np.abs(omegas / exact - 1.0))):.1e}")
+with col_b:
+    i_plot, v_plot = decimate_trace(np.arange(1, n + 1), modes[:, mode_number - 1], MAX_PLOT_POINTS)
+    fig_mode = build_figure(
+        [line_trace(i_plot, v_plot, f"Mode {mode_number}", mode="lines+markers" if n <= 60 else "lines")],
+        title=f"Shape of Mode {mode_number}", xaxis_title="Mass number i", yaxis_title="Relative displacement", height=400,
+    )
+    st.plotly_chart(fig_mode, use_container_width=True)
+
+st.caption(
+    f"Mode {mode_number} period: {2.0 * math.pi / omegas[mode_number - 1]:.4g} s"
+    if omegas[mode_number - 1] > 0 else f"Mode {mode_number} is a rigid translation (ω = 0)."
+)
+
+# Quick prompts
+st.divider()
+with st.expander("Checks for understanding"):
+    st.markdown(
+        "- Start from a single normal mode: does the shape change over time, or only its size?\n"
+        "- Pluck the first mass: how does the disturbance travel along a long chain?\n"
+        "- How does the highest frequency compare with 2√(k/m) as N grows?"
+    )
+
+# Mark completion
+if st.button("Mark this module complete"):
+    completed = st.session_state.get("completed_modules", set())
+    completed.add("Coupled Oscillators")
+    st.session_state["completed_modules"] = completed
+    st.success("Marked as complete.")
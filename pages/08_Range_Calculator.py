@@ -0,0 +1,125 @@
+import os
+import sys
+
+import pandas as pd
+import streamlit as st
+
+# Add the lib directory to the path so we can import shared helpers
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from formula_engine import CONSTANTS, FUNCTIONS, MAX_UNCERTAIN_VARIABLES, FormulaError, compile_formula, range_method
+
+st.set_page_config(page_title="Range-Method Calculator", page_icon="🧮", layout="wide")
+
+# Starting formulas; each one can be edited freely once chosen
+EXAMPLES = {
+    "Snell's law (n = sin θ2 / sin θ1)": "sin(radians(theta2)) / sin(radians(theta1))",
+    "Thin lens focal length": "1 / (1/d_o + 1/d_i)",
+    "Pendulum g from length and period": "4 * pi^2 * L / T^2",
+    "Density of a cylinder": "m / (pi * (d/2)^2 * h)",
+    "Custom": "",
+}
+
+
+def format_number(x: float, digits: int = 6) -> str:
+    if x is None:
+        return "—"
+    return f"{x:.{digits}g}"
+
+
+st.title("Range-Method Calculator")
+st.caption(
+    "Type any formula, give each variable a value and an uncertainty, and the calculator evaluates every "
+    "high/low combination of the inputs to find the largest and smallest result."
+)
+
+example = st.selectbox("Start from", list(EXAMPLES.keys()), index=0)
+expression = st.text_input(
+    "Formula",
+    value=EXAMPLES[example],
+    key=f"rc_formula_{example}",
+    help="Use + − * / and ^ or ** for powers. Trig functions work in radians; wrap degrees in radians(...).",
+)
+
+with st.expander("Allowed functions and constants"):
+    st.markdown(
+        "Functions: " + ", ".join(f"`{name}()`" for name in FUNCTIONS) + "\n\n"
+        "Constants: " + ", ".join(f"`{name}`" for name in CONSTANTS) + "\n\n"
+        "Any other name is treated as a variable."
+    )
+
+try:
+    formula = compile_formula(expression)
+except FormulaError as exc:
+    st.error(str(exc))
+    st.stop()
+
+if not formula.variables:
+    st.info("This formula has no variables; its value is shown below.")
+
+values = {}
+uncertainties = {}
+if formula.variables:
+    st.subheader("Variables")
+    header_name, header_value, header_unc = st.columns([1, 2, 2])
+    header_name.markdown("**Variable**")
+    header_value.markdown("**Value**")
+    header_unc.markdown("**Uncertainty (±)**")
+    for name in formula.variables:
+        col_name, col_value, col_unc = st.columns([1, 2, 2])
+        col_name.markdown(f"`{name}`")
+        values[name] = col_value.number_input(
+            f"Value of {name}", value=1.0, format="%.6g", key=f"rc_value_{name}", label_visibility="collapsed",
+        )
+        uncertainties[name] = col_unc.number_input(
+            f"Uncertainty in {name}", value=0.0, min_value=0.0, format="%.6g", key=f"rc_unc_{name}", label_visibility="collapsed",
+        )
+
+try:
+    result = range_method(formula.expression, values, uncertainties)
+except FormulaError as exc:
+    st.error(str(exc))
+    st.stop()
+
+st.subheader("Result")
+if not result["ok"]:
+    st.error(result["error"])
+else:
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Nominal", format_number(result["nominal"]))
+    col2.metric("Low", format_number(result["low"]))
+    col3.metric("High", format_number(result["high"]))
+    col4.metric("Half-range", format_number(result["half_range"]))
+    st.caption(f"{result['num_corners']:,} combinations evaluated (up to {MAX_UNCERTAIN_VARIABLES} variables can carry an uncertainty).")
+
+    if not result["nominal_in_range"]:
+        st.warning(
+            "The nominal value lies outside the low–high range. The formula turns around (or passes a singularity) "
+            "inside the uncertainty box, so the corner values do not bound the result."
+        )
+
+    if result["high_corner"]:
+        arrow = {1: "+Δ ↗", -1: "−Δ ↘"}
+        corners_df = pd.DataFrame({
+            "Variable": list(result["high_corner"].keys()),
+            "High case": [arrow[s] for s in result["high_corner"].values()],
+            "Low case": [arrow[s] for s in result["low_corner"].values()],
+        })
+        st.markdown("**Which way each variable moves for the high and low results**")
+        st.dataframe(corners_df, use_container_width=True, hide_index=True)
+
+# Quick prompts
+st.divider()
+with st.expander("Checks for understanding"):
+    st.markdown(
+        "- Enter the Snell's law formula with your lab angles: does the high case match sin(θ2+Δθ2)/sin(θ1−Δθ1)?\n"
+        "- For a variable in a denominator, why does the high case use −Δ?\n"
+        "- Try 1/x with an uncertainty larger than x. Why does the range method break down?"
+    )
+
+# Mark completion
+if st.button("Mark this module complete"):
+    completed = st.session_state.get("completed_modules", set())
+    completed.add("Range-Method Calculator")
+    st.session_state["completed_modules"] = completed
+    st.success("Marked as complete.")
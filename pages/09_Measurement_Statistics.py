@@ -0,0 +1,174 @@
+import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+# Add the lib directory to the path so we can import shared helpers
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from compute_cache import memoize
+from plotting import line_trace
+from streaming_stats import DEFAULT_HISTOGRAM_BINS, stream_statistics
+
+st.set_page_config(page_title="Measurement Statistics", page_icon="📊", layout="wide")
+
+# Rows read from an uploaded CSV at a time; memory use is bounded by this, not by the file size
+STATS_CHUNK_ROWS = 200_000
+
+
+def format_number(x: float, digits: int = 6) -> str:
+    if x is None or (isinstance(x, float) and math.isnan(x)):
+        return "—"
+    return f"{x:.{digits}g}"
+
+
+def summarize(stats, histogram) -> dict:
+    """Plain numbers and arrays from one streaming pass, ready to cache and display."""
+    return {
+        "count": stats.count,
+        "skipped": stats.skipped,
+        "mean": stats.mean,
+        "std": stats.std,
+        "standard_error": stats.standard_error,
+        "minimum": stats.minimum,
+        "maximum": stats.maximum,
+        "half_range": stats.half_range,
+        "edges": histogram.edges if histogram.low is not None else np.array([]),
+        "counts": histogram.counts.copy(),
+    }
+
+
+def csv_chunks(uploaded_file, column: str):
+    """The chosen column of an uploaded CSV as float arrays, STATS_CHUNK_ROWS rows at a time."""
+    uploaded_file.seek(0)
+    for chunk in pd.read_csv(uploaded_file, usecols=[column], chunksize=STATS_CHUNK_ROWS):
+        yield pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype=float)
+
+
+@memoize(name="stats.simulated_logger")
+def simulated_logger_summary(n_readings: int, seed: int, num_bins: int = DEFAULT_HISTOGRAM_BINS) -> dict:
+    """Streaming statistics of a simulated data logger: 9.81 ± 0.05 readings shown to 0.01."""
+    rng = np.random.default_rng(seed)
+
+    def chunks():
+        for start in range(0, n_readings, STATS_CHUNK_ROWS):
+            size = min(STATS_CHUNK_ROWS, n_readings - start)
+            yield np.round(rng.normal(9.81, 0.05, size), 2)
+
+    return summarize(*stream_statistics(chunks(), num_bins))
+
+
+st.title("Measurement Statistics")
+st.caption(
+    "Upload your own repeated measurements (one column of a CSV file, any number of rows) and compare "
+    "the range method with the standard deviation and the standard error of the mean."
+)
+
+source = st.radio("Data", ["Simulated data logger", "Upload CSV"], horizontal=True, key="stats_source")
+summary = None
+if source == "Upload CSV":
+    uploaded = st.file_uploader("Measurements as CSV (first row holds the column names)", type=["csv"], key="stats_csv")
+    if uploaded is not None:
+        try:
+            header = pd.read_csv(uploaded, nrows=0).columns.tolist()
+        except (pd.errors.EmptyDataError, pd.errors.ParserError, ValueError) as exc:
+            st.error(f"Could not read the file as CSV: {exc}")
+            header = None
+        if header is not None and not header:
+            st.error("The file has no columns.")
+        elif header:
+            column = st.selectbox("Column to analyse", header, key="stats_column")
+            cache_key = (uploaded.file_id, column)
+            # One pass per file and column; reruns reuse the stored summary
+            if st.session_state.get("stats_summary_key") != cache_key:
+                try:
+                    with st.spinner("Reading the file in chunks…"):
+                        st.session_state.stats_summary = summarize(*stream_statistics(csv_chunks(uploaded, column)))
+                    st.session_state.stats_summary_key = cache_key
+                except (pd.errors.EmptyDataError, pd.errors.ParserError, ValueError) as exc:
+                    st.session_state.pop("stats_summary_key", None)
+                    st.error(f"Could not read column '{column}': {exc}")
+            if st.session_state.get("stats_summary_key") == cache_key:
+                summary = st.session_state.stats_summary
+else:
+    c1, c2 = st.columns(2)
+    n_readings = c1.select_slider("Readings", options=[10, 100, 1_000, 100_000, 1_000_000, 10_000_000], value=1_000, key="stats_n")
+    seed = c2.number_input("Seed", min_value=0, value=0, step=1, key="stats_seed")
+    summary = simulated_logger_summary(int(n_readings), int(seed))
+
+if summary is not None:
+    if summary["count"] < 2:
+        st.error("At least two numeric readings are needed.")
+    else:
+        if summary["skipped"]:
+            st.warning(f"{summary['skipped']:,} blank or non-numeric entries were skipped.")
+        m1, m2, m3, m4, m5 = st.columns(5)
+        m1.metric("Readings N", f"{summary['count']:,}")
+        m2.metric("Mean", format_number(summary["mean"], 8))
+        m3.metric("Range (max − min)", format_number(summary["maximum"] - summary["minimum"], 5))
+        m4.metric("Sample σ", format_number(summary["std"], 5))
+        m5.metric("Standard error σ/√N", format_number(summary["standard_error"], 5))
+
+        st.subheader("Range Method or Standard Deviation?")
+        st.dataframe(
+            pd.DataFrame({
+                "Estimate": ["Range method", "Standard deviation", "Standard error of the mean"],
+                "Result": [
+                    f"{format_number(summary['mean'], 8)} ± {format_number(summary['half_range'], 3)}",
+                    f"{format_number(summary['mean'], 8)} ± {format_number(summary['std'], 3)}",
+                    f"{format_number(summary['mean'], 8)} ± {format_number(summary['standard_error'], 3)}",
+                ],
+                "Describes": [
+                    "Where every reading fell",
+                    "The spread of a single reading (about 68% within ±σ)",
+                    "How well the mean itself is known",
+                ],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+        ratio = summary["half_range"] / summary["std"] if summary["std"] > 0 else float("nan")
+        st.caption(
+            f"Here the half-range is {format_number(ratio, 3)} σ. For Gaussian readings it keeps growing as N grows "
+            "(more readings means more chance of an extreme one), while σ settles and σ/√N keeps shrinking. "
+            "The range method suits a handful of readings; with many, quote the mean ± standard error."
+        )
+
+        edges, counts = summary["edges"], summary["counts"]
+        if edges.size:
+            centers = (edges[:-1] + edges[1:]) / 2.0
+            width = float(edges[1] - edges[0])
+            x_curve = np.linspace(edges[0], edges[-1], 400)
+            traces = [go.Bar(x=centers.astype(np.float32), y=counts, width=width, name="Readings", marker_color="steelblue", opacity=0.7)]
+            # Identical readings have σ = 0 and no Gaussian to draw
+            if summary["std"] > 0:
+                gaussian = summary["count"] * width * np.exp(-0.5 * ((x_curve - summary["mean"]) / summary["std"]) ** 2) / (summary["std"] * math.sqrt(2.0 * math.pi))
+                traces.append(line_trace(x_curve, gaussian, "Gaussian with the same mean and σ", line=dict(color="black")))
+            fig = go.Figure(
+                data=traces,
+                layout=go.Layout(title="Histogram of the Readings", xaxis_title="Value", yaxis_title="Readings per bin", height=450, template="plotly_white", bargap=0),
+            )
+            for x_line, color in ((summary["mean"] - summary["std"], "orange"), (summary["mean"] + summary["std"], "orange"), (summary["minimum"], "red"), (summary["maximum"], "red")):
+                fig.add_vline(x=x_line, line_color=color, line_dash="dot")
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption("Orange lines mark mean ± σ; red lines mark the smallest and largest readings (the range).")
+
+# Quick prompts
+st.divider()
+with st.expander("Checks for understanding"):
+    st.markdown(
+        "- Increase the number of simulated readings. Which of the three uncertainties barely changes, which grows and which shrinks?\n"
+        "- Why does one stray reading change the range method a lot but σ only a little?\n"
+        "- The simulated logger shows readings to 0.01. What happens to the histogram when σ is not much larger than that resolution?"
+    )
+
+# Mark completion
+if st.button("Mark this module complete"):
+    completed = st.session_state.get("completed_modules", set())
+    completed.add("Measurement Statistics")
+    st.session_state["completed_modules"] = completed
+    st.success("Marked as complete.")
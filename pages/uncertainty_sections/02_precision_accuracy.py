@@ -2,11 +2,15 @@ import streamlit as st
 import sys
 import os
 
+import numpy as np
+import plotly.graph_objects as go
+
 # Add the lib directory to the path so we can import our trial tracker
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
 
 # Import our trial tracker
 from trial_tracker import trial_tracker
+from uncertainty_sims import BOARD_RADIUS, simulate_dartboard
 
 def render_precision_accuracy_section():
     """Render the precision and accuracy section"""
@@ -251,3 +255,43 @@ def render_precision_accuracy_section():
             st.info("🔒 Complete Question 2 correctly to unlock Question 3.")
     else:
         st.info("🔒 Complete Question 1 correctly to unlock Question 2.")
+
+    # Dart board simulator (hits are binned on the server; the browser only receives the density image)
+    with st.expander("Try it: a dart board for systematic and random error"):
+        st.markdown(
+            "**Bias** moves where the darts are aimed away from the bullseye (systematic error, poor accuracy). "
+            "**Spread** scatters each throw around that aim (random error, poor precision)."
+        )
+        dart1, dart2, dart3 = st.columns(3)
+        dart_bias = dart1.slider("Bias [cm]", min_value=0.0, max_value=6.0, value=0.0, step=0.25, key="pa_dart_bias")
+        dart_spread = dart2.slider("Spread σ [cm]", min_value=0.0, max_value=4.0, value=1.0, step=0.1, key="pa_dart_spread")
+        dart_hits = dart3.select_slider("Darts thrown", options=[100, 1_000, 10_000, 100_000, 1_000_000], value=10_000, key="pa_dart_hits")
+
+        board = simulate_dartboard(dart_bias, dart_spread, int(dart_hits))
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Accuracy: bullseye to average hit [cm]", f"{board['accuracy']:.2f}")
+        m2.metric("Precision: RMS scatter about the average [cm]", f"{board['precision']:.2f}")
+        m3.metric("Darts off the board", f"{board['off_board']:,}")
+
+        density = board["density"].astype(np.float32)
+        fig = go.Figure(
+            data=[
+                go.Heatmap(
+                    x=board["x_centers"].astype(np.float32), y=board["y_centers"].astype(np.float32),
+                    z=np.where(density > 0, density, np.nan), colorscale="Hot", reversescale=True, showscale=False, hoverinfo="skip",
+                ),
+                go.Scatter(x=[board["mean_hit"][0]], y=[board["mean_hit"][1]], mode="markers", marker=dict(symbol="x", size=12, color="blue"), name="Average hit"),
+            ],
+            layout=go.Layout(
+                title="Where the Darts Landed", height=520, width=520, template="plotly_white", showlegend=False,
+                xaxis=dict(range=[-BOARD_RADIUS, BOARD_RADIUS], title="x [cm]"),
+                yaxis=dict(range=[-BOARD_RADIUS, BOARD_RADIUS], title="y [cm]", scaleanchor="x"),
+            ),
+        )
+        for ring in (2.0, 4.0, 6.0, 8.0, BOARD_RADIUS):
+            fig.add_shape(type="circle", x0=-ring, y0=-ring, x1=ring, y1=ring, line=dict(color="gray", width=1))
+        st.plotly_chart(fig)
+        st.caption(
+            "Throwing more darts makes the average hit settle but never removes the bias: averaging reduces random error, not systematic error. "
+            "For Gaussian scatter the RMS distance from the average is √2 × σ."
+        )
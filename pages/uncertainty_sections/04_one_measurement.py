@@ -2,11 +2,16 @@ import streamlit as st
 import sys
 import os
 
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
 # Add the lib directory to the path so we can import our trial tracker
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
 
 # Import our trial tracker
 from trial_tracker import trial_tracker
+from uncertainty_sims import simulate_quantization
 
 def render_one_measurement_section():
     # Ensure trial tracker is initialized
@@ -76,3 +81,43 @@ def render_one_measurement_section():
                 st.error("Try again")
     else:
         st.info("🔒 Complete Question 1 correctly to unlock Question 2.")
+
+    # Instrument resolution simulator (each setting's batch of trials is computed once and cached)
+    with st.expander("Try it: reading an instrument many times"):
+        st.markdown(
+            "A true length is read on a ruler with the chosen division size; **noise** stands for everything else "
+            "(parallax, a wobbly object, a shaky hand). Each trial rounds the noisy value to the nearest division, "
+            "and the histogram shows how far the reading ends up from the true value."
+        )
+        om1, om2, om3 = st.columns(3)
+        om_resolution = om1.select_slider("Division size [cm]", options=[0.01, 0.05, 0.1, 0.5, 1.0], value=0.1, key="om_sim_resolution")
+        om_noise_fraction = om2.slider("Noise σ (in divisions)", min_value=0.0, max_value=2.0, value=0.0, step=0.05, key="om_sim_noise")
+        om_trials = om3.select_slider("Trials", options=[1_000, 10_000, 100_000, 1_000_000], value=100_000, key="om_sim_trials")
+
+        sim = simulate_quantization(om_resolution, om_noise_fraction * om_resolution, int(om_trials))
+        s1, s2 = st.columns(2)
+        s1.metric("Observed σ of the reading error [cm]", f"{sim['std']:.4g}")
+        s2.metric("Largest error seen [cm]", f"{sim['max_abs']:.4g}")
+
+        st.dataframe(
+            pd.DataFrame({
+                "Reading uncertainty rule": list(sim["rules"].keys()),
+                "± [cm]": [f"{width:.4g}" for width, _ in sim["rules"].values()],
+                "Trials inside": [f"{100 * inside:.1f}%" for _, inside in sim["rules"].values()],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        edges = sim["edges"]
+        fig = go.Figure(
+            data=[go.Bar(x=((edges[:-1] + edges[1:]) / 2.0).astype(np.float32), y=sim["counts"], width=float(edges[1] - edges[0]), marker_color="steelblue")],
+            layout=go.Layout(title="Reading − True Value", xaxis_title="Error [cm]", yaxis_title="Trials", height=380, template="plotly_white", bargap=0),
+        )
+        for k in (-0.5, 0.5):
+            fig.add_vline(x=k * om_resolution, line_color="orange", line_dash="dot")
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(
+            "With no noise every error lies within ± ½ division (orange lines). Once other effects are larger than a division, "
+            "± ½ division covers only part of the trials, which is why a believable uncertainty is often larger than the instrument's resolution."
+        )
@@ -2,11 +2,16 @@ import streamlit as st
 import sys
 import os
 
+import numpy as np
+import plotly.graph_objects as go
+
 # Add the lib directory to the path so we can import our trial tracker
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
 
 # Import our trial tracker
 from trial_tracker import trial_tracker
+from plotting import line_trace
+from uncertainty_sims import SAMPLING_DISTRIBUTIONS, SPREAD_PERCENTILES, compare_estimators
 
 def render_range_method_section():
     # Ensure trial tracker is initialized
@@ -111,3 +116,43 @@ def render_range_method_section():
                 st.error("Try again")
     else:
         st.info("🔒 Complete Question 1 correctly to unlock Question 2.")
+
+    # Estimator comparison study (every N from 2 to 100 comes from one matrix of simulated experiments)
+    with st.expander("Try it: how the range method and σ change as you take more data"):
+        st.markdown(
+            "Thousands of simulated classes repeat the timing experiment (true σ = 0.0331 s) with N = 2 to 100 readings each. "
+            "For every N the plot shows the average result of each uncertainty estimate, with a shaded band "
+            f"holding the middle {SPREAD_PERCENTILES[1] - SPREAD_PERCENTILES[0]:g}% of the classes."
+        )
+        comparison_distribution = st.selectbox("Distribution of readings", SAMPLING_DISTRIBUTIONS, key="range_study_distribution")
+        study = compare_estimators(comparison_distribution)
+        n = study["n"]
+        fig = go.Figure(layout=go.Layout(
+            title="Uncertainty Estimates versus Number of Readings", xaxis_title="Number of readings N",
+            yaxis_title="Uncertainty [s]", height=450, template="plotly_white",
+        ))
+        for key, label, color in (
+            ("half_range", "Range method (half-range)", "crimson"),
+            ("std", "Standard deviation σ", "royalblue"),
+            ("standard_error", "Standard error σ/√N", "seagreen"),
+        ):
+            band = study[key]
+            fig.add_trace(line_trace(n, band["low"], f"{label} band", line=dict(width=0, color=color), showlegend=False, hoverinfo="skip"))
+            fig.add_trace(line_trace(n, band["high"], f"{label} band", line=dict(width=0, color=color), fill="tonexty", opacity=0.2, showlegend=False, hoverinfo="skip"))
+            fig.add_trace(line_trace(n, band["mean"], label, line=dict(color=color)))
+        fig.add_hline(y=study["sigma"], line_color="gray", line_dash="dot", annotation_text="true σ")
+        # First N at which the average half-range exceeds the average σ
+        above = np.flatnonzero(study["half_range"]["mean"] > study["std"]["mean"])
+        crossover = int(n[above[0]]) if above.size else None
+        if crossover is not None:
+            fig.add_vline(x=crossover, line_color="gray", line_dash="dash", annotation_text=f"N = {crossover}")
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(
+            "The half-range keeps growing with N because extreme readings become more likely, while σ settles at the "
+            "true spread and the standard error keeps shrinking. "
+            + (
+                f"From about {crossover} readings on, the range method gives a larger uncertainty than σ, and the gap widens with every reading."
+                if crossover is not None else
+                f"Up to {int(n[-1])} readings the half-range stays below σ for this distribution."
+            )
+        )
@@ -2,11 +2,17 @@ import streamlit as st
 import sys
 import os
 
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
 # Add the lib directory to the path so we can import our trial tracker
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
 
 # Import our trial tracker
 from trial_tracker import trial_tracker
+from plotting import build_figure, line_trace
+from uncertainty_sims import COVERAGE_SIGMAS, SAMPLING_DISTRIBUTIONS, simulate_sampling
 
 def render_std_dev_gaussian_section():
     # Ensure trial tracker is initialized
@@ -206,3 +212,58 @@ def render_std_dev_gaussian_section():
             st.info("🔒 Complete Question 2 correctly to unlock Question 3.")
     else:
         st.info("🔒 Complete Question 1 correctly to unlock Question 2.")
+
+    # Sampling simulator (readings are drawn in batches; only the binned histogram reaches the browser)
+    with st.expander("Try it: a sampling simulator for σ, the 68% rule and the standard error"):
+        st.markdown(
+            "Draw many simulated timing measurements (true mean 0.48 s, σ = 0.0331 s, as in the example above). "
+            "The readings are also split into groups of N, and the spread of the group averages is compared with σ/√N."
+        )
+        sim1, sim2, sim3, sim4 = st.columns(4)
+        sim_distribution = sim1.selectbox("Distribution of readings", SAMPLING_DISTRIBUTIONS, key="sd_sim_distribution")
+        sim_samples = sim2.select_slider("Readings", options=[100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000], value=10_000, key="sd_sim_samples")
+        sim_group = sim3.select_slider("Group size N", options=[2, 4, 6, 10, 25, 100], value=6, key="sd_sim_group")
+        sim_seed = sim4.number_input("Seed", min_value=0, value=0, step=1, key="sd_sim_seed")
+
+        sim = simulate_sampling(sim_distribution, int(sim_samples), int(sim_group), seed=int(sim_seed))
+
+        r1, r2, r3 = st.columns(3)
+        r1.metric("Sample σ [s]", f"{sim['std']:.4f}")
+        r2.metric(f"Spread of averages of {sim_group} [s]", f"{sim['std_of_averages']:.4f}" if sim["n_averages"] > 1 else "—")
+        r3.metric(f"σ/√{sim_group} [s]", f"{sim['predicted_std_of_averages']:.4f}")
+
+        edges, counts = sim["edges"], sim["counts"]
+        width = float(edges[1] - edges[0])
+        fig_hist = go.Figure(
+            data=[go.Bar(x=((edges[:-1] + edges[1:]) / 2.0).astype(np.float32), y=counts, width=width, marker_color="steelblue", name="Readings")],
+            layout=go.Layout(title="Histogram of the Readings", xaxis_title="Time [s]", yaxis_title="Readings per bin", height=380, template="plotly_white", bargap=0),
+        )
+        for k in (-1, 1):
+            fig_hist.add_vline(x=0.48 + k * 0.0331, line_color="orange", line_dash="dot")
+        st.plotly_chart(fig_hist, use_container_width=True)
+
+        st.dataframe(
+            pd.DataFrame({
+                "Interval": [f"mean ± {k:g}σ" for k in COVERAGE_SIGMAS],
+                "Fraction of simulated readings": [f"{100 * c:.2f}%" for c in sim["coverage"]],
+                "Gaussian prediction": [f"{100 * c:.2f}%" for c in sim["normal_coverage"]],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        history = sim["history"]
+        if history.shape[0] > 1:
+            fig_running = build_figure(
+                [
+                    line_trace(history[:, 0], history[:, 1], "σ", mode="lines+markers"),
+                    line_trace(history[:, 0], history[:, 2], "σ/√(readings so far)", mode="lines+markers"),
+                ],
+                title="Running Estimates as Readings Accumulate", xaxis_title="Readings", yaxis_title="Seconds", height=350,
+            )
+            fig_running.update_xaxes(type="log")
+            st.plotly_chart(fig_running, use_container_width=True)
+        st.caption(
+            "σ settles at the spread of single readings no matter how many you take; the standard error keeps shrinking. "
+            "Switch to a uniform or exponential distribution and the 68% rule no longer holds exactly."
+        )
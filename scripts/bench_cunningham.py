@@ -0,0 +1,68 @@
+"""Benchmark the Cunningham lookup table against the exact exponential form.
+
+Times (A, C) alone and the full vectorized slip-correction iteration for a
+range of batch sizes, and reports the largest relative error of C seen over
+Kn from 1e-4 to 1e3.
+
+Usage:
+    python scripts/bench_cunningham.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from cunningham_table import TABLE_KN_MAX, TABLE_KN_MIN, cunningham_table
+from lab_calculations import slip_iteration
+from lab_formulas import cunningham_correction
+
+REPEATS = 5
+A0, A1, A2 = 1.257, 0.4, 1.1
+
+
+def best_time_ms(func, *args, **kwargs):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main():
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    table = cunningham_table(A0, A1, A2)
+    build_ms = (time.perf_counter() - start) * 1e3
+    print(f"table: {table.num_points} points, built in {build_ms:.1f} ms, measured max relative error {table.max_error:.2e}")
+
+    kn = np.exp(rng.uniform(np.log(TABLE_KN_MIN), np.log(TABLE_KN_MAX), 2_000_000))
+    _, exact_C = cunningham_correction(kn, A0, A1, A2)
+    _, table_C = table.correction(kn)
+    print(f"max relative error of C on {kn.size:,} random Kn: {np.max(np.abs(table_C / exact_C - 1.0)):.2e}")
+    print()
+
+    print(f"{'rows':>10} | {'exact C ms':>10} {'table C ms':>10} {'speedup':>7} | {'exact iter ms':>13} {'table iter ms':>13} {'speedup':>7} | {'max rel err r':>13}")
+    for rows in (1_000, 10_000, 100_000, 1_000_000):
+        kn_rows = kn[:rows]
+        exact_ms = best_time_ms(cunningham_correction, kn_rows, A0, A1, A2)
+        table_ms = best_time_ms(table.correction, kn_rows)
+
+        velocity = rng.uniform(1e-5, 1e-4, rows)
+        args = (838.0, 1.204575411, 9.8, velocity, 1.82e-5, 68.4543e-9, A0, A1, A2, 5)
+        iter_exact_ms = best_time_ms(slip_iteration, *args)
+        iter_table_ms = best_time_ms(slip_iteration, *args, use_table=True)
+        r_exact = slip_iteration(*args)[0]["radius"][-1]
+        r_table = slip_iteration(*args, use_table=True)[0]["radius"][-1]
+        err = float(np.max(np.abs(r_table / r_exact - 1.0)))
+        print(
+            f"{rows:>10,} | {exact_ms:>10.2f} {table_ms:>10.2f} {exact_ms / table_ms:>7.2f} | "
+            f"{iter_exact_ms:>13.2f} {iter_table_ms:>13.2f} {iter_exact_ms / iter_table_ms:>7.2f} | {err:>13.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
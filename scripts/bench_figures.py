@@ -0,0 +1,67 @@
+"""Benchmark figure building: SVG/float64 + update_layout vs. the lib/plotting helpers.
+
+Reports build time and serialized JSON size (what Streamlit ships to the browser)
+for a range of trace sizes and overlay counts.
+
+Usage:
+    python scripts/bench_figures.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from plotting import build_figure, line_trace
+
+REPEATS = 20
+
+
+def build_current(traces):
+    fig = go.Figure()
+    for i, (x, y) in enumerate(traces):
+        fig.add_trace(go.Scatter(x=x, y=y, mode="lines", name=f"trace {i}"))
+    fig.update_layout(
+        xaxis_title="t (s)", yaxis_title="x (m)",
+        title="Benchmark",
+        height=500,
+        template="plotly_white",
+    )
+    return fig
+
+
+def build_helper(traces):
+    return build_figure(
+        [line_trace(x, y, f"trace {i}") for i, (x, y) in enumerate(traces)],
+        title="Benchmark", xaxis_title="t (s)", yaxis_title="x (m)",
+    )
+
+
+def time_build(builder, traces):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fig = builder(traces)
+    elapsed_ms = (time.perf_counter() - start) / REPEATS * 1e3
+    return elapsed_ms, len(fig.to_json())
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'points':>8} {'traces':>6} | {'current ms':>10} {'current KB':>10} | {'helper ms':>9} {'helper KB':>9} | {'size ratio':>10}")
+    for n_points in (400, 1200, 10_000, 100_000):
+        for n_traces in (1, 10):
+            t = np.linspace(0.0, 10.0, n_points)
+            traces = [(t, np.exp(-0.1 * t) * np.cos(5 * t + rng.uniform(0, 6.28))) for _ in range(n_traces)]
+            cur_ms, cur_bytes = time_build(build_current, traces)
+            new_ms, new_bytes = time_build(build_helper, traces)
+            print(
+                f"{n_points:>8} {n_traces:>6} | {cur_ms:>10.2f} {cur_bytes / 1024:>10.1f} | "
+                f"{new_ms:>9.2f} {new_bytes / 1024:>9.1f} | {cur_bytes / new_bytes:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()